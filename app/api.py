@@ -13,7 +13,7 @@ from typing import Any, Dict, List, Literal, Optional
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from .db import SessionLocal
-from .models import Event, CheckIn, PaymentIntent
+from .models import Artist, Event, CheckIn, PaymentIntent
 from pydantic import BaseModel, Field, field_validator
 import logging
 from .services.payments import (
@@ -27,6 +27,11 @@ from .services.payments import (
     utc_now,
 )
 
+from .config import Config
+from .genre import ARTIST_DICTIONARY
+from .services import ocr
+from .services.artist_dictionary import upsert_artist
+
 # Import scrapers
 from .scrapers import venti_parser, catpass_parser, passline_parser, bombo_parser
 
@@ -57,9 +62,14 @@ app.add_middleware(
 
 from fastapi.responses import JSONResponse
 
+@app.on_event("startup")
+def warm_up_ocr():
+    if Config.OCR_WARMUP:
+        ocr.start_warmup()
+
 @app.get("/api/health")
 def health_check():
-    return {"status": "ok", "timestamp": datetime.now().isoformat()}
+    return {"status": "ok", "timestamp": datetime.now().isoformat(), "ocr": ocr.readiness()}
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -178,6 +188,22 @@ class PaymentWebhookResponse(BaseModel):
     provider: str
     status: str
 
+
+class ArtistSchema(BaseModel):
+    id: int
+    name: str
+    genres: List[str]
+    version: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ArtistUpsertRequest(BaseModel):
+    name: str = Field(..., min_length=2, max_length=255)
+    genres: List[str] = Field(..., min_length=1)
+
 # Dependency to get DB session
 def get_db():
     db = SessionLocal()
@@ -270,6 +296,37 @@ async def trigger_scrape(
     return {"message": f"Scraper {source_name} started in background", "source": source_name}
 
 
+@app.get("/api/admin/artists", response_model=List[ArtistSchema])
+def list_artists(db: Session = Depends(get_db), _auth: None = Depends(require_scrape_key)):
+    return db.query(Artist).order_by(Artist.name_norm.asc()).all()
+
+
+@app.put("/api/admin/artists", response_model=ArtistSchema)
+def put_artist(
+    payload: ArtistUpsertRequest,
+    db: Session = Depends(get_db),
+    _auth: None = Depends(require_scrape_key),
+):
+    try:
+        artist = upsert_artist(db, payload.name, payload.genres)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    db.commit()
+    ARTIST_DICTIONARY.invalidate()
+    return artist
+
+
+@app.delete("/api/admin/artists/{artist_id}")
+def delete_artist(artist_id: int, db: Session = Depends(get_db), _auth: None = Depends(require_scrape_key)):
+    artist = db.query(Artist).filter_by(id=artist_id).first()
+    if not artist:
+        raise HTTPException(status_code=404, detail="Artist not found")
+    db.delete(artist)
+    db.commit()
+    ARTIST_DICTIONARY.invalidate()
+    return {"ok": True, "id": artist_id}
+
+
 @app.post("/api/checkin/challenge", response_model=CheckInChallengeResponse)
 def checkin_challenge(payload: CheckInChallengeRequest, db: Session = Depends(get_db)):
     event = db.query(Event).filter_by(id=payload.event_id).first()
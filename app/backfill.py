@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlalchemy import select, update
+
+from .genre import detect_genres_many
+from .models import Event
+from .utils import detect_city
+from .vibes import get_vibe
+
+logger = logging.getLogger("backfill")
+
+STATE_DIR = Path("storage/backfill")
+FIELDS = ("genres", "artists", "city", "vibe")
+# "vibe" is stored in vibe_description
+COLUMNS = {"genres": "genres", "artists": "artists", "city": "city", "vibe": "vibe_description"}
+
+
+@dataclass
+class BackfillStats:
+    scanned: int = 0
+    changed: int = 0
+    batches: int = 0
+    last_id: int = 0
+
+
+def _default_session_factory():
+    from .db import SessionLocal
+
+    return SessionLocal
+
+
+class BackfillRunner:
+    """Recompute derived ``Event`` columns with the current logic, in streamed batches.
+
+    Rows are read by id through a ``yield_per`` cursor (plain column tuples, so the
+    reader session keeps no objects around); each batch is recomputed at once
+    (genres via ``detect_genres_many``) and only changed rows are written back with
+    one executemany ``UPDATE`` on a separate session. After every committed batch
+    the last id is saved to ``storage/backfill/<name>.json``, so an interrupted run
+    resumes where it stopped; the state file is removed when the run completes.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str],
+        *,
+        session_factory: Optional[Callable] = None,
+        batch_size: int = 500,
+        name: Optional[str] = None,
+        state_dir: Path = STATE_DIR,
+        since: Optional[date] = None,
+        remote: bool = False,
+        dry_run: bool = False,
+    ):
+        self.fields = [f for f in FIELDS if f in set(fields)]
+        unknown = set(fields) - set(FIELDS)
+        if unknown or not self.fields:
+            raise ValueError(f"Unknown or empty fields: {sorted(unknown) or list(fields)}; choose from {FIELDS}")
+        self.session_factory = session_factory or _default_session_factory()
+        self.batch_size = batch_size
+        self.name = name or "-".join(self.fields)
+        self.state_path = Path(state_dir) / f"{self.name}.json"
+        self.since = since
+        self.remote = remote
+        self.dry_run = dry_run
+
+    def load_watermark(self) -> int:
+        try:
+            return int(json.loads(self.state_path.read_text(encoding="utf-8")).get("last_id", 0))
+        except (OSError, ValueError):
+            return 0
+
+    def _save_watermark(self, last_id: int) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"last_id": last_id, "fields": self.fields, "updated_at": datetime.utcnow().isoformat()}),
+            encoding="utf-8",
+        )
+        tmp_path.replace(self.state_path)
+
+    def reset(self) -> None:
+        self.state_path.unlink(missing_ok=True)
+
+    def _query(self, after_id: int):
+        query = (
+            select(Event.id, Event.title, Event.venue, Event.genres, Event.artists, Event.city, Event.vibe_description)
+            .where(Event.id > after_id)
+            .order_by(Event.id)
+        )
+        if self.since:
+            query = query.where(Event.date >= self.since)
+        return query.execution_options(yield_per=self.batch_size)
+
+    def recompute(self, rows: Sequence) -> list[dict]:
+        """New values for a batch of rows; only rows that actually change are returned."""
+        detected = None
+        if "genres" in self.fields or "artists" in self.fields:
+            detected = detect_genres_many(
+                [(row.title, [row.venue] if row.venue else None) for row in rows],
+                remote=self.remote,
+            )
+
+        updates = []
+        for idx, row in enumerate(rows):
+            current = {
+                "genres": row.genres,
+                "artists": row.artists,
+                "city": row.city,
+                "vibe": row.vibe_description,
+            }
+            new = dict(current)
+            if detected is not None:
+                genres, artists = detected[idx]
+                # scrapers saw descriptions we do not store: never downgrade a known genre to "general"
+                if "genres" in self.fields and (genres != ["general"] or not row.genres):
+                    new["genres"] = genres
+                if "artists" in self.fields:
+                    new["artists"] = artists
+            if "city" in self.fields:
+                new["city"] = detect_city(" ".join(filter(None, [row.title, row.venue, row.vibe_description])))
+            if "vibe" in self.fields:
+                # seeded by id: a row only changes when its title/genres point to another template set
+                new["vibe"] = get_vibe(row.title, new["genres"], seed=row.id)
+
+            changed = {COLUMNS[f]: new[f] for f in self.fields if new[f] != current[f]}
+            if changed:
+                updates.append({"id": row.id, **changed})
+        return updates
+
+    def run(self) -> BackfillStats:
+        stats = BackfillStats(last_id=self.load_watermark())
+        if stats.last_id:
+            logger.info("[backfill:%s] Resuming after id %s", self.name, stats.last_id)
+
+        with self.session_factory() as reader, self.session_factory() as writer:
+            result = reader.execute(self._query(stats.last_id))
+            for rows in result.partitions():
+                updates = self.recompute(rows)
+                if updates and not self.dry_run:
+                    # one executemany UPDATE ... WHERE id = :id per batch
+                    writer.execute(update(Event), updates)
+                    writer.commit()
+                stats.scanned += len(rows)
+                stats.changed += len(updates)
+                stats.batches += 1
+                stats.last_id = rows[-1].id
+                if not self.dry_run:
+                    self._save_watermark(stats.last_id)
+                logger.info(
+                    "[backfill:%s] batch %s: %s rows, %s changed (up to id %s)",
+                    self.name, stats.batches, len(rows), len(updates), stats.last_id,
+                )
+
+        if not self.dry_run:
+            self.reset()
+        return stats
+
+
+__all__ = ["FIELDS", "BackfillRunner", "BackfillStats"]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class BackgroundLoop:
+    """An event loop running forever on a daemon thread, started on first use.
+
+    Sync callers hand it coroutines with ``run``; async code on another loop
+    awaits them with ``run_async``. Whatever is bound to the loop (HTTP
+    clients, a browser) stays alive from call to call.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def submit(self, coro: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Block until ``coro`` finished on the loop; don't call from a coroutine."""
+        return self.submit(coro).result(timeout)
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self, timeout: float = 5) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+
+__all__ = ["BackgroundLoop"]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import random
+
+# retries of rate-limited requests: full jitter up to base * 2**attempt, capped
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 20.0
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_SECONDS, cap: float = RETRY_MAX_SECONDS) -> float:
+    """Seconds to wait before retrying after failed ``attempt`` (0 for the first request)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+__all__ = ["RETRY_BASE_SECONDS", "RETRY_MAX_SECONDS", "backoff_delay"]
@@ -3,6 +3,16 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _parse_ttls(raw: str) -> dict[str, int]:
+    ttls: dict[str, int] = {}
+    for item in raw.split(","):
+        name, _, value = item.partition("=")
+        if name.strip() and value.strip().isdigit():
+            ttls[name.strip()] = int(value.strip())
+    return ttls
+
+
 class Config:
     TG_API_ID = int(os.getenv("TG_API_ID", "0"))
     TG_API_HASH = os.getenv("TG_API_HASH", "")
@@ -22,6 +32,9 @@ class Config:
     STORY_TOP_N = int(os.getenv("STORY_TOP_N", "3"))
     STORY_MORNING = os.getenv("STORY_MORNING", "11:00")
     STORY_EVENING = os.getenv("STORY_EVENING", "17:00")
+    STORY_IMAGE_FORMAT = os.getenv("STORY_IMAGE_FORMAT", "png").lower()  # png | jpeg
+    STORY_PNG_COMPRESS_LEVEL = int(os.getenv("STORY_PNG_COMPRESS_LEVEL", "1"))
+    STORY_JPEG_QUALITY = int(os.getenv("STORY_JPEG_QUALITY", "90"))
 
     TOPIC_TRANCE = int(os.getenv("TOPIC_TRANCE", "0"))
     TOPIC_DNB = int(os.getenv("TOPIC_DNB", "0"))
@@ -64,12 +77,75 @@ class Config:
         if key.strip()
     ]
     GOOGLE_SEARCH_CX = os.getenv("GOOGLE_SEARCH_CX", "")
+    GOOGLE_MAX_CONCURRENCY = int(os.getenv("GOOGLE_MAX_CONCURRENCY", "3"))
+    GOOGLE_USAGE_FLUSH_SECONDS = float(os.getenv("GOOGLE_USAGE_FLUSH_SECONDS", "60"))
+    # how long artist genre lookups via Google are reused (with / without genres found)
+    GOOGLE_CACHE_TTL_DAYS = int(os.getenv("GOOGLE_CACHE_TTL_DAYS", "60"))
+    GOOGLE_MISS_TTL_DAYS = int(os.getenv("GOOGLE_MISS_TTL_DAYS", "14"))
     ADMIN_CHAT_ID = int(os.getenv("ADMIN_CHAT_ID", "0"))
     ENABLE_GENRE_ALERTS = os.getenv("ENABLE_GENRE_ALERTS", "false").lower() == "true"
     LASTFM_API_KEY = os.getenv("LASTFM_API_KEY", "")
+    LASTFM_MAX_CONCURRENCY = int(os.getenv("LASTFM_MAX_CONCURRENCY", "4"))
+    LASTFM_RATE_PER_SECOND = float(os.getenv("LASTFM_RATE_PER_SECOND", "4"))
+    LASTFM_MAX_RETRIES = int(os.getenv("LASTFM_MAX_RETRIES", "3"))
+    LASTFM_HIT_TTL_DAYS = int(os.getenv("LASTFM_HIT_TTL_DAYS", "30"))
+    LASTFM_MISS_TTL_DAYS = int(os.getenv("LASTFM_MISS_TTL_DAYS", "7"))
+    ARTIST_CACHE_PATH = os.getenv("ARTIST_CACHE_PATH", "storage/cache/artist_genres.sqlite3")
+    ARTIST_CACHE_TTL_DAYS = int(os.getenv("ARTIST_CACHE_TTL_DAYS", "90"))
+    GENRE_CLASSIFIER_ENABLED = os.getenv("GENRE_CLASSIFIER_ENABLED", "true").lower() == "true"
+    GENRE_MODEL_PATH = os.getenv("GENRE_MODEL_PATH", "storage/models/genre_nb.json")
+    # minimum posterior probability to trust the local model and skip Last.fm/Google
+    GENRE_CLASSIFIER_THRESHOLD = float(os.getenv("GENRE_CLASSIFIER_THRESHOLD", "0.85"))
+    # how often detect_genres checks the artists table for edits
+    ARTIST_DICTIONARY_REFRESH_SECONDS = int(os.getenv("ARTIST_DICTIONARY_REFRESH_SECONDS", "300"))
     OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY", "")
+    OCR_SPACE_MAX_CONCURRENCY = int(os.getenv("OCR_SPACE_MAX_CONCURRENCY", "4"))
+    # fallback languages: "sequential" (stop at the first good answer) or "race" (all at once)
+    OCR_SPACE_LANGUAGE_MODE = os.getenv("OCR_SPACE_LANGUAGE_MODE", "sequential")
+    # a text at least this long is good enough to skip the remaining languages
+    OCR_SPACE_MIN_CHARS = int(os.getenv("OCR_SPACE_MIN_CHARS", "1"))
+    OCR_SPACE_MAX_RETRIES = int(os.getenv("OCR_SPACE_MAX_RETRIES", "3"))
+    # OCR worker processes (each keeps its own EasyOCR readers in memory); 0 runs OCR in a thread
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+    OCR_MAX_PENDING = int(os.getenv("OCR_MAX_PENDING", "4"))
+    OCR_TIMEOUT_SECONDS = float(os.getenv("OCR_TIMEOUT_SECONDS", "120"))
+    # images per pool job in submit_many; bigger runs are split so one job can't hold a slot for long
+    OCR_BATCH_SIZE = int(os.getenv("OCR_BATCH_SIZE", "8"))
+    # load the EasyOCR models right after startup instead of on the first flyer
+    OCR_WARMUP = os.getenv("OCR_WARMUP", "false").lower() == "true"
+    # EasyOCR input: longer side in pixels (0 = full resolution), grayscale, crop to the text area
+    OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "1600"))
+    OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+    OCR_CROP_TEXT = os.getenv("OCR_CROP_TEXT", "false").lower() == "true"
+    # second EasyOCR pass with the cyrillic reader: auto (low-confidence latin pass), always, never
+    OCR_CYRILLIC_MODE = os.getenv("OCR_CYRILLIC_MODE", "auto").lower()
+    OCR_CYRILLIC_CONFIDENCE = float(os.getenv("OCR_CYRILLIC_CONFIDENCE", "0.5"))
+    # OCR text by image content hash (all engines), least recently read entries evicted above the cap
+    OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "storage/cache/ocr.sqlite3")
+    OCR_CACHE_MAX_MB = float(os.getenv("OCR_CACHE_MAX_MB", "64"))
+    # blank or undecodable images are remembered this long so they aren't sent to OCR on every run
+    OCR_NEGATIVE_TTL_HOURS = float(os.getenv("OCR_NEGATIVE_TTL_HOURS", "24"))
+    # reposted flyers: dHash index of OCR'd images, near-duplicates within N differing bits (max 7)
+    IMAGE_HASH_INDEX_PATH = os.getenv("IMAGE_HASH_INDEX_PATH", "storage/cache/image_hashes.sqlite3")
+    IMAGE_HASH_MAX_DISTANCE = int(os.getenv("IMAGE_HASH_MAX_DISTANCE", "6"))
+    # a near-duplicate indexed this recently is a repost: its stored text is reused instead of OCR.
+    # Older ones are more likely last edition's template of a recurring party and are read again.
+    IMAGE_HASH_REUSE_HOURS = float(os.getenv("IMAGE_HASH_REUSE_HOURS", "48"))
+    IMAGE_HASH_MAX_AGE_DAYS = float(os.getenv("IMAGE_HASH_MAX_AGE_DAYS", "180"))
     VENTI_API_COOKIE = os.getenv("VENTI_API_COOKIE", "")
     VENTI_API_AUTH = os.getenv("VENTI_API_AUTH", "")
+    VENTI_HORIZON_DAYS = int(os.getenv("VENTI_HORIZON_DAYS", "60"))
+
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "storage/http_cache")
+    # per-source TTL overrides in seconds, e.g. "venti=900,passline=3600"
+    HTTP_CACHE_TTLS = _parse_ttls(os.getenv("HTTP_CACHE_TTLS", ""))
+    # daily sweep: entries not refetched for this long go, then the oldest down to the cap
+    HTTP_CACHE_MAX_AGE_DAYS = float(os.getenv("HTTP_CACHE_MAX_AGE_DAYS", "14"))
+    HTTP_CACHE_MAX_MB = float(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+    # headless Chromium for canonical links: pages open at once, per-page timeout
+    CANONICAL_BROWSER_PAGES = int(os.getenv("CANONICAL_BROWSER_PAGES", "4"))
+    CANONICAL_BROWSER_TIMEOUT_MS = int(os.getenv("CANONICAL_BROWSER_TIMEOUT_MS", "15000"))
 
     INSTAGRAM_PROFILES = os.getenv("INSTAGRAM_PROFILES", "")
     INSTAGRAM_USER = os.getenv("INSTAGRAM_USER", "")
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import re
-from functools import lru_cache
-from typing import Iterable, List, Optional, Sequence
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Mapping, Optional, Sequence
 
 from .config import Config
+from .genre_matcher import KeywordMatcher
 from .services.google_search import search_music_genre_snippets
-from .services.lastfm import fetch_top_tags
-from .services.artist_cache import get_cached_genres, cache_artist_genres
+from .services.lastfm import fetch_top_tags_many
+from .services.artist_cache import cache_artist_genres, get_cached_genres, get_store, normalize_artist_key
+from .services.artist_dictionary import ArtistDictionary
+from .services.genre_classifier import get_classifier
+
+logger = logging.getLogger("genre")
+
+GOOGLE_PROVIDER = "google"
 
 GENRE_ORDER: Sequence[str] = (
     "electronic",
@@ -131,20 +141,7 @@ GENRE_KEYWORDS: dict[str, list[str]] = {
     ],
 }
 
-_patterns_built = False
-KEYWORD_PATTERNS: dict[str, re.Pattern[str]] = {}
-
-def get_keyword_patterns():
-    global _patterns_built
-    if not _patterns_built:
-        for genre, keywords in GENRE_KEYWORDS.items():
-            for keyword in keywords:
-                KEYWORD_PATTERNS[keyword] = re.compile(rf"\b{re.escape(keyword)}\b", flags=re.IGNORECASE)
-        _patterns_built = True
-    return KEYWORD_PATTERNS
-
-
-# Хардкод для повторяющихся артистов/серий мероприятий
+# Встроенные пресеты артистов/серий мероприятий (начальные данные таблицы artists)
 ARTIST_GENRE: dict[str, Sequence[str]] = {
     "armin van buuren": ("trance",),
     "adam beyer": ("techno",),
@@ -163,6 +160,23 @@ ARTIST_GENRE: dict[str, Sequence[str]] = {
     "bizarrap": ("rap", "electronic"),
 }
 
+
+def _keyword_entries():
+    for genre, keywords in GENRE_KEYWORDS.items():
+        for keyword in keywords:
+            yield keyword, (genre,), True
+
+
+def build_genre_matcher(artists: Mapping[str, Sequence[str]]) -> KeywordMatcher:
+    """Keywords (word-bounded) plus artist presets (substring) in one automaton."""
+    artist_entries = ((artist, preset, False) for artist, preset in artists.items())
+    return KeywordMatcher([*_keyword_entries(), *artist_entries])
+
+
+KEYWORD_MATCHER = KeywordMatcher(_keyword_entries())
+# Артисты живут в таблице artists; ARTIST_GENRE — запасной вариант, пока БД недоступна
+ARTIST_DICTIONARY = ArtistDictionary(ARTIST_GENRE, build_genre_matcher)
+
 LASTFM_TAG_MAP: dict[str, Iterable[str]] = {
     "electronic": ["electronic", "edm", "electronica", "club", "club music"],
     "trance": ["trance", "uplifting trance", "progressive trance", "psytrance"],
@@ -180,16 +194,7 @@ LASTFM_TAG_MAP: dict[str, Iterable[str]] = {
 
 
 def _match_keywords(text: str) -> set[str]:
-    hits: set[str] = set()
-    lowered = text.lower()
-    patterns = get_keyword_patterns()
-    for genre, keywords in GENRE_KEYWORDS.items():
-        for keyword in keywords:
-            pattern = patterns[keyword]
-            if pattern.search(lowered):
-                hits.add(genre)
-                break
-    return hits
+    return KEYWORD_MATCHER.scan(text)
 
 
 def _normalize(genres: Iterable[str]) -> list[str]:
@@ -263,70 +268,181 @@ def _candidate_names(hints: Iterable[str], exclude: Optional[str] = None) -> Lis
     return candidates
 
 
-@lru_cache(maxsize=128)
+# Счётчики за время жизни процесса: сколько запросов к Google сэкономил кеш
+GOOGLE_LOOKUP_STATS: Counter[str] = Counter()
+
+
+def google_lookup_stats() -> dict[str, int]:
+    return dict(GOOGLE_LOOKUP_STATS)
+
+
 def _google_genre_lookup(name: str) -> set[str]:
+    key = normalize_artist_key(name)
+    store = get_store()
+    cached = store.get(GOOGLE_PROVIDER, key)
+    if cached is not None:
+        GOOGLE_LOOKUP_STATS["cache_hits"] += 1
+        return set(cached)
+
+    GOOGLE_LOOKUP_STATS["cache_misses"] += 1
     snippets = search_music_genre_snippets(name)
+    if snippets is None:
+        GOOGLE_LOOKUP_STATS["unavailable"] += 1
+        return set()
+
     hits: set[str] = set()
     for snippet in snippets:
         hits.update(_match_keywords(snippet))
+    GOOGLE_LOOKUP_STATS["hits" if hits else "misses"] += 1
+    ttl_days = Config.GOOGLE_CACHE_TTL_DAYS if hits else Config.GOOGLE_MISS_TTL_DAYS
+    store.put(GOOGLE_PROVIDER, key, hits, ttl=ttl_days * 86400)
+    logger.info("Google genre lookup for %r: %s (%s)", name, sorted(hits) or "no genres", google_lookup_stats())
     return hits
 
 
-def _ensure_electronic(genres: set[str], combined_text: str) -> None:
+def _ensure_electronic(genres: set[str], text_hits: set[str]) -> None:
     if genres.intersection(ELECTRONIC_SUBGENRES):
         genres.add("electronic")
         return
     if "electronic" in genres:
         return
-    if _match_keywords(combined_text).intersection({"electronic"}):
+    if "electronic" in text_hits:
         genres.add("electronic")
 
 
-def detect_genres(text: str, hints: Optional[list[str]] = None) -> tuple[list[str], list[str]]:
-    sources = [text] + (hints or [])
-    combined_text = " ".join(filter(None, sources))
-    combined_lower = combined_text.lower()
-
-    genres: set[str] = set()
-    
-    # Only search for artists in the primary title (text) to avoid descriptions/locations polluting search
-    title_to_exclude = text if text and len(text) > 3 else None
-    candidate_names = _candidate_names([text], exclude=title_to_exclude)
-
-    # 1. прямое совпадение артистов/брендов
-    for artist, preset in ARTIST_GENRE.items():
-        if artist in combined_lower:
-            genres.update(preset)
-
-    # 2. ключевые слова в тексте
-    for chunk in sources:
-        if not chunk:
-            continue
-        genres.update(_match_keywords(chunk))
+def _first_resolved(names: Iterable[str], resolved: Mapping[str, set[str]]) -> Optional[str]:
+    for name in names:
+        if resolved.get(name):
+            return name
+    return None
 
-    # 3. Last.fm fallback
-    if Config.LASTFM_API_KEY and not genres:
-        for name in candidate_names:
-            tags = fetch_top_tags(name)
-            mapped = _map_lastfm_tags(tags)
-            if mapped:
-                cache_artist_genres(name, mapped)
-                genres.update(mapped)
-                break
 
-    # 4. Google fallback, если всё ещё пусто
+def _google_enabled() -> bool:
     key_pool = list(Config.GOOGLE_SEARCH_API_KEYS or [])
     if Config.GOOGLE_SEARCH_API_KEY and Config.GOOGLE_SEARCH_API_KEY not in key_pool:
         key_pool.append(Config.GOOGLE_SEARCH_API_KEY)
-    if not genres and key_pool and Config.GOOGLE_SEARCH_CX:
-        for name in candidate_names:
-            hits = _google_genre_lookup(name)
-            if hits:
-                cache_artist_genres(name, hits)
-                genres.update(hits)
-                break
-
-    final_genres = _normalize(genres) if genres else ["general"]
-    _ensure_electronic(set(final_genres), combined_lower)
-    
-    return final_genres, candidate_names
+    return bool(key_pool and Config.GOOGLE_SEARCH_CX)
+
+
+def _resolve_with_google(pending: dict[int, list[str]], resolved: dict[str, set[str]]) -> None:
+    """Ask Google in rounds: the k-th candidate of every unresolved item, unique
+    names in parallel. An item stops at its first hit, as the sequential loop
+    did, so the batch never spends more quota than item-by-item detection."""
+    tried: set[str] = set()
+    rank = 0
+    with ThreadPoolExecutor(max_workers=max(1, Config.GOOGLE_MAX_CONCURRENCY)) as pool:
+        while pending:
+            names = list(dict.fromkeys(
+                cands[rank] for cands in pending.values() if cands[rank] not in tried
+            ))
+            tried.update(names)
+            for name, hits in zip(names, pool.map(_google_genre_lookup, names)):
+                if hits:
+                    cache_artist_genres(name, hits)
+                    resolved[name] = hits
+            pending = {
+                idx: cands for idx, cands in pending.items()
+                if not resolved.get(cands[rank]) and rank + 1 < len(cands)
+            }
+            rank += 1
+
+
+def detect_genres_many(
+    items: Sequence[tuple[str, Optional[list[str]]]],
+    *,
+    remote: bool = True,
+) -> list[tuple[list[str], list[str]]]:
+    """``detect_genres`` for a whole scrape run, as ``[(text, hints), ...]``.
+
+    Text matching is done per item; remote lookups are shared: every unique
+    candidate name is resolved once through the artist cache; items the local
+    classifier is confident about stop there, the rest go to Last.fm (all at
+    once) and then Google for whatever is still unknown. Each item gets the
+    genres of its first resolved candidate, in the same order as before.
+    ``remote=False`` stops after the cache and the classifier (backfills).
+    """
+    matcher = ARTIST_DICTIONARY.get()
+    text_hits: list[set[str]] = []
+    candidates: list[list[str]] = []
+    for text, hints in items:
+        sources = [text] + (hints or [])
+        # Only search for artists in the primary title (text) to avoid descriptions/locations polluting search
+        title_to_exclude = text if text and len(text) > 3 else None
+        candidates.append(_candidate_names([text], exclude=title_to_exclude))
+        # 1-2. артисты/бренды и ключевые слова за один проход по всем фрагментам;
+        # перевод строки между фрагментами не даёт фразам склеиться через границу
+        text_hits.append(matcher.scan("\n".join(filter(None, sources))))
+
+    unresolved = [idx for idx, hits in enumerate(text_hits) if not hits and candidates[idx]]
+    resolved: dict[str, set[str]] = {}
+    names = list(dict.fromkeys(name for idx in unresolved for name in candidates[idx]))
+    for name in names:
+        cached = get_cached_genres(name)
+        if cached:
+            resolved[name] = set(cached)
+
+    # 2b. локальная модель: если уверена, в сеть не ходим
+    predicted: dict[int, set[str]] = {}
+    classifier = get_classifier()
+    if classifier is not None:
+        for idx, hits in enumerate(text_hits):
+            if hits or _first_resolved(candidates[idx], resolved):
+                continue
+            guess = classifier.predict_genres(
+                items[idx][0], candidates[idx], threshold=Config.GENRE_CLASSIFIER_THRESHOLD
+            )
+            if guess:
+                predicted[idx] = guess
+
+    # 3. Last.fm: все неизвестные имена пачкой, параллельно
+    pending = [
+        idx for idx in unresolved
+        if idx not in predicted and not _first_resolved(candidates[idx], resolved)
+    ]
+    if remote and Config.LASTFM_API_KEY and pending:
+        lookup = list(dict.fromkeys(n for idx in pending for n in candidates[idx] if n not in resolved))
+        tags_by_name = fetch_top_tags_many(lookup)
+        for name in lookup:
+            mapped = _map_lastfm_tags(tags_by_name.get(name, []))
+            if mapped:
+                resolved[name] = mapped
+        for idx in pending:
+            name = _first_resolved(candidates[idx], resolved)
+            if name:
+                cache_artist_genres(name, resolved[name])
+
+    # 4. Google fallback, если всё ещё пусто
+    pending = [idx for idx in pending if not _first_resolved(candidates[idx], resolved)]
+    if remote and pending and _google_enabled():
+        _resolve_with_google({idx: candidates[idx] for idx in pending}, resolved)
+
+    results: list[tuple[list[str], list[str]]] = []
+    for idx, (hits, names) in enumerate(zip(text_hits, candidates)):
+        genres = set(hits)
+        if not genres:
+            name = _first_resolved(names, resolved)
+            if name:
+                genres.update(resolved[name])
+            elif idx in predicted:
+                genres.update(predicted[idx])
+        final_genres = _normalize(genres) if genres else ["general"]
+        _ensure_electronic(set(final_genres), hits)
+        results.append((final_genres, names))
+    return results
+
+
+def detect_genres(text: str, hints: Optional[list[str]] = None) -> tuple[list[str], list[str]]:
+    return detect_genres_many([(text, hints)])[0]
+
+
+async def detect_genres_many_async(
+    items: Sequence[tuple[str, Optional[list[str]]]],
+    *,
+    remote: bool = True,
+) -> list[tuple[list[str], list[str]]]:
+    """``detect_genres_many`` for async callers: cache, Last.fm and Google run off the event loop."""
+    return await asyncio.to_thread(detect_genres_many, items, remote=remote)
+
+
+async def detect_genres_async(text: str, hints: Optional[list[str]] = None) -> tuple[list[str], list[str]]:
+    return (await detect_genres_many_async([(text, hints)]))[0]
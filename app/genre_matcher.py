@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable, Tuple
+
+# (keyword, labels, word-bounded?)
+MatcherEntry = Tuple[str, Iterable[str], bool]
+
+
+def _is_word(ch: str) -> bool:
+    # Same definition as ``\w`` in ``re`` for str patterns.
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword in one pass over the text.
+
+    Bounded entries behave like ``re.search(rf"\\b{re.escape(keyword)}\\b")``;
+    unbounded ones are plain substring checks (as used for artist names).
+    Matching is case-insensitive: keywords and text are both lowercased.
+    """
+
+    def __init__(self, entries: Iterable[MatcherEntry]):
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple]] = [[]]
+        for keyword, labels, bounded in entries:
+            keyword = (keyword or "").lower()
+            labels = frozenset(labels)
+            if not keyword or not labels:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(
+                (
+                    len(keyword),
+                    labels,
+                    bounded,
+                    _is_word(keyword[0]),
+                    _is_word(keyword[-1]),
+                )
+            )
+
+        # Breadth-first pass: failure links, merged outputs and a full
+        # transition table, so scanning is a single dict lookup per character.
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+        self.labels = frozenset(label for out in outputs for entry in out for label in entry[1])
+
+    def scan(self, text: str) -> set[str]:
+        """Return the labels of every entry found in ``text``."""
+        hits: set[str] = set()
+        if not text:
+            return hits
+        text = text.lower()
+        size = len(text)
+        delta = self._delta
+        outputs = self._outputs
+        total = len(self.labels)
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            for length, labels, bounded, first_word, last_word in outputs[state]:
+                if labels <= hits:
+                    continue
+                if bounded:
+                    start = i - length + 1
+                    before = start > 0 and _is_word(text[start - 1])
+                    after = i + 1 < size and _is_word(text[i + 1])
+                    if before == first_word or after == last_word:
+                        continue
+                hits.update(labels)
+                if len(hits) == total:
+                    return hits
+        return hits
+
+
+__all__ = ["KeywordMatcher", "MatcherEntry"]
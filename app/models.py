@@ -23,6 +23,9 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 class Base(DeclarativeBase): ...
 
+# Postgres arrays; JSON lists on the SQLite stand-in used by offline benchmarks.
+StringArray = ARRAY(String).with_variant(JSON(), "sqlite")
+
 class Event(Base):
     __tablename__ = "events"
 
@@ -33,8 +36,8 @@ class Event(Base):
     time: Mapped[Optional[time]] = mapped_column(Time)
     venue: Mapped[Optional[str]] = mapped_column(String(255))
     city: Mapped[Optional[str]] = mapped_column(String(120), default="Buenos Aires")
-    genres: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String))
-    artists: Mapped[Optional[list[str]]] = mapped_column(ARRAY(String))
+    genres: Mapped[Optional[list[str]]] = mapped_column(StringArray)
+    artists: Mapped[Optional[list[str]]] = mapped_column(StringArray)
     support_wallet: Mapped[Optional[str]] = mapped_column(String(42))
     vibe_description: Mapped[Optional[str]] = mapped_column(Text)
 
@@ -112,3 +115,26 @@ class PaymentIntent(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+
+
+class Artist(Base):
+    """Artist/brand → genre presets used by ``detect_genres``; edited via the admin API."""
+
+    __tablename__ = "artists"
+    __table_args__ = (
+        UniqueConstraint("name_norm", name="uq_artists_name_norm"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name_norm: Mapped[str] = mapped_column(String(255), nullable=False)
+    genres: Mapped[list[str]] = mapped_column(StringArray, nullable=False)
+    # bumped to max(version) + 1 on every write so readers can detect changes cheaply
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, index=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
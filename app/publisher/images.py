@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import ssl
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Optional
@@ -11,6 +12,11 @@ import certifi
 from aiogram.types import BufferedInputFile
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - gradient falls back to drawing line by line
+    np = None
+
 from ..models import Event
 from ..services.image_search import search_images
 
@@ -137,6 +143,7 @@ async def _get_event_portrait(ev: Event, session: Optional[aiohttp.ClientSession
     return None
 
 
+@lru_cache(maxsize=32)
 def _load_font(path: Path, size: int) -> ImageFont.FreeTypeFont:
     try:
         return ImageFont.truetype(str(path), size)
@@ -172,15 +179,19 @@ def _apply_shadow(
     color: str,
     opacity: float,
 ) -> None:
-    shadow = Image.new("RGBA", base.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(shadow)
     r, g, b = _hex_to_rgb(color)
     alpha = int(255 * max(0, min(opacity, 1.0)))
     x0, y0, x1, y1 = rect
-    inflated = (x0 - spread, y0 - spread, x1 + spread, y1 + spread)
+    # blur only the area the shadow can reach instead of the whole canvas
+    pad = spread + 3 * blur
+    left, top = max(0, x0 - pad), max(0, y0 - pad)
+    right, bottom = min(base.width, x1 + pad), min(base.height, y1 + pad)
+    shadow = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(shadow)
+    inflated = (x0 - spread - left, y0 - spread - top, x1 + spread - left, y1 + spread - top)
     draw.rounded_rectangle(inflated, radius=radius + spread, fill=(r, g, b, alpha))
     blurred = shadow.filter(ImageFilter.GaussianBlur(blur))
-    base.alpha_composite(blurred)
+    base.alpha_composite(blurred, (left, top))
 
 
 def _inset(rect: tuple[int, int, int, int], amount: int) -> tuple[int, int, int, int]:
@@ -188,18 +199,70 @@ def _inset(rect: tuple[int, int, int, int], amount: int) -> tuple[int, int, int,
     return (x0 + amount, y0 + amount, x1 - amount, y1 - amount)
 
 
-def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[bytes]:
-    base = Image.new("RGBA", (CANVAS_WIDTH, CANVAS_HEIGHT))
-    draw = ImageDraw.Draw(base)
+@lru_cache(maxsize=4)
+def _gradient(width: int, height: int, top: str, bottom: str) -> Image.Image:
+    """Vertical background gradient; callers must copy before drawing on it."""
+    top_rgb = _hex_to_rgb(top)
+    bottom_rgb = _hex_to_rgb(bottom)
+    if np is not None:
+        ratio = np.arange(height, dtype=np.float64)[:, None] / max(height - 1, 1)
+        rows = np.array(top_rgb) * (1 - ratio) + np.array(bottom_rgb) * ratio
+        pixels = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+        return Image.fromarray(np.ascontiguousarray(pixels), "RGB").convert("RGBA")
 
-    top_rgb = _hex_to_rgb(BACKGROUND_TOP)
-    bottom_rgb = _hex_to_rgb(BACKGROUND_BOTTOM)
-    for y in range(CANVAS_HEIGHT):
-        ratio = y / max(CANVAS_HEIGHT - 1, 1)
+    image = Image.new("RGBA", (width, height))
+    draw = ImageDraw.Draw(image)
+    for y in range(height):
+        ratio = y / max(height - 1, 1)
         r = int(top_rgb[0] * (1 - ratio) + bottom_rgb[0] * ratio)
         g = int(top_rgb[1] * (1 - ratio) + bottom_rgb[1] * ratio)
         b = int(top_rgb[2] * (1 - ratio) + bottom_rgb[2] * ratio)
-        draw.line([(0, y), (CANVAS_WIDTH, y)], fill=(r, g, b))
+        draw.line([(0, y), (width, y)], fill=(r, g, b))
+    return image
+
+
+@lru_cache(maxsize=16)
+def _card_chrome(
+    container_rect: tuple[int, int, int, int],
+    divider_y: Optional[int],
+    outer_frame: tuple[int, int, int, int],
+) -> Image.Image:
+    """Everything on the card that does not depend on the event's text or portrait.
+
+    Cached per layout (the container and frame only move with the header and
+    info-row heights), so the shadows are blurred once per process and layout.
+    Callers must copy before drawing on it.
+    """
+    base = _gradient(CANVAS_WIDTH, CANVAS_HEIGHT, BACKGROUND_TOP, BACKGROUND_BOTTOM).copy()
+    _draw_rounded_rect(base, container_rect, RADIUS, fill=CONTAINER_COLOR)
+    if divider_y is not None:
+        _draw_dashed_line(
+            base,
+            container_rect[0] + INNER_MARGIN,
+            divider_y,
+            container_rect[2] - INNER_MARGIN,
+            color=BORDER_COLOR,
+            dash=16,
+            gap=12,
+            width=2,
+        )
+
+    _apply_shadow(base, outer_frame, RADIUS, blur=10, spread=12, color="#000000", opacity=0.35)
+    _apply_shadow(base, outer_frame, RADIUS, blur=4, spread=0, color="#000000", opacity=0.25)
+    _apply_shadow(base, outer_frame, RADIUS, blur=10, spread=8, color="#000000", opacity=0.18)
+
+    _draw_rounded_rect(base, outer_frame, RADIUS, fill=CONTAINER_COLOR)
+    mid_frame = _inset(outer_frame, 18)
+    _draw_rounded_rect(base, mid_frame, RADIUS, fill=FRAME_DARK, outline=BORDER_COLOR, width=1)
+    inner_frame = _inset(mid_frame, 24)
+    _draw_rounded_rect(base, inner_frame, RADIUS, fill=FRAME_LIGHT)
+    return base
+
+
+def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[bytes]:
+    # text goes on a transparent layer: its position depends on the layout computed below
+    text_layer = Image.new("RGBA", (CANVAS_WIDTH, CANVAS_HEIGHT), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(text_layer)
 
     genre_font = _load_font(FONT_PRIMARY, 96)
     artist_font = _load_font(FONT_SECONDARY, 60)
@@ -224,7 +287,6 @@ def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[byt
         CANVAS_WIDTH - OUTER_MARGIN,
         CANVAS_HEIGHT - OUTER_MARGIN,
     )
-    _draw_rounded_rect(base, container_rect, RADIUS, fill=CONTAINER_COLOR)
 
     info_x = container_rect[0] + INNER_MARGIN
     info_y = container_rect[1] + INNER_MARGIN
@@ -249,6 +311,7 @@ def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[byt
         time_line = time_obj.strftime("%H:%M")
 
     row_height = 0
+    divider_y = None
     if location_line or date_line or time_line:
         if location_line:
             draw.text((info_x, info_y), location_line, font=body_font, fill=TEXT_SECONDARY)
@@ -270,16 +333,7 @@ def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[byt
             row_height = max(row_height, len(right_lines) * (line_height + 6) - 6)
 
         info_y += row_height + 24
-        _draw_dashed_line(
-            base,
-            container_rect[0] + INNER_MARGIN,
-            info_y,
-            container_rect[2] - INNER_MARGIN,
-            color=BORDER_COLOR,
-            dash=16,
-            gap=12,
-            width=2,
-        )
+        divider_y = info_y
         info_y += 32
 
     portrait_top = info_y
@@ -293,15 +347,9 @@ def _render_event_card(ev: Event, portrait_png: Optional[bytes]) -> Optional[byt
         portrait_top + portrait_height,
     )
 
-    _apply_shadow(base, outer_frame, RADIUS, blur=10, spread=12, color="#000000", opacity=0.35)
-    _apply_shadow(base, outer_frame, RADIUS, blur=4, spread=0, color="#000000", opacity=0.25)
-    _apply_shadow(base, outer_frame, RADIUS, blur=10, spread=8, color="#000000", opacity=0.18)
-
-    _draw_rounded_rect(base, outer_frame, RADIUS, fill=CONTAINER_COLOR)
-    mid_frame = _inset(outer_frame, 18)
-    _draw_rounded_rect(base, mid_frame, RADIUS, fill=FRAME_DARK, outline=BORDER_COLOR, width=1)
-    inner_frame = _inset(mid_frame, 24)
-    _draw_rounded_rect(base, inner_frame, RADIUS, fill=FRAME_LIGHT)
+    base = _card_chrome(container_rect, divider_y, outer_frame).copy()
+    base.alpha_composite(text_layer)
+    inner_frame = _inset(_inset(outer_frame, 18), 24)
 
     if portrait_png:
         try:
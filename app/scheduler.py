@@ -8,8 +8,11 @@ from .scrapers.catpass_parser import run as catpass_run
 from .scrapers.bombo_parser import run as bombo_run
 from .scrapers.instagram_scraper import run as instagram_basic_run
 from .scrapers.instagram_playwright import run as instagram_playwright_run
+from .scrapers.http_cache import sweep as sweep_http_cache
 from .publisher.bot_publisher import run_publisher
 from .config import Config
+from .genre import ARTIST_DICTIONARY
+from .services import ocr
 
 async def instagram_job(limit=10):
     mode = os.getenv("INSTAGRAM_SCRAPE_MODE", "basic").lower()
@@ -24,17 +27,26 @@ def _hhmm(s):
     return {"hour": h, "minute": m}
 
 async def start_scheduler():
+    # load the artists table once up front; later edits are picked up by version
+    await asyncio.to_thread(ARTIST_DICTIONARY.refresh, True)
+    if Config.OCR_WARMUP:
+        ocr.start_warmup()
     sch = AsyncIOScheduler(timezone=Config.TZ)
     sch.add_job(fetch_and_store, "interval", minutes=45, kwargs={"limit": 10})
-    sch.add_job(venti_run, "interval", hours=3, kwargs={"limit": 10})
+    sch.add_job(venti_run, "interval", hours=3, kwargs={"limit": 10, "incremental": True})
+    # incremental runs only add events; a daily full run refreshes the ones already stored
+    sch.add_job(venti_run, "interval", hours=24, minutes=40, kwargs={"limit": 10})
     sch.add_job(passline_run, "interval", hours=3, minutes=10, kwargs={"limit": 10})
     sch.add_job(catpass_run, "interval", hours=3, minutes=20, kwargs={"limit": 10})
     sch.add_job(bombo_run, "interval", hours=3, minutes=30, kwargs={"limit": 10})
     sch.add_job(instagram_job, "interval", hours=6, kwargs={"limit": 10})
     sch.add_job(run_publisher, "interval", minutes=30)
+    sch.add_job(sweep_http_cache, "interval", hours=24)
     
     if Config.ENABLE_STORIES:
         from .stories.post import send_story
+        from .stories.render import warm_up as warm_up_stories
+        await asyncio.to_thread(warm_up_stories)
         sch.add_job(send_story, CronTrigger(**_hhmm(Config.STORY_MORNING)))
         sch.add_job(send_story, CronTrigger(**_hhmm(Config.STORY_EVENING)))
     
@@ -17,6 +17,7 @@ from ..utils import (
 )
 from ..services.ocr import extract_text
 from .link_utils import resolve_canonical_url
+from .http_cache import CachedSession, is_unchanged
 # from ..services.n8n_service import push_event_to_n8n
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -51,12 +52,15 @@ def _collect_slides(soup: BeautifulSoup):
 def run(limit: int = None, force_publish: bool = False):
     logger.info("[bombo] Fetching events…")
     # Use cloudscraper to bypass potential 403/401 WAFs
-    scraper = cloudscraper.create_scraper()
+    scraper = CachedSession(cloudscraper.create_scraper(), source="bombo")
     scraper.headers.update(HEADERS)
     
     try:
         resp = scraper.get(PAGE_URL, timeout=20)
         resp.raise_for_status()
+        if is_unchanged(resp) and not force_publish:
+            logger.info("[bombo] Page unchanged since last run; skipping.")
+            return
         content_html = resp.json()["content"]["rendered"]
     except Exception as exc:
         logger.error(f"[bombo] Failed to fetch page: {exc}")
@@ -150,6 +154,7 @@ def run(limit: int = None, force_publish: bool = False):
             created += 1
 
         db.commit()
+        scraper.mark_processed(resp)
         logger.info(f"[bombo] Added {created} new events, updated {updated}.")
     finally:
         db.close()
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from ..db import SessionLocal
 from ..models import Event
-from ..genre import detect_genres
+from ..genre import detect_genres_many
 from ..utils import (
     TZ,
     make_hash,
@@ -14,6 +14,7 @@ from ..utils import (
     parse_date,
     detect_city,
 )
+from .http_cache import CachedSession, is_unchanged
 # from ..services.n8n_service import push_event_to_n8n
 
 
@@ -48,9 +49,13 @@ def _parse_datetime(fecha: Optional[str], hora: Optional[str]):
 
 def run(limit: int = None, force_publish: bool = False):
     logger.info("[catpass] Fetching events…")
+    session = CachedSession(requests.Session(), source="catpass")
     try:
-        resp = requests.get(API_URL, timeout=20)
+        resp = session.get(API_URL, timeout=20)
         resp.raise_for_status()
+        if is_unchanged(resp) and not force_publish:
+            logger.info("[catpass] API payload unchanged since last run; skipping.")
+            return
         events_payload = resp.json()
         if not isinstance(events_payload, list):
             logger.warning("[catpass] Unexpected payload format")
@@ -76,6 +81,13 @@ def run(limit: int = None, force_publish: bool = False):
     if limit:
         items_with_dates = items_with_dates[:limit]
 
+    # жанры для всей пачки разом: одинаковые артисты ищутся один раз
+    titled = [item for _, _, item in items_with_dates if item.get("nombre")]
+    genre_results = dict(zip(map(id, titled), detect_genres_many([
+        (item["nombre"], [item.get("descripcion") or "", item.get("ubicacion") or None])
+        for item in titled
+    ])))
+
     db: Session = SessionLocal()
     created = 0
     updated = 0
@@ -101,7 +113,7 @@ def run(limit: int = None, force_publish: bool = False):
             media_url = item.get("img") or None
 
             combined_text = " ".join(filter(None, [title, descripcion, venue]))
-            genres, artists = detect_genres(title, hints=[descripcion, venue])
+            genres, artists = genre_results[id(item)]
 
             existing = db.query(Event).filter_by(dedupe_hash=dedupe).first()
             if existing:
@@ -145,6 +157,7 @@ def run(limit: int = None, force_publish: bool = False):
             created += 1
 
         db.commit()
+        session.mark_processed(resp)
         logger.info(f"[catpass] Added {created} new events, updated {updated}.")
     finally:
         db.close()
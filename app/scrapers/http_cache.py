@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..config import Config
+
+logger = logging.getLogger("http_cache")
+
+CACHE_DIR = Path(Config.HTTP_CACHE_DIR)
+STORED_HEADERS = (
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+    "Expires",
+)
+MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+# request headers that change what the server returns: part of the cache key
+KEY_HEADERS = ("Authorization", "Proxy-Authorization", "Cookie")
+
+# Optional hook (see ``replay``) that swaps the underlying session for a
+# recording or replaying one. The cache is bypassed while it is installed.
+_transport: Optional[Callable] = None
+
+
+def install_transport(factory: Optional[Callable]) -> Optional[Callable]:
+    """Install ``factory(session, source) -> session``; returns the previous hook."""
+    global _transport
+    previous, _transport = _transport, factory
+    return previous
+
+
+def _cache_key(url: str, headers=None) -> str:
+    """Entry key: the URL plus any credentials sent with it, so they never share a response."""
+    parts = [url]
+    if headers:
+        parts.extend(f"{name}: {headers[name]}" for name in KEY_HEADERS if headers.get(name))
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _cache_control(headers) -> str:
+    return (headers.get("Cache-Control") or "").lower()
+
+
+def _header_ttl(headers, fetched_at: float) -> int:
+    directives = _cache_control(headers)
+    if "no-cache" in directives or "no-store" in directives:
+        return 0
+    m = MAX_AGE_RE.search(directives)
+    if m:
+        return int(m.group(1))
+    if headers.get("Expires"):
+        try:
+            return max(0, int(parsedate_to_datetime(headers["Expires"]).timestamp() - fetched_at))
+        except (TypeError, ValueError, OverflowError):
+            return 0
+    return 0
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def build_response(meta: dict, body: bytes) -> requests.Response:
+    """Rebuild a ``requests.Response`` from stored metadata and body."""
+    resp = requests.Response()
+    resp.status_code = meta.get("status", 200)
+    resp.headers = CaseInsensitiveDict(meta.get("headers") or {})
+    resp.url = meta.get("final_url") or meta.get("url")
+    resp.encoding = meta.get("encoding")
+    resp._content = body
+    return resp
+
+
+def is_unchanged(resp) -> bool:
+    """True when the response body is the one a previous run already processed.
+
+    "Processed" means the parser called ``CachedSession.mark_processed`` after
+    committing, so a run that crashed half-way does not hide the page from the
+    next one.
+    """
+    return bool(getattr(resp, "unchanged", False))
+
+
+class CachedSession:
+    """Drop-in wrapper around a ``requests`` session with an on-disk GET cache.
+
+    Entries are stored per source under ``HTTP_CACHE_DIR``. A fresh entry
+    (per-source TTL override, otherwise ``Cache-Control: max-age``) is served
+    without touching the network; stale entries are revalidated with
+    ``If-None-Match``/``If-Modified-Since``. Every returned response carries
+    ``from_cache`` and ``unchanged`` flags so parsers can skip reparsing; a
+    body only counts as unchanged once ``mark_processed`` has been called for
+    it.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        *,
+        source: str,
+        ttl: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.session = session if session is not None else requests.Session()
+        self.source = source
+        self.ttl = ttl if ttl is not None else Config.HTTP_CACHE_TTLS.get(source)
+        self.cache_dir = (cache_dir or CACHE_DIR) / source
+        self.enabled = Config.HTTP_CACHE_ENABLED if enabled is None else enabled
+        if _transport is not None:
+            self.session = _transport(self.session, source)
+            self.enabled = False
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load(self, key: str) -> Optional[tuple[dict, bytes]]:
+        meta_path, body_path = self._paths(key)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except Exception as exc:
+            logger.debug("Failed to read HTTP cache entry %s: %s", meta_path, exc)
+            return None
+        # another process may have replaced the body but not yet the metadata
+        if meta.get("digest") and hashlib.sha256(body).hexdigest() != meta["digest"]:
+            return None
+        return meta, body
+
+    def _save(self, key: str, meta: dict, body: Optional[bytes] = None) -> None:
+        meta_path, body_path = self._paths(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                _write_atomic(body_path, body)
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        except Exception as exc:
+            logger.warning("Failed to persist HTTP cache entry %s: %s", meta_path, exc)
+
+    def _entry_ttl(self, meta: dict, override: Optional[int]) -> int:
+        if override is not None:
+            return override
+        if self.ttl is not None:
+            return self.ttl
+        return _header_ttl(meta.get("headers") or {}, meta.get("fetched_at", 0))
+
+    @staticmethod
+    def _build_response(key: str, meta: dict, body: bytes) -> requests.Response:
+        resp = build_response(meta, body)
+        resp.from_cache = True
+        resp.unchanged = bool(meta.get("digest")) and meta.get("processed") == meta.get("digest")
+        resp.cache_key = key
+        resp.digest = meta.get("digest")
+        return resp
+
+    def mark_processed(self, *responses) -> None:
+        """Record that the parser is done with these bodies (call after ``db.commit()``)."""
+        for resp in responses:
+            key, digest = getattr(resp, "cache_key", None), getattr(resp, "digest", None)
+            if not key or not digest:
+                continue
+            cached = self._load(key)
+            if cached and cached[0].get("digest") == digest:
+                meta = cached[0]
+                meta["processed"] = digest
+                self._save(key, meta)
+
+    def get(self, url: str, params=None, *, ttl: Optional[int] = None, **kwargs):
+        if not self.enabled:
+            resp = self.session.get(url, params=params, **kwargs)
+            resp.from_cache = False
+            resp.unchanged = False
+            return resp
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        headers = dict(kwargs.pop("headers", None) or {})
+        sent = CaseInsensitiveDict(getattr(self.session, "headers", None) or {})
+        sent.update(headers)
+        key = _cache_key(full_url, sent)
+        cached = self._load(key)
+
+        if cached:
+            meta, body = cached
+            age = time.time() - meta.get("fetched_at", 0)
+            if age < self._entry_ttl(meta, ttl):
+                return self._build_response(key, meta, body)
+            stored = meta.get("headers") or {}
+            if stored.get("ETag"):
+                headers["If-None-Match"] = stored["ETag"]
+            if stored.get("Last-Modified"):
+                headers["If-Modified-Since"] = stored["Last-Modified"]
+
+        resp = self.session.get(full_url, headers=headers or None, **kwargs)
+        resp.from_cache = False
+        resp.unchanged = False
+
+        if resp.status_code == 304 and cached:
+            meta, body = cached
+            refreshed = meta.get("headers") or {}
+            for name in STORED_HEADERS:
+                if resp.headers.get(name):
+                    refreshed[name] = resp.headers[name]
+            meta["headers"] = refreshed
+            meta["fetched_at"] = time.time()
+            self._save(key, meta)
+            return self._build_response(key, meta, body)
+
+        if resp.status_code != 200 or "no-store" in _cache_control(resp.headers):
+            return resp
+
+        body = resp.content
+        digest = hashlib.sha256(body).hexdigest()
+        previous = cached[0] if cached else {}
+        resp.unchanged = previous.get("processed") == digest
+        resp.cache_key = key
+        resp.digest = digest
+        meta = {
+            "url": full_url,
+            "final_url": resp.url,
+            "status": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": {name: resp.headers[name] for name in STORED_HEADERS if resp.headers.get(name)},
+            "digest": digest,
+            "processed": previous.get("processed"),
+            "fetched_at": time.time(),
+        }
+        self._save(key, meta, None if previous.get("digest") == digest else body)
+        return resp
+
+
+def sweep(
+    cache_dir: Optional[Path] = None,
+    *,
+    older_than: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    dry_run: bool = False,
+) -> int:
+    """Delete entries not (re)fetched for ``older_than`` seconds, then the oldest above ``max_bytes``.
+
+    Defaults come from ``HTTP_CACHE_MAX_AGE_DAYS`` and ``HTTP_CACHE_MAX_MB``.
+    Returns the number of entries removed (or that would be, with ``dry_run``).
+    """
+    cache_dir = Path(cache_dir or CACHE_DIR)
+    older_than = Config.HTTP_CACHE_MAX_AGE_DAYS * 86400 if older_than is None else older_than
+    max_bytes = int(Config.HTTP_CACHE_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+    cutoff = time.time() - older_than
+
+    entries = []
+    for meta_path in cache_dir.glob("*/*.json"):
+        body_path = meta_path.with_suffix(".body")
+        try:
+            stat = meta_path.stat()
+            size = stat.st_size + (body_path.stat().st_size if body_path.exists() else 0)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, size, meta_path, body_path))
+    entries.sort(key=lambda entry: entry[0])
+    total = sum(size for _, size, _, _ in entries)
+
+    removed = 0
+    for mtime, size, meta_path, body_path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        removed += 1
+        total -= size
+        if not dry_run:
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+    if removed and not dry_run:
+        logger.info("HTTP cache sweep removed %s entries", removed)
+    return removed
+
+
+__all__ = ["CachedSession", "build_response", "install_transport", "is_unchanged", "sweep"]
@@ -1,226 +1,382 @@
 import asyncio
 import os
 import logging
+import shutil
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process lock
+    fcntl = None
+
 from playwright.async_api import async_playwright
 from sqlalchemy.orm import Session
+from ..config import Config
 from ..db import SessionLocal
 from ..models import Event
-from ..genre import detect_genres
+from ..genre import detect_genres_async
 from ..utils import normalize_title, make_hash, parse_date
-from ..services.ocr import extract_text_from_bytes
+from ..services import ocr
 # from ..services.n8n_service import push_event_to_n8n
 
 logger = logging.getLogger("instagram_playwright")
 logging.basicConfig(level=logging.INFO)
 
-async def scrape_profile(context, profile_name, limit=15, force_publish=False):
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+POST_SELECTOR = 'a[href*="/p/"], a[href*="/reel/"], .EmbeddedMediaImage'
+POST_WAIT_MS = 15000
+SETTLE_WAIT_MS = 5000
+USER_DATA_DIR = os.getenv("INSTAGRAM_USER_DATA_DIR", "storage/playwright/instagram")
+
+
+@contextmanager
+def _profile_dir():
+    """Chromium profile directory for this run.
+
+    Chromium refuses to open a profile another browser holds, so overlapping
+    runs (scheduler plus an API trigger) take a file lock on USER_DATA_DIR and
+    the loser gets a throw-away profile without the saved cookies.
+    """
+    path = Path(USER_DATA_DIR)
+    if fcntl is None:
+        yield str(path)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "w") as lock_fp:
+        try:
+            fcntl.flock(lock_fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.warning("%s is in use by another run; using a temporary profile", path)
+            tmp_dir = tempfile.mkdtemp(prefix="instagram-profile-")
+            try:
+                yield tmp_dir
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        try:
+            yield str(path)
+        finally:
+            fcntl.flock(lock_fp, fcntl.LOCK_UN)
+
+
+class OcrQueue:
+    """Runs OCR for screenshots in background workers.
+
+    The page loop only enqueues bytes and gets a future back, so the browser
+    can move on to the next post (or profile) while OCR is still running in
+    the OCR process pool. Screenshots that pile up while a worker is busy are
+    sent together as one batch of up to ``batch_size`` (``OCR_BATCH_SIZE``) images.
+    """
+
+    def __init__(self, workers: int = 2, batch_size: Optional[int] = None):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch_size = max(1, Config.OCR_BATCH_SIZE if batch_size is None else batch_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(max(1, workers))]
+
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results = await ocr.submit_many([data for data, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    if result.error:
+                        logger.warning(f"OCR failed for a screenshot: {result.error}")
+                    if not future.done():
+                        future.set_result(result.text)
+            except Exception as exc:
+                logger.error(f"OCR worker failed: {exc}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result("")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def submit(self, data: bytes) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        if not data:
+            future.set_result("")
+            return future
+        self._queue.put_nowait((data, future))
+        return future
+
+    async def close(self):
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+
+async def _settle(page) -> bool:
+    """Wait until post thumbnails are attached instead of sleeping a fixed time."""
+    try:
+        await page.wait_for_selector(POST_SELECTOR, timeout=POST_WAIT_MS)
+        return True
+    except Exception:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=SETTLE_WAIT_MS)
+        except Exception:
+            pass
+        return False
+
+
+async def _collect_posts(context, posts, limit, ocr_queue):
+    """Grab everything we need from the live page and queue screenshots for OCR."""
+    collected = []
+    img_page = None
+    try:
+        for i, post in enumerate(posts[:limit]):
+            try:
+                # 1. Extract Real Image URL (media_url)
+                # Try post first, then deeper
+                img_el = await post.query_selector('img')
+                tag_name = await post.evaluate("node => node.tagName")
+                if not img_el and tag_name == "IMG":
+                    img_el = post
+
+                media_url = None
+                if img_el:
+                    media_url = await img_el.get_attribute('src')
+
+                # 2. Screenshot for OCR
+                # We load the full image in a (reused) page for better OCR accuracy
+                ocr_bytes = None
+                if media_url:
+                    try:
+                        if img_page is None:
+                            img_page = await context.new_page()
+                            # Set a simple viewport for the image
+                            await img_page.set_viewport_size({"width": 1080, "height": 1080})
+                        await img_page.goto(media_url, wait_until="load", timeout=30000)
+                        # Take screenshot of the full image
+                        ocr_bytes = await img_page.screenshot()
+                    except Exception as ocr_err:
+                        logger.error(f"OCR Error fetching image {media_url}: {ocr_err}")
+                if not ocr_bytes:
+                    # Fallback to post screenshot
+                    ocr_bytes = await post.screenshot()
+
+                # 3. Get the 'alt' text
+                alt_text = await img_el.get_attribute("alt") if img_el else ""
+
+                # 4. Get post link
+                link = "https://www.instagram.com"
+                href = await post.get_attribute("href")
+                if not href:
+                    parent = await post.query_selector("xpath=..")
+                    if parent:
+                        href = await parent.get_attribute("href")
+
+                if href:
+                     if href.startswith("http"):
+                         link = href
+                     else:
+                         link = f"https://www.instagram.com{href}"
+
+                collected.append({
+                    "index": i,
+                    "media_url": media_url,
+                    "alt_text": alt_text or "",
+                    "link": link,
+                    "ocr": ocr_queue.submit(ocr_bytes),
+                })
+            except Exception as e:
+                logger.error(f"Error collecting post {i}: {e}")
+    finally:
+        if img_page is not None:
+            await img_page.close()
+    return collected
+
+
+async def _store_posts(collected, profile_name, force_publish=False):
+    db: Session = SessionLocal()
+    created = 0
+    try:
+        for item in collected:
+            i = item["index"]
+            media_url = item["media_url"]
+            try:
+                ocr_text = await item["ocr"]
+                combined_text = f"{item['alt_text']} {ocr_text}".strip()
+                if not combined_text:
+                    continue
+
+                logger.info(f"Post {i+1} OCR combined text: \n--- START ---\n{combined_text}\n--- END ---")
+
+                date_obj, time_obj = parse_date(combined_text)
+                if not date_obj:
+                    logger.info(f"Post {i+1} skipped: No date detected.")
+                    continue
+
+                # 5. Extract Title and Clean it up
+                lines = [line.strip() for line in combined_text.split("\n") if line.strip()]
+                title = lines[0][:200] if lines else f"Event @ {profile_name}"
+
+                # If first line is too long, it's probably a description, not a title
+                if len(title) > 80:
+                     # Try to find a line that looks more like a title (e.g. contains names or venue)
+                     found_title = False
+                     for line in lines:
+                         if profile_name.lower() in line.lower() or "pres." in line.lower() or "at " in line.lower():
+                             title = line[:200]
+                             found_title = True
+                             break
+                     if not found_title:
+                         title = title[:80] + "..."
+
+                # OCR Fixes for Crobar
+                p_lower = profile_name.lower()
+                if "crooar" in title.lower() or "crobar" in title.lower() or p_lower in title.lower():
+                    title = title.replace("crooar", "Crobar").replace("crobar", "Crobar")
+                    # If title is generic, try harder
+                    if len(title.strip()) <= 10 or "Crobar" == title.strip():
+                         for line in lines[1:5]:
+                             if len(line) > 5:
+                                 title = f"Crobar: {line}"
+                                 break
+
+                title_norm = normalize_title(title)
+                dedupe = make_hash(title_norm, date_obj.isoformat(), profile_name)
+
+                existing = db.query(Event).filter_by(dedupe_hash=dedupe).first()
+                if existing:
+                    # Update image if missing
+                    if (not existing.media_url or "images.unsplash.com" in existing.media_url) and media_url:
+                        existing.media_url = media_url
+                        db.commit()
+                        logger.info(f"Updated image for existing event: {existing.title}")
+                    continue
+
+                genres, artists = await detect_genres_async(combined_text, hints=[title, profile_name])
+
+                ev = Event(
+                    title=title,
+                    title_norm=title_norm,
+                    date=date_obj,
+                    time=time_obj,
+                    venue=profile_name,
+                    genres=genres,
+                    source_type="instagram",
+                    source_name=profile_name,
+                    source_link=item["link"],
+                    media_url=media_url,
+                    dedupe_hash=dedupe,
+                    status="published" if force_publish else "queued",
+                )
+                db.add(ev)
+                db.flush()
+                created += 1
+                logger.info(f"✅ Added event: {title} on {date_obj}")
+
+            except Exception as e:
+                logger.error(f"Error processing post {i} from {profile_name}: {e}")
+
+        db.commit()
+    finally:
+        db.close()
+    return created
+
+
+async def scrape_profile(context, profile_name, limit=15, force_publish=False, ocr_queue=None):
+    own_queue = ocr_queue is None
+    if own_queue:
+        ocr_queue = OcrQueue()
     page = await context.new_page()
     url = f"https://www.instagram.com/{profile_name}/"
     embed_url = f"https://www.instagram.com/{profile_name}/embed/"
     logger.info(f"Navigating to {url}")
-    
+
     try:
-        await page.goto(url, wait_until="networkidle", timeout=60000)
-        # Give it a bit more time for posts to render if JS is slow
-        await asyncio.sleep(5)
-        
-        # Check if we are blocked or redirected to login
-        if "login" in page.url:
-            logger.warning(f"Redirected to login for {profile_name}. Trying embed URL: {embed_url}")
-            await page.goto(embed_url, wait_until="networkidle", timeout=60000)
-            await asyncio.sleep(5)
-            
+        collected = []
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            found = await _settle(page)
+
+            # Check if we are blocked or redirected to login
             if "login" in page.url:
-                logger.error(f"Even embed URL redirected to login for {profile_name}. Giving up.")
-                return 0
+                logger.warning(f"Redirected to login for {profile_name}. Trying embed URL: {embed_url}")
+                await page.goto(embed_url, wait_until="domcontentloaded", timeout=60000)
+                found = await _settle(page)
 
-        # Select post elements
-        # Profile view: 'div._aabd'
-        # Embed view: 'a.EmbedGridItem', 'a.Embed', 'div.EmbedPost'
-        try:
-            await page.wait_for_selector('a[href*="/p/"], a[href*="/reel/"], .EmbeddedMediaImage', timeout=15000)
-        except:
-             logger.warning("Timeout waiting for post selectors. Proceeding with what we have.")
-
-        posts = await page.query_selector_all('div._aabd')
-        if not posts:
-             # In embed view, images in the grid often have specific classes or are inside the Content div
-             # We saw 'x5yr21d xu96u03 x10l6tqk x13vifvy x87ps6o xh8yej3' for post images
-             all_imgs = await page.query_selector_all('img')
-             # Skip the first one if it's the profile pic (it usually is)
-             if len(all_imgs) > 1:
-                 posts = all_imgs[1:]
-             else:
-                 posts = all_imgs
-             
-        logger.info(f"Found {len(posts)} potential posts for {profile_name}")
-        
-        db: Session = SessionLocal()
-        created = 0
-        try:
-            for i, post in enumerate(posts[:limit]):
-                try:
-                    # 1. Extract Real Image URL (media_url)
-                    # Try post first, then deeper
-                    img_el = await post.query_selector('img')
-                    tag_name = await post.evaluate("node => node.tagName")
-                    if not img_el and tag_name == "IMG":
-                        img_el = post
-
-                    media_url = None
-                    if img_el:
-                        media_url = await img_el.get_attribute('src')
-                    
-                    # 2. Extract OCR text
-                    # We use a new page to load the full image for better OCR accuracy
-                    ocr_text = ""
-                    if media_url:
-                        img_page = await context.new_page()
-                        try:
-                            # Set a simple viewport for the image
-                            await img_page.set_viewport_size({"width": 1080, "height": 1080})
-                            await img_page.goto(media_url, wait_until="networkidle", timeout=30000)
-                            # Take screenshot of the full image
-                            ocr_bytes = await img_page.screenshot()
-                            ocr_text = extract_text_from_bytes(ocr_bytes)
-                        except Exception as ocr_err:
-                            logger.error(f"OCR Error fetching image {media_url}: {ocr_err}")
-                            # Fallback to post screenshot
-                            screenshot_bytes = await post.screenshot()
-                            ocr_text = extract_text_from_bytes(screenshot_bytes)
-                        finally:
-                            await img_page.close()
-                    else:
-                        screenshot_bytes = await post.screenshot()
-                        ocr_text = extract_text_from_bytes(screenshot_bytes)
-
-                    # 3. Get the 'alt' text
-                    
-                    # 4. Get the 'alt' text
-                    alt_text = await img_el.get_attribute("alt") if img_el else ""
-                    
-                    combined_text = f"{alt_text} {ocr_text}".strip()
-                    if not combined_text:
-                        continue
-                        
-                    logger.info(f"Post {i+1} OCR combined text: \n--- START ---\n{combined_text}\n--- END ---")
-                    
-                    date_obj, time_obj = parse_date(combined_text)
-                    if not date_obj:
-                        logger.info(f"Post {i+1} skipped: No date detected.")
-                        continue
-
-                    # 5. Extract Title and Clean it up
-                    lines = [line.strip() for line in combined_text.split("\n") if line.strip()]
-                    title = lines[0][:200] if lines else f"Event @ {profile_name}"
-                    
-                    # If first line is too long, it's probably a description, not a title
-                    if len(title) > 80:
-                         # Try to find a line that looks more like a title (e.g. contains names or venue)
-                         found_title = False
-                         for line in lines:
-                             if profile_name.lower() in line.lower() or "pres." in line.lower() or "at " in line.lower():
-                                 title = line[:200]
-                                 found_title = True
-                                 break
-                         if not found_title:
-                             title = title[:80] + "..."
-
-                    # OCR Fixes for Crobar
-                    p_lower = profile_name.lower()
-                    if "crooar" in title.lower() or "crobar" in title.lower() or p_lower in title.lower():
-                        title = title.replace("crooar", "Crobar").replace("crobar", "Crobar")
-                        # If title is generic, try harder
-                        if len(title.strip()) <= 10 or "Crobar" == title.strip():
-                             for line in lines[1:5]:
-                                 if len(line) > 5:
-                                     title = f"Crobar: {line}"
-                                     break
-                                
-                    title_norm = normalize_title(title)
-                    dedupe = make_hash(title_norm, date_obj.isoformat(), profile_name)
-
-                    existing = db.query(Event).filter_by(dedupe_hash=dedupe).first()
-                    if existing:
-                        # Update image if missing
-                        if (not existing.media_url or "images.unsplash.com" in existing.media_url) and media_url:
-                            existing.media_url = media_url
-                            db.commit()
-                            logger.info(f"Updated image for existing event: {existing.title}")
-                        continue
-
-                    genres, artists = detect_genres(combined_text, hints=[title, profile_name])
-                    
-                    # Get post link
-                    link = "https://www.instagram.com"
-                    href = await post.get_attribute("href")
-                    if not href:
-                        parent = await post.query_selector("xpath=..")
-                        if parent:
-                            href = await parent.get_attribute("href")
-                    
-                    if href:
-                         if href.startswith("http"):
-                             link = href
-                         else:
-                             link = f"https://www.instagram.com{href}"
-
-                    ev = Event(
-                        title=title,
-                        title_norm=title_norm,
-                        date=date_obj,
-                        time=time_obj,
-                        venue=profile_name,
-                        genres=genres,
-                        source_type="instagram",
-                        source_name=profile_name,
-                        source_link=link,
-                        media_url=media_url, 
-                        dedupe_hash=dedupe,
-                        status="published" if force_publish else "queued",
-                    )
-                    db.add(ev)
-                    db.flush()
-                    created += 1
-                    logger.info(f"✅ Added event: {title} on {date_obj}")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing post {i} from {profile_name}: {e}")
-                    
-            db.commit()
+                if "login" in page.url:
+                    logger.error(f"Even embed URL redirected to login for {profile_name}. Giving up.")
+                    return 0
+
+            # Select post elements
+            # Profile view: 'div._aabd'
+            # Embed view: 'a.EmbedGridItem', 'a.Embed', 'div.EmbedPost'
+            if not found:
+                logger.warning("Timeout waiting for post selectors. Proceeding with what we have.")
+
+            posts = await page.query_selector_all('div._aabd')
+            if not posts:
+                 # In embed view, images in the grid often have specific classes or are inside the Content div
+                 # We saw 'x5yr21d xu96u03 x10l6tqk x13vifvy x87ps6o xh8yej3' for post images
+                 all_imgs = await page.query_selector_all('img')
+                 # Skip the first one if it's the profile pic (it usually is)
+                 if len(all_imgs) > 1:
+                     posts = all_imgs[1:]
+                 else:
+                     posts = all_imgs
+
+            logger.info(f"Found {len(posts)} potential posts for {profile_name}")
+            collected = await _collect_posts(context, posts, limit, ocr_queue)
         finally:
-            db.close()
-            
-        return created
+            # OCR keeps running in the queue; the page is free for the next profile
+            await page.close()
+
+        return await _store_posts(collected, profile_name, force_publish=force_publish)
 
     except Exception as e:
         logger.error(f"Error scraping profile {profile_name}: {e}")
         return 0
     finally:
-        await page.close()
+        if own_queue:
+            await ocr_queue.close()
 
-async def run(limit=5, force_publish=False):
+async def run(limit=5, force_publish=False, concurrency=None):
     profiles = (os.getenv("INSTAGRAM_PROFILES") or "").split(",")
     profiles = [p.strip() for p in profiles if p.strip()]
     if not profiles:
         logger.warning("No INSTAGRAM_PROFILES set in .env")
         return
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        # Use a real user agent to decrease blocking risk
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-        )
-        
-        total_created = 0
-        for profile in profiles:
-            created = await scrape_profile(context, profile, limit=limit, force_publish=force_publish)
-            total_created += created
-            
-        await browser.close()
-        logger.info(f"Playwright Instagram scraper finished. Total added: {total_created}")
+    if concurrency is None:
+        concurrency = int(os.getenv("INSTAGRAM_CONCURRENCY", "1"))
+    ocr_workers = int(os.getenv("INSTAGRAM_OCR_WORKERS", "2"))
+
+    with _profile_dir() as user_data_dir:
+        async with async_playwright() as p:
+            # One persistent context keeps cookies between runs and is shared by all profile pages.
+            # Use a real user agent to decrease blocking risk
+            context = await p.chromium.launch_persistent_context(
+                user_data_dir,
+                headless=True,
+                user_agent=USER_AGENT,
+            )
+            ocr_queue = OcrQueue(workers=ocr_workers)
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def _guarded(profile):
+                async with semaphore:
+                    return await scrape_profile(
+                        context, profile, limit=limit, force_publish=force_publish, ocr_queue=ocr_queue
+                    )
+
+            try:
+                results = await asyncio.gather(*(_guarded(profile) for profile in profiles))
+            finally:
+                await ocr_queue.close()
+                await context.close()
+
+            total_created = sum(results)
+            logger.info(f"Playwright Instagram scraper finished. Total added: {total_created}")
 
 if __name__ == "__main__":
     asyncio.run(run())
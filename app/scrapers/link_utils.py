@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import logging
 import re
-from typing import Optional
+import threading
+from typing import Iterable, Optional
 
 import requests
 
+from ..background_loop import BackgroundLoop
+from ..config import Config
+
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 except Exception:  # pragma: no cover - playwright is optional
-    sync_playwright = None
+    async_playwright = None
 
 
 logger = logging.getLogger("link_utils")
@@ -38,7 +44,10 @@ LDJSON_URL_RE = re.compile(
     re.IGNORECASE | re.DOTALL,
 )
 
-PLAYWRIGHT_AVAILABLE = sync_playwright is not None
+PLAYWRIGHT_AVAILABLE = async_playwright is not None
+
+CANONICAL_WAIT_MS = 2000
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
 
 
 def extract_canonical_html(html: str) -> Optional[str]:
@@ -54,39 +63,205 @@ def extract_canonical_html(html: str) -> Optional[str]:
     return None
 
 
-def extract_canonical_via_browser(url: str) -> Optional[str]:
-    """Use Playwright (if available) to read canonical/link data."""
-    if not PLAYWRIGHT_AVAILABLE or not url:
+def _url_from_ld_json(raw: Optional[str], source: str) -> Optional[str]:
+    if not raw:
         return None
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle")
-            canonical = page.eval_on_selector(
+        data = json.loads(raw)
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.debug("Failed to parse ld+json for %s: %s", source, exc)
+        return None
+    if isinstance(data, dict):
+        url_value = data.get("url")
+        if url_value:
+            return url_value
+    return None
+
+
+async def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """Long-lived headless Chromium for canonical URL lookups.
+
+    Playwright runs on a private event loop in a daemon thread, so the sync
+    scrapers can resolve single URLs or whole batches without relaunching the
+    browser each time. Pages are reused between lookups and heavy resources
+    (images, fonts, media) are never downloaded.
+    """
+
+    def __init__(self, size: Optional[int] = None, timeout_ms: Optional[int] = None):
+        self.size = max(1, Config.CANONICAL_BROWSER_PAGES if size is None else size)
+        self.timeout_ms = Config.CANONICAL_BROWSER_TIMEOUT_MS if timeout_ms is None else timeout_ms
+        self._background = BackgroundLoop("canonical-browser-pool")
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._created = 0
+
+    async def _ensure_context(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._context is not None:
+                return self._context
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context(
+                user_agent=DEFAULT_HEADERS["User-Agent"],
+            )
+            await self._context.route("**/*", _block_heavy_resources)
+            self._pages = asyncio.Queue()
+            return self._context
+
+    async def _acquire_page(self):
+        context = await self._ensure_context()
+        if self._pages.empty() and self._created < self.size:
+            page = None
+        else:
+            # ``None`` marks a slot freed by a broken page that must be reopened.
+            page = await self._pages.get()
+        if page is None:
+            self._created += 1
+            try:
+                page = await context.new_page()
+            except Exception:
+                self._created -= 1
+                self._pages.put_nowait(None)
+                raise
+        return page
+
+    async def _release_page(self, page) -> None:
+        if page.is_closed():
+            self._created -= 1
+            try:
+                await page.close()
+            except Exception:
+                pass
+            self._pages.put_nowait(None)
+            return
+        self._pages.put_nowait(page)
+
+    async def _resolve(self, url: str) -> Optional[str]:
+        page = await self._acquire_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+            canonical = await page.eval_on_selector(
                 "link[rel='canonical']",
                 "el => el ? el.href : null",
             )
+            if not canonical:
+                # Some pages inject the canonical tag client-side after DOMContentLoaded.
+                try:
+                    await page.wait_for_selector(
+                        "link[rel='canonical']",
+                        state="attached",
+                        timeout=CANONICAL_WAIT_MS,
+                    )
+                    canonical = await page.eval_on_selector(
+                        "link[rel='canonical']",
+                        "el => el ? el.href : null",
+                    )
+                except Exception:
+                    canonical = None
             if canonical:
-                browser.close()
                 return canonical
-            ld_json = page.eval_on_selector(
+            ld_json = await page.eval_on_selector(
                 "script[type='application/ld+json']",
                 "el => el ? el.textContent : null",
             )
-            browser.close()
-            if ld_json:
-                try:
-                    data = json.loads(ld_json)
-                    if isinstance(data, dict):
-                        url_value = data.get("url")
-                        if url_value:
-                            return url_value
-                except Exception as exc:  # pragma: no cover - best effort
-                    logger.debug("Failed to parse ld+json for %s: %s", url, exc)
-    except Exception as exc:  # pragma: no cover - best effort
-        logger.debug("Playwright canonical fetch failed for %s: %s", url, exc)
-    return None
+            return _url_from_ld_json(ld_json, url)
+        except Exception as exc:  # pragma: no cover - best effort
+            logger.debug("Playwright canonical fetch failed for %s: %s", url, exc)
+            return None
+        finally:
+            await self._release_page(page)
+
+    async def _resolve_many(self, urls: list[str]) -> list[Optional[str]]:
+        try:
+            await self._ensure_context()
+        except Exception as exc:  # pragma: no cover - best effort
+            logger.debug("Failed to start Playwright browser pool: %s", exc)
+            return [None] * len(urls)
+        return await asyncio.gather(*(self._resolve(url) for url in urls))
+
+    def resolve_many(self, urls: Iterable[str]) -> dict[str, Optional[str]]:
+        """Resolve several URLs concurrently, at most ``size`` at a time."""
+        unique = list(dict.fromkeys(u for u in urls if u))
+        if not unique:
+            return {}
+        future = self._background.submit(self._resolve_many(unique))
+        timeout = (self.timeout_ms / 1000 + 5) * (len(unique) / self.size + 1)
+        try:
+            results = future.result(timeout=timeout)
+        except Exception as exc:  # pragma: no cover - best effort
+            future.cancel()
+            logger.debug("Canonical batch resolution failed: %s", exc)
+            results = [None] * len(unique)
+        return dict(zip(unique, results))
+
+    def resolve(self, url: str) -> Optional[str]:
+        return self.resolve_many([url]).get(url)
+
+    async def _shutdown(self) -> None:
+        for closer in (self._context, self._browser):
+            if closer is None:
+                continue
+            try:
+                await closer.close()
+            except Exception:
+                pass
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+        self._context = self._browser = self._playwright = None
+        self._pages = None
+        self._start_lock = None
+        self._created = 0
+
+    def close(self) -> None:
+        if not self._background.started:
+            return
+        try:
+            self._background.run(self._shutdown(), timeout=10)
+        except Exception:
+            pass
+        self._background.stop()
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def extract_canonical_via_browser(url: str) -> Optional[str]:
+    """Use the shared Playwright pool (if available) to read canonical/link data."""
+    if not PLAYWRIGHT_AVAILABLE or not url:
+        return None
+    return get_browser_pool().resolve(url)
+
+
+def extract_canonical_batch(urls: Iterable[str]) -> dict[str, Optional[str]]:
+    """Resolve canonical links for many URLs concurrently through the browser pool."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {}
+    return get_browser_pool().resolve_many(urls)
 
 
 def resolve_canonical_url(
@@ -125,7 +300,10 @@ def resolve_canonical_url(
 
 
 __all__ = [
+    "BrowserPool",
+    "get_browser_pool",
     "resolve_canonical_url",
     "extract_canonical_html",
     "extract_canonical_via_browser",
+    "extract_canonical_batch",
 ]
@@ -3,6 +3,7 @@ import requests
 import re
 import os
 from datetime import datetime, time, date as ddate
+from typing import Optional
 from urllib.parse import urljoin
 
 try:
@@ -15,7 +16,7 @@ from sqlalchemy.orm import Session
 
 from ..db import SessionLocal
 from ..models import Event
-from ..genre import detect_genres
+from ..genre import detect_genres_many
 from ..utils import (
     TZ,
     make_hash,
@@ -23,6 +24,7 @@ from ..utils import (
     parse_date,
     detect_city,
 )
+from .http_cache import CachedSession, is_unchanged
 # from ..services.n8n_service import push_event_to_n8n
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -74,17 +76,31 @@ def _parse_passline_date_time(date_div, time_div):
 
     return event_date, event_time
 
+def _card_title(item) -> Optional[str]:
+    """Title of a card that will be stored, i.e. one with a title and a link."""
+    title_el = item.select_one("p.card-title")
+    link_el = item.select_one("a")
+    if not title_el or not link_el or not link_el.get("href"):
+        return None
+    return title_el.get_text(strip=True)
+
+
+def _venue_text(item) -> str:
+    venue_el = item.select_one("small.card-location")
+    return venue_el.get_text(strip=True) if venue_el else "Buenos Aires"
+
+
 def run(limit: int = None, force_publish: bool = False):
     logger.info(f"[passline] Fetching events from {URL} ...")
     
     html = None
+    fetched = None  # the live response the HTML came from, if any
     try:
         if cloudscraper:
-             session = cloudscraper.create_scraper()
-             resp = session.get(URL, timeout=30)
+             session = CachedSession(cloudscraper.create_scraper(), source="passline")
         else:
-             session = requests.Session()
-             resp = session.get(URL, timeout=30)
+             session = CachedSession(requests.Session(), source="passline")
+        resp = session.get(URL, timeout=30)
              
         resp.raise_for_status()
         html = resp.text
@@ -93,6 +109,11 @@ def run(limit: int = None, force_publish: bool = False):
         if "Just a moment" in html or len(html) < 15000:
             logger.warning("[passline] Cloudflare challenge detected. Fetch might be incomplete.")
             html = None # Trigger fallback
+        elif is_unchanged(resp) and not force_publish:
+            logger.info("[passline] Page unchanged since last run; skipping.")
+            return
+        else:
+            fetched = resp
         
     except Exception as exc:
         logger.error(f"[passline] Failed to fetch page: {exc}")
@@ -137,29 +158,30 @@ def run(limit: int = None, force_publish: bool = False):
     if limit:
         card_with_dates = card_with_dates[:limit]
 
+    # жанры для всей пачки разом: одинаковые артисты ищутся один раз
+    titled = [item for _, _, item in card_with_dates if _card_title(item)]
+    genre_results = dict(zip(map(id, titled), detect_genres_many([
+        (_card_title(item), [_venue_text(item)]) for item in titled
+    ])))
+
     db: Session = SessionLocal()
     created = 0
     updated = 0
     
     try:
         for date_obj, time_obj, item in card_with_dates:
-            # 1. Title
-            title_el = item.select_one("p.card-title")
-            if not title_el:
+            # 1. Title (the same cards the genre batch saw: title and link present)
+            title = _card_title(item)
+            if not title:
                 continue
-            title = title_el.get_text(strip=True)
             
             # 2. Link
-            link_el = item.select_one("a")
-            if not link_el or not link_el.get("href"):
-                continue
-            source_link = link_el["href"]
+            source_link = item.select_one("a")["href"]
             if not source_link.startswith("http"):
                 source_link = urljoin(URL, source_link)
 
             # 3. Venue
-            venue_el = item.select_one("small.card-location")
-            venue_text = venue_el.get_text(strip=True) if venue_el else "Buenos Aires"
+            venue_text = _venue_text(item)
 
             # 4. Date & Time (already parsed during sorting)
             if not date_obj:
@@ -179,7 +201,7 @@ def run(limit: int = None, force_publish: bool = False):
             title_norm = normalize_title(title)
             dedupe = make_hash(title_norm, date_obj.isoformat(), venue_text)
             
-            genres, artists = detect_genres(title, hints=[venue_text])
+            genres, artists = genre_results[id(item)]
 
             existing = db.query(Event).filter_by(dedupe_hash=dedupe).first()
             if existing:
@@ -220,6 +242,8 @@ def run(limit: int = None, force_publish: bool = False):
             created += 1
 
         db.commit()
+        if fetched is not None:
+            session.mark_processed(fetched)
         logger.info(f"[passline] Finished. Added {created} new events, updated {updated}.")
 
     finally:
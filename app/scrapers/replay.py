@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+
+from . import http_cache
+from .http_cache import build_response
+
+logger = logging.getLogger("replay")
+
+FIXTURES_DIR = Path("storage/fixtures/scrapers")
+
+
+def _fixture_key(url: str, params=None) -> str:
+    full_url = requests.Request("GET", url, params=params).prepare().url
+    return hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Raw responses of one source, stored as ``<key>.json`` + ``<key>.body``."""
+
+    def __init__(self, root: Path, source: str):
+        self.dir = Path(root) / source
+
+    def save(self, url: str, params, resp: requests.Response) -> None:
+        key = _fixture_key(url, params)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "url": requests.Request("GET", url, params=params).prepare().url,
+            "final_url": resp.url,
+            "status": resp.status_code,
+            "encoding": resp.encoding,
+            "headers": dict(resp.headers),
+        }
+        (self.dir / f"{key}.body").write_bytes(resp.content)
+        (self.dir / f"{key}.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    def load(self, url: str, params=None) -> Optional[requests.Response]:
+        key = _fixture_key(url, params)
+        meta_path = self.dir / f"{key}.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return build_response(meta, (self.dir / f"{key}.body").read_bytes())
+
+
+class RecordingSession:
+    """Passes requests through to the real session and saves every response."""
+
+    def __init__(self, session, store: FixtureStore):
+        self.session = session
+        self.store = store
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url, params=None, **kwargs):
+        resp = self.session.get(url, params=params, **kwargs)
+        try:
+            self.store.save(url, params, resp)
+        except Exception as exc:
+            logger.warning("Failed to record %s: %s", url, exc)
+        return resp
+
+
+class ReplaySession:
+    """Serves recorded responses; anything not recorded fails like a network error."""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self.headers: dict = {}
+
+    def get(self, url, params=None, **kwargs):
+        resp = self.store.load(url, params)
+        if resp is None:
+            raise requests.ConnectionError(f"No recorded fixture for {url}")
+        return resp
+
+
+@contextmanager
+def recording(root: Path = FIXTURES_DIR) -> Iterator[None]:
+    """Record raw responses of every ``CachedSession`` created inside the block."""
+    previous = http_cache.install_transport(
+        lambda session, source: RecordingSession(session, FixtureStore(root, source))
+    )
+    try:
+        yield
+    finally:
+        http_cache.install_transport(previous)
+
+
+@contextmanager
+def replaying(root: Path = FIXTURES_DIR) -> Iterator[None]:
+    """Serve every ``CachedSession`` created inside the block from recorded fixtures."""
+    previous = http_cache.install_transport(
+        lambda session, source: ReplaySession(FixtureStore(root, source))
+    )
+    try:
+        yield
+    finally:
+        http_cache.install_transport(previous)
+
+
+__all__ = ["FIXTURES_DIR", "FixtureStore", "recording", "replaying"]
@@ -1,6 +1,7 @@
 import asyncio
 import os
 from datetime import datetime, timedelta, timezone
+from difflib import SequenceMatcher
 from io import BytesIO
 from typing import Optional, cast
 
@@ -8,7 +9,7 @@ from telethon import TelegramClient
 from sqlalchemy.orm import Session
 from ..db import SessionLocal
 from ..models import Event
-from ..genre import detect_genres
+from ..genre import detect_genres_async
 from ..utils import (
     TZ,
     make_hash,
@@ -16,7 +17,8 @@ from ..utils import (
     parse_date,
     detect_city,
 )
-from ..services.ocr import extract_text_from_bytes
+from ..services import ocr
+from ..services.image_hash import get_index as get_image_index
 # from ..services.n8n_service import push_event_to_n8n
 
 DEFAULT_CHANNELS = [
@@ -49,6 +51,8 @@ def _load_channels() -> list[str]:
     return channels or DEFAULT_CHANNELS
 
 IMAGE_MIME_PREFIX = "image/"
+# a near-duplicate flyer is a repost only if its OCR'd title is this close to the event's
+REPOST_TITLE_SIMILARITY = 0.8
 
 
 def _is_image_message(msg) -> bool:
@@ -59,21 +63,45 @@ def _is_image_message(msg) -> bool:
     return bool(mime and mime.startswith(IMAGE_MIME_PREFIX))
 
 
-async def _extract_media_text(msg) -> str:
+async def _download_image(msg) -> bytes:
     if not _is_image_message(msg):
-        return ""
+        return b""
     try:
         buffer = BytesIO()
         data = await msg.download_media(file=buffer)
         if isinstance(data, BytesIO):
-            raw = data.getvalue()
-        elif isinstance(data, bytes):
-            raw = data
-        else:
-            raw = buffer.getvalue()
-        return extract_text_from_bytes(raw) if raw else ""
+            return data.getvalue()
+        if isinstance(data, bytes):
+            return data
+        return buffer.getvalue()
     except Exception:
-        return ""
+        return b""
+
+
+async def _extract_media_texts(msgs) -> list[ocr.OcrResult]:
+    """OCR result for each image message, with the hashes and index matches the worker computed.
+
+    Albums and whole channel runs go to the OCR pool as one batch.
+    """
+    raws = await asyncio.gather(*(_download_image(msg) for msg in msgs))
+    return await ocr.submit_many(raws)
+
+
+def _is_repost(db: Session, event_id: int, title_norm: str, date) -> bool:
+    """A near-duplicate flyer names an existing event only if the date and title match too.
+
+    Recurring parties reuse one template with a new date; those are new events.
+    """
+    event = db.get(Event, event_id)
+    if event is None or event.date != date:
+        return False
+    return SequenceMatcher(None, event.title_norm or "", title_norm).ratio() >= REPOST_TITLE_SIMILARITY
+
+
+def _remember_flyers(flyers) -> None:
+    index = get_image_index()
+    for media, event_id in flyers:
+        index.add(media.image_hash, media.text, event_id=event_id, digest=media.digest)
 
 
 async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = False):
@@ -106,6 +134,7 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
         created = 0
         try:
             all_found_events = []
+            flyers = []
             for ch in _load_channels():
                 cutoff = None
                 if os.getenv("TG_LOOKBACK_DAYS"):
@@ -152,6 +181,11 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
             
             print(f"[telegram] Processing top {len(all_found_events)} upcoming events")
 
+            # images without a date in the caption need OCR: download and recognise them together
+            needs_ocr = [e for e in all_found_events if not e["date"] and _is_image_message(e["msg"])]
+            for item, media in zip(needs_ocr, await _extract_media_texts([e["msg"] for e in needs_ocr])):
+                item["media"] = media
+
             for item in all_found_events:
                 msg = item["msg"]
                 ch = item["ch"]
@@ -159,9 +193,12 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
                 time = item["time"]
                 text = item["text"]
                 
-                media_text = ""
-                if not date and _is_image_message(msg): # Should not happen with current filter but for future proof
-                    media_text = await _extract_media_text(msg)
+                media = item.get("media")
+                media_text = media.text if media is not None else ""
+                if media is not None and media.event_id:
+                    # byte-identical flyer reposted by another channel: the event already exists
+                    print(f"[telegram] {ch}/{msg.id}: repost of event {media.event_id}, skipping")
+                    continue
 
                 combined_text = " ".join(part for part in (text, media_text) if part)
                 if not combined_text:
@@ -179,6 +216,11 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
 
                 title_norm = normalize_title(title)
                 h = make_hash(title_norm, date.isoformat(), None)
+
+                match = media.match if media is not None else None
+                if match is not None and match.event_id and _is_repost(db, match.event_id, title_norm, date):
+                    print(f"[telegram] {ch}/{msg.id}: re-encoded repost of event {match.event_id}, skipping")
+                    continue
                 
                 existing = db.query(Event).filter_by(dedupe_hash=h).first()
                 if existing:
@@ -187,7 +229,7 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
                         existing.support_wallet = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
                     continue
 
-                genres, artists = detect_genres(title, hints=[combined_text, ch, media_text])
+                genres, artists = await detect_genres_async(title, hints=[combined_text, ch, media_text])
                 ev = Event(
                     title=title,
                     title_norm=title_norm,
@@ -207,8 +249,12 @@ async def fetch_and_store(limit: Optional[int] = None, force_publish: bool = Fal
                 )
                 db.add(ev)
                 db.flush() 
+                if media is not None and media.digest:
+                    flyers.append((media, ev))
                 # push_event_to_n8n(ev)
                 created += 1
             db.commit()
+            # only committed events may be matched by later reposts
+            await asyncio.to_thread(_remember_flyers, [(media, ev.id) for media, ev in flyers])
         finally:
             db.close()
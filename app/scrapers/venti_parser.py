@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 import math
-from datetime import datetime
+from datetime import datetime, timedelta
 import unicodedata
 import logging
 import json
@@ -14,7 +14,7 @@ from sqlalchemy.orm import Session
 
 from ..db import SessionLocal
 from ..models import Event
-from ..genre import detect_genres
+from ..genre import detect_genres_many
 from ..utils import (
     TZ,
     make_hash,
@@ -25,9 +25,10 @@ from ..utils import (
 from ..config import Config
 # from ..services.n8n_service import push_event_to_n8n
 from .link_utils import (
+    extract_canonical_batch,
     extract_canonical_html,
-    extract_canonical_via_browser,
 )
+from .http_cache import CachedSession, is_unchanged
 
 
 API_URL = "https://venti.com.ar/api/home/events"
@@ -51,6 +52,10 @@ if Config.VENTI_API_COOKIE:
 if Config.VENTI_API_AUTH:
     HEADERS["Authorization"] = Config.VENTI_API_AUTH
 PAGE_SIZE = 50
+# listing items read per run at most
+MAX_FEED_ITEMS = 500
+# incremental runs stop after this many pages in a row without a new event
+INCREMENTAL_IDLE_PAGES = 2
 DETAIL_CACHE: dict[str, dict] = {}
 logger = logging.getLogger("venti_parser")
 if not logger.handlers:
@@ -301,16 +306,26 @@ def _pick_best_link(session: requests.Session, item: dict, slug_hint: Optional[s
         unique.append(link)
 
     first_working: Optional[str] = None
+    # ссылки без canonical в HTML — проверяем их браузером одним батчем
+    browser_pending: list[str] = []
+
+    def _first_browser_canonical() -> Optional[str]:
+        if not browser_pending:
+            return None
+        resolved = extract_canonical_batch(browser_pending)
+        for pending in browser_pending:
+            if resolved.get(pending):
+                return resolved[pending]
+        return None
+
     for link in unique:
         try:
             resp = session.get(link, timeout=10, allow_redirects=True)
             if 200 <= resp.status_code < 400:
                 canonical = extract_canonical_html(resp.text)
                 if canonical:
-                    return canonical
-                browser_canonical = extract_canonical_via_browser(resp.url or link)
-                if browser_canonical:
-                    return browser_canonical
+                    return _first_browser_canonical() or canonical
+                browser_pending.append(resp.url or link)
                 # если редирект на главную событий — пробуем следующий кандидат
                 if resp.url and "/eventos" in resp.url:
                     continue
@@ -318,6 +333,9 @@ def _pick_best_link(session: requests.Session, item: dict, slug_hint: Optional[s
                 first_working = resp.url or link
         except Exception:
             continue
+    browser_canonical = _first_browser_canonical()
+    if browser_canonical:
+        return browser_canonical
     if first_working:
         return first_working
     return unique[0] if unique else VENTI_BASE
@@ -395,28 +413,159 @@ def _extract_og_image(url: str, session: requests.Session) -> Optional[str]:
     return None
 
 
-def run(limit: int = None, force_publish: bool = False):
+def _item_location(item: dict) -> Optional[str]:
+    location_text = _best_value(
+        item,
+        "venue",
+        "venueName",
+        "clubName",
+        "locationName",
+        ("location", "name"),
+        default=None,
+    )
+    return _short_text(location_text)
+
+
+def _item_description(item: dict):
+    return _best_value(
+        item,
+        "description",
+        "summary",
+        ("details",),
+        default="",
+    )
+
+
+def _item_start(item: dict, title: str, description):
+    start_date = item.get("startDate") or item.get("start_date")
+    date, time = _parse_datetime(start_date)
+    if not date:
+        date, time = parse_date(start_date or description or title)
+    return date, time
+
+
+def _item_venue_address(item: dict) -> Optional[str]:
+    return _short_text(_best_value(item, "address", ("location", "address"), default=None))
+
+
+def _item_genre_texts(item: dict, title: str) -> list[str]:
+    """Title and hints passed to genre detection for one listing item."""
+    return _collect_texts(
+        title,
+        _item_description(item),
+        _item_location(item),
+        _item_venue_address(item),
+        item.get("genres"),
+    )
+
+
+def _item_identity(item: dict):
+    """Return (date, dedupe_hash) exactly as the main loop computes them."""
+    title = item.get("name") or item.get("title")
+    if not title:
+        return None
+    date, _ = _item_start(item, title, _item_description(item))
+    if not date:
+        return None
+    return date, make_hash(normalize_title(title), date.isoformat(), _item_location(item))
+
+
+def _fetch_incremental(session: CachedSession, limit: Optional[int] = None) -> tuple[list, list]:
+    """Page through the home feed collecting only events that are not stored yet.
+
+    An item is new when its ``dedupe_hash`` is not in the DB and it starts
+    within the ``VENTI_HORIZON_DAYS`` horizon. The feed is not date-ordered, so
+    one page without new events is not enough to stop; paging stops once
+    ``limit`` new events are collected, after ``INCREMENTAL_IDLE_PAGES`` pages
+    in a row without one, or when the feed (or ``MAX_FEED_ITEMS``) runs out.
+    Returns the new items and the page responses, for
+    ``CachedSession.mark_processed``.
+    """
+    horizon = datetime.now(TZ).date() + timedelta(days=Config.VENTI_HORIZON_DAYS)
+    fresh_items: list = []
+    seen: set = set()
+    scanned = 0
+    idle_pages = 0
+    responses: list = []
+    db: Session = SessionLocal()
+    try:
+        page = 1
+        while True:
+            try:
+                resp = session.get(
+                    API_URL,
+                    params={"limit": PAGE_SIZE, "page": page},
+                    timeout=20,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+            except Exception as exc:
+                print(f"[venti] Failed to fetch page {page}: {exc}")
+                break
+            responses.append(resp)
+            items = data.get("events") or []
+            if not items:
+                break
+            scanned += len(items)
+
+            identified = [(item, ident) for item in items if (ident := _item_identity(item))]
+            hashes = {h for _, (_, h) in identified}
+            known = set()
+            if hashes:
+                known = {
+                    row[0]
+                    for row in db.query(Event.dedupe_hash).filter(Event.dedupe_hash.in_(hashes))
+                }
+            found = len(fresh_items)
+            for item, (d, h) in identified:
+                if h not in known and h not in seen and d <= horizon:
+                    seen.add(h)
+                    fresh_items.append(item)
+            idle_pages = idle_pages + 1 if len(fresh_items) == found else 0
+            if limit and len(fresh_items) >= limit:
+                break
+            if idle_pages >= INCREMENTAL_IDLE_PAGES:
+                break
+            if page >= (data.get("totalPages") or page) or scanned > MAX_FEED_ITEMS:
+                break
+            page += 1
+    finally:
+        db.close()
+    print(f"[venti] Incremental fetch: {page} page(s), {len(fresh_items)} new event(s).")
+    return fresh_items, responses
+
+
+def run(limit: int = None, force_publish: bool = False, incremental: bool = False):
     print("[venti] Fetching events…")
-    session = requests.Session()
+    session = CachedSession(requests.Session(), source="venti")
     session.headers.update(HEADERS)
 
-    try:
-        resp = session.get(API_URL, params={"limit": 1, "page": 1}, timeout=20)
-        resp.raise_for_status()
-        payload = resp.json()
-    except Exception as exc:
-        print(f"[venti] Failed to fetch events metadata: {exc}")
-        return
-
-    total_items = payload.get("totalItems") or 0
-    total_pages = payload.get("totalPages") or 1
-    if total_items and total_pages:
-        pages = total_pages
+    if incremental:
+        # only events missing from the DB come back, so there is nothing to skip on "unchanged"
+        all_items, listing_responses = _fetch_incremental(session, limit)
+        listing_unchanged = False
+        if not all_items:
+            print("[venti] No new events.")
+            return
     else:
-        pages = max(1, math.ceil(total_items / PAGE_SIZE))
+        try:
+            resp = session.get(API_URL, params={"limit": 1, "page": 1}, timeout=20)
+            resp.raise_for_status()
+            payload = resp.json()
+        except Exception as exc:
+            print(f"[venti] Failed to fetch events metadata: {exc}")
+            return
+
+        total_items = payload.get("totalItems") or 0
+        total_pages = payload.get("totalPages") or 1
+        if total_items and total_pages:
+            pages = total_pages
+        else:
+            pages = max(1, math.ceil(total_items / PAGE_SIZE))
 
-    all_items = []
-    try:
+        all_items = []
+        listing_unchanged = True
+        listing_responses = []
         for page in range(1, pages + 1):
             try:
                 resp = session.get(
@@ -425,17 +574,25 @@ def run(limit: int = None, force_publish: bool = False):
                     timeout=20,
                 )
                 resp.raise_for_status()
+                listing_unchanged = listing_unchanged and is_unchanged(resp)
+                listing_responses.append(resp)
                 data = resp.json()
                 items = data.get("events") or []
                 if not items:
                     break
                 all_items.extend(items)
-                if len(all_items) > 500: # Fetch a reasonable amount
+                if len(all_items) > MAX_FEED_ITEMS:
                     break
             except Exception as exc:
                 print(f"[venti] Failed to fetch page {page}: {exc}")
+                listing_unchanged = False
                 continue
 
+    try:
+        if listing_unchanged and all_items and not force_publish:
+            print("[venti] Listing unchanged since last run; skipping.")
+            return
+
         # Sort all collected items by date
         def get_item_date(it):
             d_str = _best_value(it, "date", "startDate", "start_date")
@@ -448,6 +605,17 @@ def run(limit: int = None, force_publish: bool = False):
         if limit:
             all_items = all_items[:limit]
 
+        # жанры для всей пачки разом: одинаковые артисты ищутся один раз
+        genre_items = []
+        for item in all_items:
+            title = item.get("name") or item.get("title")
+            if title and _item_start(item, title, _item_description(item))[0]:
+                genre_items.append((item, title))
+        genre_results = dict(zip(
+            (id(item) for item, _ in genre_items),
+            detect_genres_many([(title, _item_genre_texts(item, title)) for item, title in genre_items]),
+        ))
+
         db: Session = SessionLocal()
         created = 0
         updated = 0
@@ -460,30 +628,9 @@ def run(limit: int = None, force_publish: bool = False):
                     continue
 
                 item_id = item.get("id")
-                description = _best_value(
-                    item,
-                    "description",
-                    "summary",
-                    ("details",),
-                    default="",
-                )
-                location_text = _best_value(
-                    item,
-                    "venue",
-                    "venueName",
-                    "clubName",
-                    "locationName",
-                    ("location", "name"),
-                    default=None,
-                )
-                location_text_str = _short_text(location_text)
-                venue_address = _best_value(
-                    item,
-                    "address",
-                    ("location", "address"),
-                    default=None,
-                )
-                venue_address_str = _short_text(venue_address)
+                description = _item_description(item)
+                location_text_str = _item_location(item)
+                venue_address_str = _item_venue_address(item)
                 city = _best_value(
                     item,
                     "city",
@@ -492,11 +639,8 @@ def run(limit: int = None, force_publish: bool = False):
                 )
                 city_str = detect_city(" ".join(filter(None, [city, location_text_str, venue_address_str, title, description])))
 
-                start_date = item.get("startDate") or item.get("start_date")
                 end_date = item.get("endDate") or item.get("end_date")
-                date, time = _parse_datetime(start_date)
-                if not date:
-                    date, time = parse_date(start_date or description or title)
+                date, time = _item_start(item, title, description)
                 if not date:
                     continue
 
@@ -551,15 +695,7 @@ def run(limit: int = None, force_publish: bool = False):
                     og_image = _extract_og_image(source_link, session)
                     media_url = _normalize_media_url(og_image) or media_url
 
-                hint_texts = _collect_texts(
-                    title,
-                    description,
-                    location_text_str,
-                    venue_address_str,
-                    item.get("genres"),
-                )
-                text_for_genre = " ".join(hint_texts)
-                genres, artists = detect_genres(title, hints=hint_texts)
+                genres, artists = genre_results[id(item)]
 
                 if dedupe in seen_hashes:
                     continue
@@ -606,6 +742,7 @@ def run(limit: int = None, force_publish: bool = False):
                 # push_event_to_n8n(ev)
                 created += 1
         db.commit()
+        session.mark_processed(*listing_responses)
         print(f"[venti] Added {created} new events, updated {updated}.")
     finally:
         try:
@@ -1,33 +1,43 @@
 from __future__ import annotations
 
+import atexit
 import json
+import logging
 import re
-from datetime import datetime
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+from ..config import Config
 from ..utils import normalize_title
 
-CACHE_PATH = Path("storage/cache/artist_genres.json")
+logger = logging.getLogger("artist_cache")
 
+CACHE_PATH = Path(Config.ARTIST_CACHE_PATH)
+LEGACY_JSON_PATH = Path("storage/cache/artist_genres.json")
 
-def _load_cache() -> dict:
-    if not CACHE_PATH.exists():
-        return {}
-    try:
-        with CACHE_PATH.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except Exception:
-        return {}
+# Namespace of genres resolved by detect_genres; remote lookups get their own.
+ARTIST_PROVIDER = "artist"
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lookups (
+    provider TEXT NOT NULL,
+    key TEXT NOT NULL,
+    genres TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (provider, key)
+);
+CREATE INDEX IF NOT EXISTS ix_lookups_expires_at ON lookups (expires_at);
+"""
 
-def _save_cache(data: dict) -> None:
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with CACHE_PATH.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, ensure_ascii=False)
+_ABSENT = object()
 
 
-def _normalize_key(name: Optional[str]) -> Optional[str]:
+def normalize_artist_key(name: Optional[str]) -> Optional[str]:
     if not name:
         return None
     normalized = normalize_title(name)
@@ -36,16 +46,156 @@ def _normalize_key(name: Optional[str]) -> Optional[str]:
     return normalized or None
 
 
+class GenreLookupStore:
+    """SQLite-backed ``(provider, key) -> genres`` store with an in-process LRU.
+
+    An empty genre list is a valid value (a cached miss). Reads go through the
+    LRU, whose entries are re-read from disk after ``memory_ttl`` seconds so
+    writes from other processes become visible. Writes are buffered and flushed
+    in one transaction every ``flush_size`` entries / ``flush_interval`` seconds
+    and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        memory_size: int = 4096,
+        memory_ttl: float = 300.0,
+        flush_size: int = 50,
+        flush_interval: float = 30.0,
+    ):
+        self.path = Path(path or CACHE_PATH)
+        self.memory_size = memory_size
+        self.memory_ttl = memory_ttl
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._memory: OrderedDict[tuple[str, str], tuple[object, float]] = OrderedDict()
+        self._pending: dict[tuple[str, str], tuple[str, float, Optional[float]]] = {}
+        self._last_flush = time.monotonic()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, item: tuple[str, str], value: object) -> None:
+        self._memory[item] = (value, time.monotonic())
+        self._memory.move_to_end(item)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, provider: str, key: Optional[str]) -> Optional[List[str]]:
+        """Cached genres (possibly ``[]`` for a cached miss), or ``None`` if unknown/expired."""
+        if not key:
+            return None
+        item = (provider, key)
+        now = time.time()
+        with self._lock:
+            pending = self._pending.get(item)
+            if pending is not None:
+                genres, _, expires_at = pending
+                return json.loads(genres) if expires_at is None or expires_at > now else None
+
+            cached = self._memory.get(item)
+            if cached is not None and time.monotonic() - cached[1] < self.memory_ttl:
+                self._memory.move_to_end(item)
+                value = cached[0]
+            else:
+                value = _ABSENT
+                try:
+                    row = self._connect().execute(
+                        "SELECT genres, expires_at FROM lookups WHERE provider = ? AND key = ?",
+                        item,
+                    ).fetchone()
+                except sqlite3.Error as exc:
+                    logger.warning("Artist cache read failed: %s", exc)
+                    row = None
+                if row:
+                    value = (json.loads(row[0]), row[1])
+                self._remember(item, value)
+
+        if value is _ABSENT:
+            return None
+        genres, expires_at = value
+        if expires_at is not None and expires_at <= now:
+            return None
+        return list(genres)
+
+    def put(self, provider: str, key: Optional[str], genres: Iterable[str], ttl: Optional[float] = None) -> None:
+        """Buffer a value; ``ttl`` in seconds, ``None`` keeps it until overwritten."""
+        if not key:
+            return
+        genres = list(dict.fromkeys(g for g in genres if g))
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        item = (provider, key)
+        with self._lock:
+            self._pending[item] = (json.dumps(genres, ensure_ascii=False), now, expires_at)
+            self._remember(item, (genres, expires_at))
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if len(self._pending) >= self.flush_size or due:
+                self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return 0
+            rows = [(p, k, g, u, e) for (p, k), (g, u, e) in self._pending.items()]
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO lookups (provider, key, genres, updated_at, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (provider, key) DO UPDATE SET "
+                        "genres = excluded.genres, updated_at = excluded.updated_at, "
+                        "expires_at = excluded.expires_at",
+                        rows,
+                    )
+            except sqlite3.Error as exc:
+                logger.warning("Artist cache flush of %s entries failed: %s", len(rows), exc)
+                return 0
+            self._pending.clear()
+            return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_store: Optional[GenreLookupStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> GenreLookupStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = GenreLookupStore()
+                atexit.register(_store.close)
+    return _store
+
+
 def get_cached_genres(name: Optional[str]) -> Optional[List[str]]:
-    key = _normalize_key(name)
-    if not key:
-        return None
-    cache = _load_cache()
-    entry = cache.get(key)
-    if entry:
-        genres = entry.get("genres") or []
-        return list(genres) if genres else None
-    return None
+    genres = get_store().get(ARTIST_PROVIDER, normalize_artist_key(name))
+    return genres or None
+
+
+def _artist_ttl() -> Optional[float]:
+    return Config.ARTIST_CACHE_TTL_DAYS * 86400 if Config.ARTIST_CACHE_TTL_DAYS else None
 
 
 def cache_artist_genres(name: Optional[str], genres: Iterable[str]) -> None:
@@ -54,12 +204,35 @@ def cache_artist_genres(name: Optional[str], genres: Iterable[str]) -> None:
     genres = [g for g in genres if g and g.lower() != "general"]
     if not genres:
         return
-    key = _normalize_key(name)
-    if not key:
-        return
-    cache = _load_cache()
-    cache[key] = {
-        "genres": list(dict.fromkeys(genres)),
-        "updated_at": datetime.utcnow().isoformat(),
-    }
-    _save_cache(cache)
+    get_store().put(ARTIST_PROVIDER, normalize_artist_key(name), genres, ttl=_artist_ttl())
+
+
+def import_json_cache(path: Path = LEGACY_JSON_PATH, store: Optional[GenreLookupStore] = None) -> int:
+    """One-time import of the old ``artist_genres.json`` file; returns imported entries.
+
+    Entries get the same ``ARTIST_CACHE_TTL_DAYS`` expiry as new ones, counted from the import.
+    """
+    store = store or get_store()
+    ttl = _artist_ttl()
+    with Path(path).open("r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    imported = 0
+    for key, entry in data.items():
+        genres = [g for g in (entry or {}).get("genres") or [] if g and g.lower() != "general"]
+        key = normalize_artist_key(key)
+        if key and genres:
+            store.put(ARTIST_PROVIDER, key, genres, ttl=ttl)
+            imported += 1
+    store.flush()
+    return imported
+
+
+__all__ = [
+    "ARTIST_PROVIDER",
+    "GenreLookupStore",
+    "cache_artist_genres",
+    "get_cached_genres",
+    "get_store",
+    "import_json_cache",
+    "normalize_artist_key",
+]
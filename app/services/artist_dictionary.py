@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Generic, Iterable, Mapping, Optional, Sequence, TypeVar
+
+from sqlalchemy import func, select
+
+from ..config import Config
+from ..models import Artist
+
+logger = logging.getLogger("artist_dictionary")
+
+T = TypeVar("T")
+Presets = Mapping[str, Sequence[str]]
+
+
+def normalize_artist_name(name: Optional[str]) -> str:
+    return " ".join((name or "").lower().split())
+
+
+def _default_session_factory():
+    # imported lazily so importing the genre module never opens a DB connection
+    from ..db import SessionLocal
+
+    return SessionLocal()
+
+
+class ArtistDictionary(Generic[T]):
+    """In-memory view of the ``artists`` table, rebuilt only when the table changes.
+
+    ``build`` turns ``{name_norm: genres}`` into whatever the caller scans with
+    (``detect_genres`` builds one keyword automaton). The table is polled at most
+    once per ``refresh_seconds`` with a single ``max(version), count(*)`` query;
+    rows are reloaded only when that pair differs. While the table is empty or
+    the database is unreachable, the built-in ``fallback`` is used.
+
+    ``get`` never touches the database: it is on the matching hot path, which
+    async scrapers call from the event loop. When the view is due for a check
+    it starts one background refresh and returns the current value. Callers
+    that need the table loaded before they start (scheduler, batch scripts)
+    call ``refresh(True)`` themselves.
+    """
+
+    def __init__(
+        self,
+        fallback: Presets,
+        build: Callable[[Presets], T],
+        *,
+        session_factory: Optional[Callable] = None,
+        refresh_seconds: Optional[int] = None,
+    ):
+        self.build = build
+        self.session_factory = session_factory or _default_session_factory
+        self.refresh_seconds = (
+            Config.ARTIST_DICTIONARY_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self._lock = threading.Lock()
+        # separate from _lock, which a running refresh holds for its DB round-trip
+        self._spawn_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._version: Optional[tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._fallback: dict[str, tuple[str, ...]] = {
+            normalize_artist_name(name): tuple(genres) for name, genres in fallback.items()
+        }
+        self._presets = self._fallback
+        self._value = build(self._presets)
+
+    @property
+    def version(self) -> Optional[tuple[int, int]]:
+        return self._version
+
+    def presets(self) -> dict[str, tuple[str, ...]]:
+        self._refresh_if_due()
+        return dict(self._presets)
+
+    def get(self) -> T:
+        self._refresh_if_due()
+        return self._value
+
+    def invalidate(self) -> None:
+        """Force the next ``get`` to re-check the table (called after admin edits)."""
+        self._checked_at = 0.0
+
+    def _refresh_if_due(self) -> None:
+        if time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._spawn_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self.refresh, name="artist-dictionary", daemon=True)
+            self._thread.start()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload from the database if it changed; returns True when rebuilt."""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.refresh_seconds:
+            return False
+        with self._lock:
+            if not force and now - self._checked_at < self.refresh_seconds:
+                return False
+            self._checked_at = now
+            try:
+                with self.session_factory() as db:
+                    row = db.execute(select(func.max(Artist.version), func.count(Artist.id))).one()
+                    version = (row[0] or 0, row[1] or 0)
+                    if version == self._version:
+                        return False
+                    rows = db.execute(select(Artist.name_norm, Artist.genres)).all() if version[1] else []
+            except Exception as exc:
+                logger.warning("Artist dictionary refresh failed, keeping %s entries: %s", len(self._presets), exc)
+                return False
+
+            # an empty (not yet seeded) table falls back to the built-in presets
+            presets = {name: tuple(genres or ()) for name, genres in rows if name and genres} or self._fallback
+            if presets is self._fallback and self._presets is self._fallback:
+                self._version = version
+                return False
+            self._value = self.build(presets)
+            self._presets = presets
+            self._version = version
+            logger.info("Artist dictionary loaded: %s artists (version %s)", len(presets), version[0])
+            return True
+
+
+def next_version(db) -> int:
+    return (db.execute(select(func.max(Artist.version))).scalar() or 0) + 1
+
+
+def upsert_artist(db, name: str, genres: Iterable[str]) -> Artist:
+    """Create or update one artist and bump its version; the caller commits."""
+    name_norm = normalize_artist_name(name)
+    if not name_norm:
+        raise ValueError("Artist name is empty")
+    genres = list(dict.fromkeys(g.strip().lower() for g in genres if g and g.strip()))
+    if not genres:
+        raise ValueError("At least one genre is required")
+
+    artist = db.execute(select(Artist).where(Artist.name_norm == name_norm)).scalar_one_or_none()
+    if artist is None:
+        artist = Artist(name=name.strip(), name_norm=name_norm)
+        db.add(artist)
+    else:
+        artist.name = name.strip()
+    artist.genres = genres
+    artist.version = next_version(db)
+    db.flush()
+    return artist
+
+
+__all__ = ["ArtistDictionary", "next_version", "normalize_artist_name", "upsert_artist"]
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from ..config import Config
+
+logger = logging.getLogger("genre_classifier")
+
+MODEL_PATH = Path(Config.GENRE_MODEL_PATH)
+MODEL_VERSION = 1
+# labels that carry no specific genre: "general" lets the model abstain
+FALLBACK_LABEL = "general"
+PARENT_LABEL = "electronic"
+
+TOKEN_RE = re.compile(r"[^\W\d_]{2,}|\d{3,}", re.UNICODE)
+
+# (title, artists, genres) rows as stored in the events table
+Sample = tuple[str, Optional[Sequence[str]], Optional[Sequence[str]]]
+
+
+def tokenize(title: Optional[str], artists: Optional[Iterable[str]] = None) -> list[str]:
+    """Lowercased word tokens of the title plus one ``artist:<name>`` token per artist."""
+    tokens = TOKEN_RE.findall((title or "").lower())
+    for artist in artists or ():
+        name = " ".join(str(artist).lower().split())
+        if name:
+            tokens.append(f"artist:{name}")
+    return tokens
+
+
+def primary_genre(genres: Optional[Iterable[str]]) -> str:
+    """The most specific stored genre: a subgenre wins over "electronic"."""
+    genres = [g for g in genres or () if g]
+    for genre in genres:
+        if genre not in (PARENT_LABEL, FALLBACK_LABEL):
+            return genre
+    return PARENT_LABEL if PARENT_LABEL in genres else FALLBACK_LABEL
+
+
+class GenreClassifier:
+    """Multinomial naive Bayes over title/artist tokens, in pure Python.
+
+    Trained on our own events: each event contributes its tokens to the class of
+    its primary genre. ``predict`` returns the best label and its posterior
+    probability; callers treat ``general`` or a low probability as "don't know".
+    """
+
+    def __init__(
+        self,
+        priors: dict[str, float],
+        likelihoods: dict[str, dict[str, float]],
+        unseen: dict[str, float],
+        *,
+        meta: Optional[dict] = None,
+    ):
+        self.priors = priors
+        self.likelihoods = likelihoods
+        self.unseen = unseen
+        self.meta = meta or {}
+        self.vocab = {token for tokens in likelihoods.values() for token in tokens}
+
+    @property
+    def labels(self) -> list[str]:
+        return sorted(self.priors)
+
+    @classmethod
+    def train(cls, samples: Iterable[Sample], *, alpha: float = 1.0, min_count: int = 1) -> "GenreClassifier":
+        docs: Counter[str] = Counter()
+        token_counts: dict[str, Counter[str]] = defaultdict(Counter)
+        for title, artists, genres in samples:
+            tokens = tokenize(title, artists)
+            if not tokens:
+                continue
+            label = primary_genre(genres)
+            docs[label] += 1
+            token_counts[label].update(tokens)
+        if not docs:
+            raise ValueError("No training samples with tokens")
+
+        totals: Counter[str] = Counter()
+        for counts in token_counts.values():
+            totals.update(counts)
+        vocab = {token for token, count in totals.items() if count >= min_count}
+
+        n_docs = sum(docs.values())
+        priors = {label: math.log(count / n_docs) for label, count in docs.items()}
+        likelihoods: dict[str, dict[str, float]] = {}
+        unseen: dict[str, float] = {}
+        for label in docs:
+            counts = token_counts[label]
+            denom = sum(counts[t] for t in vocab) + alpha * len(vocab)
+            likelihoods[label] = {t: math.log((counts[t] + alpha) / denom) for t in vocab if counts[t]}
+            unseen[label] = math.log(alpha / denom)
+        meta = {
+            "samples": n_docs,
+            "vocab": len(vocab),
+            "alpha": alpha,
+            "class_counts": dict(docs),
+            "trained_at": datetime.utcnow().isoformat(),
+        }
+        return cls(priors, likelihoods, unseen, meta=meta)
+
+    def predict(self, title: Optional[str], artists: Optional[Iterable[str]] = None) -> tuple[str, float]:
+        # tokens never seen in training carry no evidence for any class
+        tokens = [t for t in tokenize(title, artists) if t in self.vocab]
+        if not tokens:
+            return FALLBACK_LABEL, 0.0
+        scores = {}
+        for label, prior in self.priors.items():
+            likelihood = self.likelihoods[label]
+            unseen = self.unseen[label]
+            scores[label] = prior + sum(likelihood.get(t, unseen) for t in tokens)
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        total = sum(math.exp(score - top) for score in scores.values())
+        return best, 1.0 / total
+
+    def predict_genres(
+        self,
+        title: Optional[str],
+        artists: Optional[Iterable[str]] = None,
+        *,
+        threshold: float,
+    ) -> Optional[set[str]]:
+        """Genres when the model is confident enough, otherwise ``None``."""
+        label, confidence = self.predict(title, artists)
+        if label == FALLBACK_LABEL or confidence < threshold:
+            return None
+        return {label}
+
+    def to_dict(self) -> dict:
+        return {
+            "version": MODEL_VERSION,
+            "meta": self.meta,
+            "priors": self.priors,
+            "likelihoods": self.likelihoods,
+            "unseen": self.unseen,
+        }
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        path = Path(path or MODEL_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "GenreClassifier":
+        data = json.loads(Path(path or MODEL_PATH).read_text(encoding="utf-8"))
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"Unsupported genre model version {data.get('version')}")
+        return cls(data["priors"], data["likelihoods"], data["unseen"], meta=data.get("meta"))
+
+
+def load_samples(db) -> list[tuple[int, str, list[str], list[str]]]:
+    """``(id, title, artists, genres)`` of every event that has genres stored."""
+    from sqlalchemy import select
+
+    from ..models import Event
+
+    rows = db.execute(
+        select(Event.id, Event.title, Event.artists, Event.genres)
+        .where(Event.genres.is_not(None))
+        .order_by(Event.id)
+    )
+    return [(row.id, row.title, list(row.artists or []), list(row.genres or [])) for row in rows if row.genres]
+
+
+_model: Optional[GenreClassifier] = None
+_model_mtime: Optional[float] = None
+_model_lock = threading.Lock()
+
+
+def get_classifier() -> Optional[GenreClassifier]:
+    """The trained model from ``GENRE_MODEL_PATH``; reloaded when the file changes."""
+    global _model, _model_mtime
+    if not Config.GENRE_CLASSIFIER_ENABLED:
+        return None
+    try:
+        mtime = MODEL_PATH.stat().st_mtime
+    except OSError:
+        return None
+    if mtime != _model_mtime:
+        with _model_lock:
+            if mtime != _model_mtime:
+                try:
+                    _model = GenreClassifier.load(MODEL_PATH)
+                except Exception as exc:
+                    logger.warning("Failed to load genre model %s: %s", MODEL_PATH, exc)
+                    _model = None
+                _model_mtime = mtime
+    return _model
+
+
+def score_predictions(pairs: Iterable[tuple[Iterable[str], Iterable[str]]]) -> dict[str, dict[str, float]]:
+    """Per-genre precision/recall/F1 for ``(expected, predicted)`` genre sets.
+
+    "general" is ignored on both sides; the ``_micro`` row aggregates all genres.
+    """
+    tp: Counter[str] = Counter()
+    fp: Counter[str] = Counter()
+    fn: Counter[str] = Counter()
+    for expected, predicted in pairs:
+        expected = set(expected) - {FALLBACK_LABEL}
+        predicted = set(predicted) - {FALLBACK_LABEL}
+        for genre in expected & predicted:
+            tp[genre] += 1
+        for genre in predicted - expected:
+            fp[genre] += 1
+        for genre in expected - predicted:
+            fn[genre] += 1
+
+    def _row(t: int, f_p: int, f_n: int) -> dict[str, float]:
+        precision = t / (t + f_p) if t + f_p else 0.0
+        recall = t / (t + f_n) if t + f_n else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {"precision": precision, "recall": recall, "f1": f1, "support": t + f_n}
+
+    report = {genre: _row(tp[genre], fp[genre], fn[genre]) for genre in sorted(set(tp) | set(fp) | set(fn))}
+    report["_micro"] = _row(sum(tp.values()), sum(fp.values()), sum(fn.values()))
+    return report
+
+
+__all__ = [
+    "GenreClassifier",
+    "get_classifier",
+    "load_samples",
+    "primary_genre",
+    "score_predictions",
+    "tokenize",
+]
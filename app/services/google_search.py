@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import List, Optional
+import atexit
 import json
 import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import date
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: no cross-process lock
+    fcntl = None
+
 import requests
 
 from ..config import Config
@@ -26,12 +35,13 @@ def _get_key_pool() -> list[str]:
     return keys
 
 
-def _load_usage() -> dict:
+def _load_usage(path: Optional[Path] = None) -> dict:
+    path = path or USAGE_PATH
     default = {"date": date.today().isoformat(), "keys": {}, "current_index": 0}
-    if not USAGE_PATH.exists():
+    if not path.exists():
         return default
     try:
-        with USAGE_PATH.open("r", encoding="utf-8") as fp:
+        with path.open("r", encoding="utf-8") as fp:
             data = json.load(fp)
     except Exception:
         return default
@@ -58,15 +68,34 @@ def _load_usage() -> dict:
     return data
 
 
-def _save_usage(data: dict) -> None:
-    USAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+def _save_usage(data: dict, path: Optional[Path] = None) -> None:
+    """Atomically replace the usage file so readers never see a partial write."""
+    path = path or USAGE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
     try:
-        with USAGE_PATH.open("w", encoding="utf-8") as fp:
+        with tmp_path.open("w", encoding="utf-8") as fp:
             json.dump(data, fp)
+        os.replace(tmp_path, path)
     except Exception as exc:
         logger.warning("Failed to persist Google usage stats: %s", exc)
 
 
+@contextmanager
+def _usage_file_lock(path: Path):
+    """Serialise read-merge-write of the usage file across worker processes."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "w") as lock_fp:
+        fcntl.flock(lock_fp, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_fp, fcntl.LOCK_UN)
+
+
 def _ensure_key_entry(data: dict, key: str) -> dict:
     keys = data.setdefault("keys", {})
     if key not in keys:
@@ -74,6 +103,10 @@ def _ensure_key_entry(data: dict, key: str) -> dict:
     return keys[key]
 
 
+def _exhausted_keys(data: dict) -> set[str]:
+    return {key for key, info in data.get("keys", {}).items() if info.get("exhausted")}
+
+
 def _send_admin_alert(message: str) -> None:
     token = Config.TG_BOT_TOKEN
     chat_id = Config.ADMIN_CHAT_ID
@@ -89,59 +122,159 @@ def _send_admin_alert(message: str) -> None:
         logger.warning("Failed to send Google quota alert: %s", exc)
 
 
-def _register_usage(api_key: str) -> None:
-    data = _load_usage()
-    info = _ensure_key_entry(data, api_key)
-    info["count"] = int(info.get("count", 0)) + 1
-    if info["count"] >= QUOTA_WARNING_THRESHOLD and not info.get("alert_sent"):
-        info["alert_sent"] = True
-        _send_admin_alert(
-            f"⚠️ Google Custom Search ({api_key[:6]}…): израсходовано {info['count']} из 100 запросов за сегодня."
-        )
-        logger.warning(
-            "Google Custom Search usage reached %s requests today for key %s.",
-            info["count"],
-            api_key[:8],
+class GoogleKeyPool:
+    """Daily usage of the Custom Search keys, tracked in memory.
+
+    ``acquire`` hands out the current key and counts the request; exhausted keys
+    drop out of the rotation in O(1). Counts are merged into the usage file
+    (adding this process's increments to whatever other workers wrote) every
+    ``flush_interval`` seconds from a daemon thread and at interpreter exit.
+    The day rolls over at local midnight, as before.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, flush_interval: Optional[float] = None):
+        self.path = path
+        self.flush_interval = Config.GOOGLE_USAGE_FLUSH_SECONDS if flush_interval is None else flush_interval
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+        self._pool: list[str] = []
+        self._available: deque[int] = deque()
+        self._deltas: dict[str, int] = {}
+        self._dirty = False
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _usage_path(self) -> Path:
+        return self.path or USAGE_PATH
+
+    def _rebuild_rotation(self) -> None:
+        data = self._data
+        count = len(self._pool)
+        start = data.get("current_index", 0) % count if count else 0
+        self._available = deque(
+            idx
+            for idx in ((start + offset) % count for offset in range(count))
+            if not _ensure_key_entry(data, self._pool[idx]).get("exhausted")
         )
-    _save_usage(data)
-
 
-def _mark_key_exhausted(api_key: str, *, alert: bool = True) -> None:
-    data = _load_usage()
-    info = _ensure_key_entry(data, api_key)
-    info["exhausted"] = True
-    _save_usage(data)
-    if alert:
-        _send_admin_alert(
-            f"⛔ Ключ Google Custom Search ({api_key[:6]}…) исчерпал дневную квоту. Переключаюсь на следующий."
-        )
-    if not _select_key(auto_save=False):
-        _send_admin_alert(
-            "⛔ Все ключи Google Custom Search исчерпаны. Поиск жанров временно отключён."
-        )
-        logger.error("All Google Custom Search keys exhausted for today.")
-
-
-def _select_key(*, auto_save: bool = True) -> Optional[str]:
-    pool = _get_key_pool()
-    if not pool:
-        return None
-    data = _load_usage()
-    current_index = data.get("current_index", 0) % len(pool)
-    for offset in range(len(pool)):
-        idx = (current_index + offset) % len(pool)
-        key = pool[idx]
-        info = _ensure_key_entry(data, key)
-        if not info.get("exhausted"):
+    def _ensure_loaded(self) -> dict:
+        """Load state on first use, on key-pool changes and after the daily reset."""
+        pool = _get_key_pool()
+        today = date.today().isoformat()
+        if self._data is None or self._data.get("date") != today or pool != self._pool:
+            self._pool = pool
+            self._data = _load_usage(self._usage_path())
+            self._deltas = {}
+            self._rebuild_rotation()
+        return self._data
+
+    def acquire(self) -> Optional[str]:
+        """Current non-exhausted key with its usage counted, or ``None``."""
+        alert = None
+        with self._lock:
+            data = self._ensure_loaded()
+            if not self._available:
+                return None
+            idx = self._available[0]
+            key = self._pool[idx]
             data["current_index"] = idx
-            if auto_save:
-                _save_usage(data)
-            return key
-    return None
+            info = _ensure_key_entry(data, key)
+            info["count"] = int(info.get("count", 0)) + 1
+            self._deltas[key] = self._deltas.get(key, 0) + 1
+            self._dirty = True
+            if info["count"] >= QUOTA_WARNING_THRESHOLD and not info.get("alert_sent"):
+                info["alert_sent"] = True
+                alert = info["count"]
+        self._start_flusher()
+        if alert is not None:
+            _send_admin_alert(
+                f"⚠️ Google Custom Search ({key[:6]}…): израсходовано {alert} из 100 запросов за сегодня."
+            )
+            logger.warning(
+                "Google Custom Search usage reached %s requests today for key %s.",
+                alert,
+                key[:8],
+            )
+        return key
+
+    def mark_exhausted(self, api_key: str, *, alert: bool = True) -> None:
+        with self._lock:
+            data = self._ensure_loaded()
+            _ensure_key_entry(data, api_key)["exhausted"] = True
+            self._dirty = True
+            if self._available and self._pool[self._available[0]] == api_key:
+                self._available.popleft()
+            else:
+                self._rebuild_rotation()
+            if self._available:
+                data["current_index"] = self._available[0]
+            none_left = not self._available
+        if alert:
+            _send_admin_alert(
+                f"⛔ Ключ Google Custom Search ({api_key[:6]}…) исчерпал дневную квоту. Переключаюсь на следующий."
+            )
+        if none_left:
+            _send_admin_alert(
+                "⛔ Все ключи Google Custom Search исчерпаны. Поиск жанров временно отключён."
+            )
+            logger.error("All Google Custom Search keys exhausted for today.")
+        self.flush()
+
+    def flush(self) -> None:
+        """Merge in-memory usage with the file on disk and write it back."""
+        with self._lock:
+            if self._data is None or not self._dirty:
+                return
+            path = self._usage_path()
+            with _usage_file_lock(path):
+                # _load_usage always answers for today
+                disk = _load_usage(path)
+                merged = self._data
+                if disk.get("date") != merged.get("date"):
+                    # the day rolled over since the last flush: yesterday's counts must not
+                    # overwrite today's file, start over from it instead
+                    self._data = disk
+                    self._deltas = {}
+                    self._dirty = False
+                    self._rebuild_rotation()
+                    return
+                exhausted = _exhausted_keys(merged)
+                for key, info in disk.get("keys", {}).items():
+                    mine = _ensure_key_entry(merged, key)
+                    mine["count"] = int(info.get("count", 0)) + self._deltas.get(key, 0)
+                    mine["alert_sent"] = bool(mine.get("alert_sent") or info.get("alert_sent"))
+                    mine["exhausted"] = bool(mine.get("exhausted") or info.get("exhausted"))
+                _save_usage(merged, path)
+            self._deltas = {}
+            self._dirty = False
+            # pick up keys other workers exhausted in the meantime
+            if _exhausted_keys(merged) != exhausted:
+                self._rebuild_rotation()
+
+    def _start_flusher(self) -> None:
+        if self._flusher is not None or self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="google-usage-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+KEY_POOL = GoogleKeyPool()
 
 
 def _handle_limit_exceeded(api_key: str) -> None:
-    _mark_key_exhausted(api_key)
+    KEY_POOL.mark_exhausted(api_key)
 
 
 def _execute_search(query: str, *, num: int, api_key: str) -> Optional[List[str]]:
@@ -157,7 +290,6 @@ def _execute_search(query: str, *, num: int, api_key: str) -> Optional[List[str]
     }
     response = None
     try:
-        _register_usage(api_key)
         response = requests.get(GOOGLE_SEARCH_URL, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
@@ -181,25 +313,29 @@ def _execute_search(query: str, *, num: int, api_key: str) -> Optional[List[str]
     return snippets
 
 
-@lru_cache(maxsize=128)
-def _perform_search(query: str, *, num: int = 5) -> List[str]:
+def _perform_search(query: str, *, num: int = 5) -> Optional[List[str]]:
+    """Snippets for the query, or ``None`` when no key could run it."""
     pool = _get_key_pool()
     if not pool or not Config.GOOGLE_SEARCH_CX:
-        return []
+        return None
 
     attempts = len(pool)
     for _ in range(attempts):
-        api_key = _select_key()
+        api_key = KEY_POOL.acquire()
         if not api_key:
             break
         snippets = _execute_search(query, num=num, api_key=api_key)
         if snippets is not None:
             return snippets
-    return []
+    return None
+
 
+def search_music_genre_snippets(artist: str) -> Optional[List[str]]:
+    """Return snippets from Google Custom Search related to the artist's music genre.
 
-def search_music_genre_snippets(artist: str) -> List[str]:
-    """Return snippets from Google Custom Search related to the artist's music genre."""
+    An empty list means Google had nothing; ``None`` means the search could not
+    run (no keys, quota exhausted, network errors), so callers should not cache it.
+    """
     if not artist:
         return []
     queries = [
@@ -207,8 +343,10 @@ def search_music_genre_snippets(artist: str) -> List[str]:
         f"{artist} género musical",
         f"{artist} estilo musical",
     ]
+    failed = False
     for query in queries:
         snippets = _perform_search(query)
         if snippets:
             return snippets
-    return []
+        failed = failed or snippets is None
+    return None if failed else []
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from ..config import Config
+
+logger = logging.getLogger("image_hash")
+
+INDEX_PATH = Path(Config.IMAGE_HASH_INDEX_PATH)
+HASH_SIZE = 8
+# 64-bit hash split into 8 one-byte bands: two hashes within Hamming distance 7
+# always share at least one band exactly (pigeonhole), so lookups stay indexed.
+BANDS = 8
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hash INTEGER NOT NULL UNIQUE,
+    {bands},
+    text TEXT NOT NULL DEFAULT '',
+    event_id INTEGER,
+    created_at REAL NOT NULL
+);
+{indexes}
+CREATE INDEX IF NOT EXISTS ix_images_created_at ON images (created_at);
+CREATE TABLE IF NOT EXISTS event_images (
+    digest TEXT PRIMARY KEY,
+    event_id INTEGER NOT NULL,
+    created_at REAL NOT NULL DEFAULT 0
+);
+""".format(
+    bands=",\n    ".join(f"b{i} INTEGER NOT NULL" for i in range(BANDS)),
+    indexes="\n".join(f"CREATE INDEX IF NOT EXISTS ix_images_b{i} ON images (b{i});" for i in range(BANDS)),
+)
+
+
+def dhash(data: bytes, size: int = HASH_SIZE) -> Optional[int]:
+    """Difference hash of the image: 64 bits that survive recompression and resizing.
+
+    Returns ``None`` for empty or undecodable input.
+    """
+    if not data:
+        return None
+    try:
+        from PIL import Image
+
+        image = Image.open(BytesIO(data))
+        # JPEG draft mode decodes straight at 1/2..1/8 scale, we only need 9x8 pixels
+        image.draft("L", (size * 8, size * 8))
+        pixels = image.convert("L").resize((size + 1, size), Image.BILINEAR).tobytes()
+    except Exception as exc:
+        logger.debug("dHash failed: %s", exc)
+        return None
+
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _bands(value: int) -> list[int]:
+    return [(value >> (i * BAND_BITS)) & BAND_MASK for i in range(BANDS)]
+
+
+@dataclass
+class ImageMatch:
+    hash: int
+    distance: int
+    text: str
+    event_id: Optional[int]
+    created_at: float = 0.0
+
+
+class ImageHashIndex:
+    """Past flyers by perceptual hash, with their OCR text and the event made from them.
+
+    ``lookup`` returns the closest stored image within ``max_distance`` bits:
+    the same poster recompressed or resized, but also a recurring party's
+    template with a new date, so a near match is only a hint that callers
+    must confirm. ``event_for_digest`` is the exact check: the event made
+    from byte-identical image content. Entries older than ``max_age``
+    seconds are ignored and pruned every ``PRUNE_EVERY`` writes.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        max_distance: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.path = Path(path or INDEX_PATH)
+        self.max_distance = Config.IMAGE_HASH_MAX_DISTANCE if max_distance is None else max_distance
+        if self.max_distance >= BANDS:
+            raise ValueError(f"max_distance must be below {BANDS} for banded lookups")
+        self.max_age = Config.IMAGE_HASH_MAX_AGE_DAYS * 86400 if max_age is None else max_age
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            # indexes created before event_images had an age
+            if "created_at" not in {row[1] for row in conn.execute("PRAGMA table_info(event_images)")}:
+                conn.execute("ALTER TABLE event_images ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+                conn.execute("UPDATE event_images SET created_at = ?", (time.time(),))
+                conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def lookup(self, value: Optional[int]) -> Optional[ImageMatch]:
+        if value is None:
+            return None
+        bands = _bands(value)
+        where = " OR ".join(f"b{i} = ?" for i in range(BANDS))
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    f"SELECT hash, text, event_id, created_at FROM images WHERE ({where}) AND created_at >= ?",
+                    [*bands, time.time() - self.max_age],
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Image hash lookup failed: %s", exc)
+            return None
+
+        best: Optional[ImageMatch] = None
+        for stored, text, event_id, created_at in rows:
+            stored = _to_unsigned(stored)
+            distance = hamming(value, stored)
+            if distance > self.max_distance:
+                continue
+            # prefer the closest image; among equals, one that already produced an event
+            if best is None or (distance, event_id is None) < (best.distance, best.event_id is None):
+                best = ImageMatch(stored, distance, text, event_id, created_at)
+        return best
+
+    def event_for_digest(self, digest: Optional[str]) -> Optional[int]:
+        """Event created from the image with exactly this content digest."""
+        if not digest:
+            return None
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT event_id FROM event_images WHERE digest = ? AND created_at >= ?",
+                    (digest, time.time() - self.max_age),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Image digest lookup failed: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def add(
+        self,
+        value: Optional[int],
+        text: str = "",
+        event_id: Optional[int] = None,
+        *,
+        digest: Optional[str] = None,
+    ) -> None:
+        """Store (or update) the OCR text and/or event of an image hash (and exact content digest)."""
+        if value is None and not (digest and event_id):
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune(conn, now)
+                if digest and event_id:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO event_images (digest, event_id, created_at) VALUES (?, ?, ?)",
+                        (digest, event_id, now),
+                    )
+                if value is None:
+                    conn.commit()
+                    return
+                conn.execute(
+                    f"""
+                    INSERT INTO images (hash, {", ".join(f"b{i}" for i in range(BANDS))}, text, event_id, created_at)
+                    VALUES ({", ".join("?" * (BANDS + 4))})
+                    ON CONFLICT(hash) DO UPDATE SET
+                        text = CASE WHEN excluded.text != '' THEN excluded.text ELSE images.text END,
+                        event_id = COALESCE(images.event_id, excluded.event_id)
+                    """,
+                    [_to_signed(value), *_bands(value), text or "", event_id, now],
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Image hash write failed: %s", exc)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> int:
+        cutoff = now - self.max_age
+        removed = conn.execute("DELETE FROM images WHERE created_at < ?", (cutoff,)).rowcount
+        removed += conn.execute("DELETE FROM event_images WHERE created_at < ?", (cutoff,)).rowcount
+        conn.commit()
+        return removed
+
+    def prune(self) -> int:
+        """Delete entries older than ``max_age``; the number of rows removed."""
+        with self._lock:
+            return self._prune(self._connect(), time.time())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_index: Optional[ImageHashIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> ImageHashIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ImageHashIndex()
+    return _index
+
+
+__all__ = ["ImageHashIndex", "ImageMatch", "dhash", "get_index", "hamming"]
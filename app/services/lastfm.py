@@ -1,36 +1,62 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import List
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
 
-import requests
+import httpx
 
+from ..background_loop import BackgroundLoop
+from ..backoff import backoff_delay
 from ..config import Config
+from .artist_cache import normalize_artist_key, get_store
+
+logger = logging.getLogger("lastfm")
 
 LASTFM_ENDPOINT = "https://ws.audioscrobbler.com/2.0/"
+LASTFM_PROVIDER = "lastfm"
+# Last.fm error code for "The artist you supplied could not be found"
+ARTIST_NOT_FOUND = 6
+# Last.fm error code for "Rate limit exceeded"
+RATE_LIMIT_EXCEEDED = 29
 
 
-@lru_cache(maxsize=256)
-def fetch_top_tags(artist: str) -> List[str]:
-    """Return top tag names for the given artist using Last.fm API."""
-    api_key = Config.LASTFM_API_KEY
-    if not api_key or not artist:
-        return []
+class RateLimiter:
+    """Spaces request starts at least ``1 / rate`` seconds apart.
 
-    params = {
-        "method": "artist.getTopTags",
-        "artist": artist,
-        "api_key": api_key,
-        "format": "json",
-    }
+    The schedule is kept under a thread lock, so one limiter can be shared by
+    every caller in the process, whatever thread or event loop it runs on.
+    """
 
-    try:
-        resp = requests.get(LASTFM_ENDPOINT, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        return []
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Book the next start slot; returns how long to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        return max(0.0, delay)
 
+    async def wait(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# one budget for the whole process: concurrent scrapers share it
+LIMITER = RateLimiter(Config.LASTFM_RATE_PER_SECOND)
+
+
+def _parse_tags(data: dict) -> Optional[List[str]]:
+    if "error" in data:
+        # unknown artist is a definitive miss; anything else (rate limit, bad key) is not
+        return [] if data.get("error") == ARTIST_NOT_FOUND else None
     tags = data.get("toptags", {}).get("tag", [])
     names: List[str] = []
     for tag in tags:
@@ -39,3 +65,114 @@ def fetch_top_tags(artist: str) -> List[str]:
             names.append(name.lower())
     return names
 
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    artist: str,
+    limiter: RateLimiter,
+    semaphore: asyncio.Semaphore,
+) -> Optional[List[str]]:
+    """Top tags for one artist; ``None`` on transient failures (not cached).
+
+    Rate-limited answers (HTTP 429 or Last.fm error 29) are retried up to
+    ``LASTFM_MAX_RETRIES`` times with jittered exponential backoff.
+    """
+    params = {
+        "method": "artist.getTopTags",
+        "artist": artist,
+        "api_key": Config.LASTFM_API_KEY,
+        "format": "json",
+    }
+    async with semaphore:
+        for attempt in range(Config.LASTFM_MAX_RETRIES + 1):
+            await limiter.wait()
+            try:
+                resp = await client.get(LASTFM_ENDPOINT, params=params)
+                data = {} if resp.status_code == 429 else resp.json()
+            except Exception as exc:
+                logger.debug("Last.fm lookup for %r failed: %s", artist, exc)
+                return None
+            if resp.status_code != 429 and data.get("error") != RATE_LIMIT_EXCEEDED:
+                break
+            if attempt >= Config.LASTFM_MAX_RETRIES:
+                logger.info("Last.fm still rate limited for %r, giving up", artist)
+                return None
+            delay = backoff_delay(attempt)
+            logger.info("Last.fm rate limited, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+    if resp.status_code >= 500:
+        return None
+    return _parse_tags(data)
+
+
+# Requests run on one background event loop with one keep-alive client, so sync
+# callers neither spin up a loop per call nor open a new connection pool.
+_background = BackgroundLoop("lastfm")
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=10)
+    return _client
+
+
+async def _lookup(names: list[str]) -> Dict[str, List[str]]:
+    """Runs on the background loop; see ``fetch_top_tags_many_async``."""
+    store = get_store()
+    results: Dict[str, List[str]] = {}
+    missing: list[str] = []
+    for name in names:
+        cached = store.get(LASTFM_PROVIDER, normalize_artist_key(name))
+        if cached is None:
+            missing.append(name)
+        else:
+            results[name] = cached
+
+    if missing:
+        semaphore = asyncio.Semaphore(max(1, Config.LASTFM_MAX_CONCURRENCY))
+        client = _get_client()
+        fetched = await asyncio.gather(
+            *(_fetch_one(client, name, LIMITER, semaphore) for name in missing)
+        )
+        for name, tags in zip(missing, fetched):
+            results[name] = tags or []
+            if tags is None:
+                continue
+            ttl_days = Config.LASTFM_HIT_TTL_DAYS if tags else Config.LASTFM_MISS_TTL_DAYS
+            store.put(LASTFM_PROVIDER, normalize_artist_key(name), tags, ttl=ttl_days * 86400)
+
+    return {name: results.get(name, []) for name in names}
+
+
+async def fetch_top_tags_many_async(artists: Iterable[str]) -> Dict[str, List[str]]:
+    """Top tags for every artist, looked up concurrently.
+
+    Results come from the lookup store when present; otherwise Last.fm is asked
+    (at most ``LASTFM_MAX_CONCURRENCY`` requests in flight per call, and
+    ``LASTFM_RATE_PER_SECOND`` starts per second across the process). Hits and
+    misses are persisted with their own expiry. Awaitable from any event loop.
+    """
+    names = [a for a in dict.fromkeys(artists) if a]
+    if not Config.LASTFM_API_KEY or not names:
+        return {name: [] for name in names}
+    return await _background.run_async(_lookup(names))
+
+
+def fetch_top_tags_many(artists: Iterable[str]) -> Dict[str, List[str]]:
+    """Blocking ``fetch_top_tags_many_async``; async code should await that instead."""
+    names = [a for a in dict.fromkeys(artists) if a]
+    if not Config.LASTFM_API_KEY or not names:
+        return {name: [] for name in names}
+    return _background.run(_lookup(names))
+
+
+def fetch_top_tags(artist: str) -> List[str]:
+    """Return top tag names for the given artist using Last.fm API."""
+    if not artist:
+        return []
+    return fetch_top_tags_many([artist]).get(artist, [])
+
+
+__all__ = ["RateLimiter", "fetch_top_tags", "fetch_top_tags_many", "fetch_top_tags_many_async"]
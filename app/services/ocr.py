@@ -2,30 +2,47 @@ from __future__ import annotations
 
 import logging
 import os
-from functools import lru_cache
-from io import BytesIO
-from typing import List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence
 
 import requests
 
+from ..config import Config
+from .image_hash import ImageMatch, dhash, get_index as get_image_index
+from .ocr_cache import content_digest, get_cache as get_ocr_cache, legacy_key
+from .ocr_preprocess import preprocess
 from .ocr_space import (
     extract_text as extract_text_remote,
-    extract_text_from_bytes as extract_text_remote_bytes,
+    extract_text_many as extract_text_remote_many,
 )
 
-_EASY_AVAILABLE = False
-if os.getenv("DISABLE_EASYOCR") not in {"1", "true", "TRUE"}:
-    try:
-        import easyocr  # type: ignore
-        import numpy as np
-        from PIL import Image
+# easyocr pulls in torch: imported on first use, not when scrapers/the API import this module
+_easyocr_module = None
+_easyocr_checked = False
+_easyocr_lock = threading.Lock()
+
+
+def _easyocr():
+    """The ``easyocr`` module, or ``None`` when it is disabled or not installed."""
+    global _easyocr_module, _easyocr_checked
+    if not _easyocr_checked:
+        with _easyocr_lock:
+            if not _easyocr_checked:
+                if os.getenv("DISABLE_EASYOCR") in {"1", "true", "TRUE"}:  # pragma: no cover
+                    logging.info("EasyOCR disabled via DISABLE_EASYOCR env var")
+                else:
+                    try:
+                        import easyocr  # type: ignore
+
+                        _easyocr_module = easyocr
+                    except Exception:  # pragma: no cover
+                        logging.warning("EasyOCR not available; OCR features disabled")
+                _easyocr_checked = True
+    return _easyocr_module
 
-        _EASY_AVAILABLE = True
-    except Exception:  # pragma: no cover
-        logging.warning("EasyOCR not available; OCR features disabled")
-        _EASY_AVAILABLE = False
-else:  # pragma: no cover
-    logging.info("EasyOCR disabled via DISABLE_EASYOCR env var")
 
 LANGUAGE_GROUPS = [
     ("latin", ["en", "es"]),
@@ -33,75 +50,425 @@ LANGUAGE_GROUPS = [
 ]
 
 _readers: dict[str, Optional["easyocr.Reader"]] = {}
+# per-reader readtext() calls and seconds spent, for this process
+READER_TIMINGS: dict[str, dict[str, float]] = {}
+
+
+def _get_reader(key: str) -> Optional["easyocr.Reader"]:
+    reader = _readers.get(key)
+    if reader is False:
+        return None
+    if reader is None:
+        easyocr = _easyocr()
+        if easyocr is None:
+            return None
+        languages = dict(LANGUAGE_GROUPS)[key]
+        try:
+            reader = easyocr.Reader(languages, gpu=False)
+        except Exception as exc:  # pragma: no cover
+            logging.warning(
+                "Failed to initialize EasyOCR (%s): %s", ",".join(languages), exc
+            )
+            _readers[key] = False
+            return None
+        _readers[key] = reader
+    return reader
 
 
 def _get_readers() -> List["easyocr.Reader"]:
-    readers: List["easyocr.Reader"] = []
-    if not _EASY_AVAILABLE:
-        return readers
+    """Every reader ``_run_ocr`` may use under the current ``OCR_CYRILLIC_MODE``."""
+    keys = [key for key, _ in LANGUAGE_GROUPS]
+    if Config.OCR_CYRILLIC_MODE == "never":
+        keys.remove("cyrillic")
+    return [reader for reader in map(_get_reader, keys) if reader]
+
+
+@dataclass
+class OcrResult:
+    """Text of one image of a batch; ``error`` is set when no engine could read it.
+
+    The worker also reports what the scrapers need to spot reposts, so they do
+    not hash images on the event loop: the content ``digest``, the perceptual
+    ``image_hash``, the closest known flyer (``match``, a hint only) and the
+    event made from byte-identical content (``event_id``).
+    """
+
+    text: str = ""
+    error: Optional[str] = None
+    digest: Optional[str] = None
+    image_hash: Optional[int] = None
+    match: Optional[ImageMatch] = None
+    event_id: Optional[int] = None
+
+
+# batches are padded to their largest height and width; past this many canvas pixels per
+# real pixel, reading the images one by one is cheaper
+MAX_PAD_RATIO = 1.25
+
+
+def _batches(arrays: list) -> list[list[int]]:
+    """Positions of ``arrays`` grouped into batches whose padding stays under ``MAX_PAD_RATIO``.
+
+    Portrait and landscape images are sorted apart and by size, so similar
+    shapes end up next to each other; a group of one is read with ``readtext``.
+    """
+    shapes = [arr.shape[:2] for arr in arrays]
+    order = sorted(range(len(arrays)), key=lambda idx: (shapes[idx][0] >= shapes[idx][1], shapes[idx]))
+    groups: list[list[int]] = []
+    height = width = pixels = 0
+    for idx in order:
+        h, w = shapes[idx]
+        if groups:
+            grown = max(height, h) * max(width, w) * (len(groups[-1]) + 1)
+            if grown <= MAX_PAD_RATIO * (pixels + h * w):
+                groups[-1].append(idx)
+                height, width, pixels = max(height, h), max(width, w), pixels + h * w
+                continue
+        groups.append([idx])
+        height, width, pixels = h, w, h * w
+    return groups
+
+
+def _pad(arrays: list) -> list:
+    """Same-shape copies for readtext_batched: each image top-left on a white canvas."""
+    import numpy as np
+
+    height = max(arr.shape[0] for arr in arrays)
+    width = max(arr.shape[1] for arr in arrays)
+    padded = []
+    for arr in arrays:
+        if arr.shape[:2] == (height, width):
+            padded.append(arr)
+            continue
+        canvas = np.full((height, width) + arr.shape[2:], 255, dtype=arr.dtype)
+        canvas[: arr.shape[0], : arr.shape[1]] = arr
+        padded.append(canvas)
+    return padded
+
 
-    for key, languages in LANGUAGE_GROUPS:
-        reader = _readers.get(key)
-        if reader is False:
+def _readtext(key: str, reader, arrays: list, **kwargs) -> list:
+    """readtext() for one image, readtext_batched() for several; timed per reader."""
+    started = time.perf_counter()
+    try:
+        if len(arrays) == 1:
+            return [reader.readtext(arrays[0], **kwargs)]
+        return reader.readtext_batched(_pad(arrays), **kwargs)
+    finally:
+        elapsed = time.perf_counter() - started
+        timing = READER_TIMINGS.setdefault(key, {"calls": 0, "images": 0, "seconds": 0.0})
+        timing["calls"] += 1
+        timing["images"] += len(arrays)
+        timing["seconds"] += elapsed
+        logging.debug("OCR %s reader took %.2fs for %s image(s)", key, elapsed, len(arrays))
+
+
+def _read_each(key: str, reader, arrays: list, **kwargs) -> list:
+    """Per-image readtext results, or the exception for images that failed.
+
+    Images are read in batches of similar shape (see ``_batches``). A failing
+    batch is retried one image at a time so one bad image does not cost the
+    others their text.
+    """
+    if len(arrays) > 1:
+        results: list = [None] * len(arrays)
+        for group in _batches(arrays):
+            for idx, found in zip(group, _read_batch(key, reader, [arrays[idx] for idx in group], **kwargs)):
+                results[idx] = found
+        return results
+    return _read_batch(key, reader, arrays, **kwargs)
+
+
+def _read_batch(key: str, reader, arrays: list, **kwargs) -> list:
+    try:
+        return _readtext(key, reader, arrays, **kwargs)
+    except Exception as exc:
+        if len(arrays) == 1:
+            logging.warning("OCR failed (%s): %s", reader.lang_list, exc)
+            return [exc]
+        logging.warning("Batched OCR failed (%s), retrying one by one: %s", reader.lang_list, exc)
+        return [_read_batch(key, reader, [arr], **kwargs)[0] for arr in arrays]
+
+
+def _needs_cyrillic(latin_results: list) -> bool:
+    """Whether the cyrillic reader should also read the image.
+
+    Cyrillic letters read by the latin model come out as low-confidence
+    garbage, so in ``auto`` mode a low mean confidence (weighted by text
+    length) of the latin pass is the signal. No text at all means no second pass.
+    """
+    mode = Config.OCR_CYRILLIC_MODE
+    if mode in ("always", "never"):
+        return mode == "always"
+    weights = [max(len(text), 1) for _, text, _ in latin_results]
+    if not weights:
+        return False
+    confidence = sum(w * conf for w, (_, _, conf) in zip(weights, latin_results)) / sum(weights)
+    return confidence < Config.OCR_CYRILLIC_CONFIDENCE
+
+
+def _run_ocr_many(blobs: Sequence[bytes]) -> list[OcrResult]:
+    """EasyOCR for several images with one batched call per reader, in input order."""
+    results = [OcrResult() for _ in blobs]
+    latin = _get_reader("latin")
+    cyrillic = _get_reader("cyrillic") if latin is None and Config.OCR_CYRILLIC_MODE != "never" else None
+    if latin is None and cyrillic is None:
+        for idx, data in enumerate(blobs):
+            if data:
+                results[idx].error = "EasyOCR not available"
+        return results
+
+    arrays: dict[int, object] = {}
+    for idx, data in enumerate(blobs):
+        if not data:
             continue
-        if reader is None:
-            try:
-                reader = easyocr.Reader(languages, gpu=False)
-            except Exception as exc:  # pragma: no cover
-                logging.warning(
-                    "Failed to initialize EasyOCR (%s): %s", ",".join(languages), exc
-                )
-                _readers[key] = False
+        arr = preprocess(data)
+        if arr is None:
+            results[idx].error = "undecodable image"
+        else:
+            arrays[idx] = arr
+    if not arrays:
+        return results
+
+    texts: dict[int, List[str]] = {idx: [] for idx in arrays}
+    errors: dict[int, str] = {}
+    read_ok: set[int] = set()
+    second_pass = list(arrays) if latin is None else []
+    if latin is not None:
+        # detail=1 without paragraphs: per-box confidences for _needs_cyrillic
+        for idx, found in zip(arrays, _read_each("latin", latin, list(arrays.values()), detail=1, paragraph=False)):
+            if isinstance(found, Exception):
+                errors[idx], found = str(found), []
+            else:
+                read_ok.add(idx)
+            if found:
+                texts[idx].append(" ".join(text for _, text, _ in found))
+            if _needs_cyrillic(found):
+                second_pass.append(idx)
+        if second_pass:
+            cyrillic = _get_reader("cyrillic")
+
+    if cyrillic is not None and second_pass:
+        batch = [arrays[idx] for idx in second_pass]
+        for idx, found in zip(second_pass, _read_each("cyrillic", cyrillic, batch, detail=0, paragraph=True)):
+            if isinstance(found, Exception):
+                errors.setdefault(idx, str(found))
                 continue
-            _readers[key] = reader
-        if reader:
-            readers.append(reader)
-    return readers
+            read_ok.add(idx)
+            if found:
+                texts[idx].append(" ".join(found))
+
+    for idx in arrays:
+        results[idx].text = " ".join(texts[idx])
+        if idx not in read_ok:
+            results[idx].error = errors.get(idx, "OCR failed")
+    return results
 
 
 def _run_ocr(image_bytes: bytes) -> str:
-    readers = _get_readers()
-    if not readers or not image_bytes:
-        return ""
+    return _run_ocr_many([image_bytes])[0].text
+
+
+def _recognize_many(
+    blobs: Sequence[bytes],
+    urls: Optional[Sequence[Optional[str]]] = None,
+) -> list[OcrResult]:
+    """OCR text of each image: content cache, then OCR.Space and EasyOCR.
+
+    Identical images are recognised once; OCR.Space requests run in parallel and
+    the images it could not read go to EasyOCR as one batch. Near-duplicates
+    (same perceptual hash) are reported in ``OcrResult.match``; one indexed
+    within ``IMAGE_HASH_REUSE_HOURS`` is taken as a repost and its stored text
+    is reused without OCR. Older matches are read again: a recurring flyer
+    template with a new date must not inherit the old text.
+    """
+    urls = list(urls) if urls is not None else [None] * len(blobs)
+    results: list[Optional[OcrResult]] = [None] * len(blobs)
+    cache = get_ocr_cache()
+    index = get_image_index()
+    reuse_after = time.time() - Config.IMAGE_HASH_REUSE_HOURS * 3600
+
+    # digest -> positions of the images with that content
+    pending: dict[str, list[int]] = {}
+    digests: list[Optional[str]] = [None] * len(blobs)
+    # digest -> (image_hash, match, event_id), computed once per unique image
+    known: dict[str, tuple] = {}
+    for idx, data in enumerate(blobs):
+        if not data:
+            results[idx] = OcrResult()
+            continue
+        digest = digests[idx] = content_digest(data)
+        if digest in pending:
+            pending[digest].append(idx)
+            continue
+        if digest in known:
+            results[idx] = results[digests.index(digest)]
+            continue
+        image_hash = dhash(data)
+        match = index.lookup(image_hash)
+        known[digest] = (image_hash, match, index.event_for_digest(digest))
+        cached = cache.get(digest, legacy_key("bytes", digest))
+        if cached is not None:
+            results[idx] = OcrResult(cached)
+            continue
+        if match is not None and match.text and match.created_at >= reuse_after:
+            # not cached under this digest: the match may still turn out to be a template
+            results[idx] = OcrResult(match.text)
+            continue
+        pending[digest] = [idx]
+
+    def _store(digest: str, result: OcrResult, engine: str) -> None:
+        for idx in pending[digest]:
+            results[idx] = result
+        if result.text:
+            cache.put(digest, result.text, engine)
+            index.add(known[digest][0], result.text)
+        elif result.error in (None, "undecodable image"):
+            # EasyOCR did read it and found nothing; missing readers and crashes are worth a retry
+            cache.put(digest, "", engine, ttl=Config.OCR_NEGATIVE_TTL_HOURS * 3600)
+
+    unread = list(pending)
+    if unread:
+        first = [pending[digest][0] for digest in unread]
+        remote = extract_text_remote_many([blobs[idx] for idx in first], [urls[idx] for idx in first])
+        for digest, text in zip(unread, remote):
+            if text:
+                _store(digest, OcrResult(text), "ocr_space")
+
+    unread = [digest for digest in unread if results[pending[digest][0]] is None]
+    if unread:
+        local = _run_ocr_many([blobs[pending[digest][0]] for digest in unread])
+        for digest, result in zip(unread, local):
+            _store(digest, result, "easyocr")
+
+    final = []
+    for result, digest in zip(results, digests):
+        result = result or OcrResult()
+        if digest is not None:
+            image_hash, match, event_id = known[digest]
+            result = replace(result, digest=digest, image_hash=image_hash, match=match, event_id=event_id)
+        final.append(result)
+    return final
+
+
+def _download(session: requests.Session, url: str) -> Optional[bytes]:
     try:
-        image = Image.open(BytesIO(image_bytes)).convert("RGB")
-        arr = np.array(image)
-    except Exception as exc:  # pragma: no cover
-        logging.warning("OCR image decode failed: %s", exc)
-        return ""
+        resp = session.get(url, timeout=20)
+        resp.raise_for_status()
+        return resp.content
+    except Exception as exc:
+        logging.warning("OCR download failed for %s: %s", url, exc)
+        return None
 
-    texts: List[str] = []
-    for reader in readers:
-        try:
-            result = reader.readtext(arr, detail=0, paragraph=True)
-            if result:
-                texts.append(" ".join(result))
-        except Exception as exc:  # pragma: no cover
-            logging.warning("OCR failed (%s): %s", reader.lang_list, exc)
-    return " ".join(texts)
+
+def extract_texts(urls: Sequence[str]) -> list[OcrResult]:
+    """OCR for several image URLs (slides, carousels), in input order.
+
+    A URL whose image was read before is answered from the cache without
+    downloading it (text and ``digest`` only). The others are downloaded in
+    parallel over one session; an image that cannot be downloaded is still
+    tried by URL on OCR.Space.
+    """
+    urls = list(urls)
+    cache = get_ocr_cache()
+    blobs: list[Optional[bytes]] = [None] * len(urls)
+    results = [OcrResult() for _ in urls]
+    wanted = []
+    for idx, url in enumerate(urls):
+        if not url:
+            continue
+        digest = cache.digest_for_url(url)
+        cached = cache.get(*filter(None, (digest, legacy_key("url", url))))
+        if cached is not None:
+            results[idx] = OcrResult(cached, digest=digest)
+        else:
+            wanted.append(idx)
+    if wanted:
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=min(8, len(wanted))) as pool:
+            for idx, data in zip(wanted, pool.map(lambda i: _download(session, urls[i]), wanted)):
+                blobs[idx] = data
+
+    fetched = [idx for idx in wanted if blobs[idx]]
+    for idx, result in zip(fetched, _recognize_many([blobs[i] for i in fetched], [urls[i] for i in fetched])):
+        results[idx] = result
+        cache.remember_url(urls[idx], result.digest)
+    for idx in wanted:
+        if not blobs[idx]:
+            text = extract_text_remote(urls[idx])
+            results[idx] = OcrResult(text) if text else OcrResult(error="download failed")
+    return results
+
+
+def extract_texts_from_bytes(blobs: Sequence[bytes]) -> list[OcrResult]:
+    """OCR for several raw images (albums, screenshots), in input order."""
+    return _recognize_many(blobs)
 
 
-@lru_cache(maxsize=128)
 def extract_text(url: str) -> str:
     """Return OCR text extracted from the image URL."""
     if not url:
         return ""
-    remote_text = extract_text_remote(url)
-    if remote_text:
-        return remote_text
+    return extract_texts([url])[0].text
 
+
+def extract_text_from_bytes(data: bytes) -> str:
+    """Return OCR text extracted from raw image bytes."""
+    return _recognize_many([data])[0].text
+
+
+async def submit(data: bytes) -> str:
+    """``extract_text_from_bytes`` in the OCR worker pool, without blocking the event loop."""
+    from .ocr_pool import get_pool
+
+    return await get_pool().submit(data)
+
+
+async def submit_many(blobs: Sequence[bytes]) -> list[OcrResult]:
+    """``extract_texts_from_bytes`` in the OCR worker pool, a few images per job."""
+    from .ocr_pool import get_pool
+
+    return await get_pool().submit_many(blobs)
+
+
+_warmup: dict = {"state": "cold", "readers": [], "seconds": None, "error": None}
+_warmup_lock = threading.Lock()
+
+
+def loaded_readers() -> list[str]:
+    """Keys of the EasyOCR readers initialised in this process."""
+    return [key for key, reader in _readers.items() if reader]
+
+
+def _warm() -> None:
+    started = time.perf_counter()
     try:
-        resp = requests.get(url, timeout=20)
-        resp.raise_for_status()
-        return _run_ocr(resp.content)
+        from .ocr_pool import get_pool
+
+        pool = get_pool()
+        if pool.workers > 0:
+            readers = pool.warm_up().result()
+        else:
+            _get_readers()
+            readers = loaded_readers()
+        state, error = ("ready" if readers else "unavailable"), None
     except Exception as exc:
-        logging.warning("OCR failed for %s: %s", url, exc)
-        return ""
+        logging.warning("OCR warm-up failed: %s", exc)
+        readers, state, error = [], "failed", str(exc)
+    with _warmup_lock:
+        _warmup.update(state=state, readers=readers, seconds=round(time.perf_counter() - started, 2), error=error)
+    logging.info("OCR warm-up %s in %.1fs (readers: %s)", state, _warmup["seconds"], ", ".join(readers) or "-")
 
 
-def extract_text_from_bytes(data: bytes) -> str:
-    """Return OCR text extracted from raw image bytes."""
-    remote_text = extract_text_remote_bytes(data)
-    if remote_text:
-        return remote_text
-    return _run_ocr(data)
+def start_warmup() -> bool:
+    """Initialise the readers in a background thread; ``False`` if already started."""
+    with _warmup_lock:
+        if _warmup["state"] != "cold":
+            return False
+        _warmup["state"] = "warming"
+    threading.Thread(target=_warm, name="ocr-warmup", daemon=True).start()
+    return True
+
+
+def readiness() -> dict:
+    """Warm-up state for health checks: cold, warming, ready, unavailable or failed."""
+    with _warmup_lock:
+        return {**_warmup, "workers": Config.OCR_WORKERS}
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from ..config import Config
+
+logger = logging.getLogger("ocr_cache")
+
+CACHE_PATH = Path(Config.OCR_CACHE_PATH)
+# the JSON-file-per-request cache of OCR.Space results this one replaces
+LEGACY_CACHE_DIR = Path("storage/ocr_cache")
+# after an eviction the cache is trimmed to this share of the cap, so we don't evict on every put
+EVICT_TO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr (
+    digest TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_ocr_accessed_at ON ocr (accessed_at);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def legacy_key(kind: str, value: str) -> str:
+    """Key of an entry imported from the legacy cache: its file name, for ``url:<url>`` or ``bytes:<digest>``."""
+    return "legacy:" + hashlib.sha256(f"{kind}:{value}".encode("utf-8")).hexdigest()
+
+
+class OcrCache:
+    """OCR text by image content hash, for every engine, in one SQLite file.
+
+    The key is the SHA-256 of the image bytes, so the same file fetched from a
+    different URL or re-uploaded by another channel is a hit. Reads bump
+    ``accessed_at``; once the stored text exceeds ``max_bytes`` the least
+    recently read entries are evicted. Entries written with a ``ttl`` (blank
+    images, see ``OCR_NEGATIVE_TTL_HOURS``) read as misses once expired. ``stats``
+    counts hits, misses, writes and evictions for this process; hits and misses
+    are also kept in the file, across processes and runs, for ``summary``.
+    Image URLs map to the digest of the content last downloaded from them, so
+    a known URL is answered without downloading it again.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, max_bytes: Optional[int] = None):
+        self.path = Path(path or CACHE_PATH)
+        self.max_bytes = int(Config.OCR_CACHE_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+        self.stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            # caches created before negative entries existed
+            if "expires_at" not in {row[1] for row in conn.execute("PRAGMA table_info(ocr)")}:
+                conn.execute("ALTER TABLE ocr ADD COLUMN expires_at REAL")
+            self._conn = conn
+        return self._conn
+
+    def get(self, digest: str, *aliases: str) -> Optional[str]:
+        """Text stored under ``digest``, else under the first of ``aliases`` (e.g. a ``legacy_key``)."""
+        now = time.time()
+        row = None
+        try:
+            with self._lock:
+                conn = self._connect()
+                for key in (digest, *aliases):
+                    row = conn.execute("SELECT text, expires_at FROM ocr WHERE digest = ?", (key,)).fetchone()
+                    if row is not None and row[1] is not None and row[1] <= now:
+                        row = None
+                    if row is not None:
+                        conn.execute("UPDATE ocr SET accessed_at = ? WHERE digest = ?", (now, key))
+                        break
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, 1)"
+                    " ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                    ("hits" if row is not None else "misses",),
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("OCR cache read failed: %s", exc)
+        self.stats["hits" if row is not None else "misses"] += 1
+        return row[0] if row is not None else None
+
+    def digest_for_url(self, url: str) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._connect().execute("SELECT digest FROM urls WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("OCR cache read failed: %s", exc)
+            return None
+        return row[0] if row else None
+
+    def remember_url(self, url: str, digest: str) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO urls (url, digest, created_at) VALUES (?, ?, ?)", (url, digest, time.time())
+                )
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("OCR cache write failed: %s", exc)
+
+    def put(self, digest: str, text: str, engine: str, ttl: Optional[float] = None) -> None:
+        size = len(text.encode("utf-8"))
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO ocr (digest, engine, text, size, created_at, accessed_at, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, engine, text, size, now, now, now + ttl if ttl is not None else None),
+                )
+                conn.commit()
+                self.stats["writes"] += 1
+                # other processes write too: re-read the total now and then instead of trusting our count
+                if self._size is None or self.stats["writes"] % 100 == 0:
+                    self._size = self._total_size(conn)
+                else:
+                    self._size += size
+                if self._size > self.max_bytes:
+                    self._evict(conn, int(self.max_bytes * EVICT_TO))
+        except sqlite3.Error as exc:
+            logger.warning("OCR cache write failed: %s", exc)
+
+    @staticmethod
+    def _total_size(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr").fetchone()[0]
+
+    def _evict(
+        self,
+        conn: sqlite3.Connection,
+        target: Optional[int],
+        *,
+        older_than: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> int:
+        """Drop expired entries, entries not read since ``older_than`` and LRU ones above ``target`` bytes."""
+        now = time.time()
+        cutoff = now - older_than if older_than is not None else None
+        total = self._total_size(conn)
+        doomed = []
+        for digest, size, accessed_at, expires_at in conn.execute(
+            "SELECT digest, size, accessed_at, expires_at FROM ocr ORDER BY accessed_at"
+        ):
+            stale = (cutoff is not None and accessed_at < cutoff) or (expires_at is not None and expires_at <= now)
+            # keep scanning past the size target: expired entries can sit anywhere in LRU order
+            if not stale and (target is None or total <= target):
+                continue
+            doomed.append((digest,))
+            total -= size
+        if dry_run:
+            return len(doomed)
+        conn.executemany("DELETE FROM ocr WHERE digest = ?", doomed)
+        conn.execute("DELETE FROM urls WHERE digest NOT IN (SELECT digest FROM ocr)")
+        conn.commit()
+        self._size = total
+        self.stats["evictions"] += len(doomed)
+        return len(doomed)
+
+    def trim(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        older_than: Optional[float] = None,
+        dry_run: bool = False,
+    ) -> int:
+        """Evict expired entries, entries not read for ``older_than`` seconds and/or down to ``max_bytes``.
+
+        With ``dry_run`` nothing is deleted; the number of entries that would be is returned.
+        """
+        with self._lock:
+            conn = self._connect()
+            removed = self._evict(conn, max_bytes, older_than=older_than, dry_run=dry_run)
+            if not dry_run:
+                self._size = self._total_size(conn)
+        return removed
+
+    def import_legacy(self, directory: Path = LEGACY_CACHE_DIR) -> int:
+        """Copy the legacy per-request JSON files in as ``legacy_key`` entries; the number imported.
+
+        Their keys were hashed with the URL or content digest, so they are
+        found again through ``get(..., legacy_key(...))`` aliases.
+        """
+        directory = Path(directory)
+        now = time.time()
+        rows = []
+        for path in directory.glob("*.json") if directory.exists() else ():
+            try:
+                text = json.loads(path.read_text(encoding="utf-8")).get("text") or ""
+            except (OSError, ValueError, AttributeError) as exc:
+                logger.warning("Skipping legacy OCR cache file %s: %s", path, exc)
+                continue
+            if text:
+                # counted as read at import time, so the first trim after a deploy keeps them
+                rows.append(("legacy:" + path.stem, "ocr_space", text, len(text.encode("utf-8")), now, now))
+        with self._lock:
+            conn = self._connect()
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO ocr (digest, engine, text, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+            imported = conn.total_changes - before
+            self._size = self._total_size(conn)
+            if self._size > self.max_bytes:
+                self._evict(conn, int(self.max_bytes * EVICT_TO))
+        return imported
+
+    def summary(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr").fetchone()
+            engines = dict(conn.execute("SELECT engine, COUNT(*) FROM ocr GROUP BY engine").fetchall())
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        lookups = self.stats["hits"] + self.stats["misses"]
+        total_lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "engines": engines,
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            # every process that used this file, since it was created
+            "total_hits": counters.get("hits", 0),
+            "total_misses": counters.get("misses", 0),
+            "total_hit_rate": counters.get("hits", 0) / total_lookups if total_lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[OcrCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> OcrCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = OcrCache()
+    return _cache
+
+
+__all__ = ["OcrCache", "content_digest", "get_cache", "legacy_key"]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Sequence
+
+from ..config import Config
+
+logger = logging.getLogger("ocr_pool")
+
+
+def _init_worker() -> None:
+    """Load the EasyOCR readers once per worker process, before the first job."""
+    from . import ocr
+
+    ocr._get_readers()
+
+
+def _warm_job() -> list[str]:
+    from . import ocr
+
+    ocr._get_readers()
+    return ocr.loaded_readers()
+
+
+def _ocr_job(data: bytes) -> str:
+    from . import ocr
+
+    return ocr.extract_text_from_bytes(data)
+
+
+def _ocr_batch_job(blobs: list[bytes]) -> list:
+    from . import ocr
+
+    return ocr.extract_texts_from_bytes(blobs)
+
+
+class OcrPool:
+    """OCR off the event loop, in worker processes that keep their readers loaded.
+
+    ``submit`` waits for a free slot when ``max_pending`` jobs are already queued
+    or running (backpressure instead of an unbounded backlog of image bytes) and
+    gives up on a job after ``timeout`` seconds. With ``workers=0`` jobs run in
+    a thread instead.
+
+    A timeout or a crashed worker recycles the pool: the executor is shut down
+    without waiting and later jobs go to a new one. Blast radius: jobs already
+    running on the old executor still finish and are delivered; jobs still
+    queued on it are cancelled and resubmitted once to the new executor. A
+    worker that is truly hung cannot be killed through the public executor API
+    and lingers until its call returns.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.workers = Config.OCR_WORKERS if workers is None else workers
+        self.max_pending = max(1, Config.OCR_MAX_PENDING if max_pending is None else max_pending)
+        self.timeout = Config.OCR_TIMEOUT_SECONDS if timeout is None else timeout
+        self.batch_size = max(1, Config.OCR_BATCH_SIZE if batch_size is None else batch_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # asyncio primitives are bound to one loop; scripts may call asyncio.run() more than once
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.stats = {"submitted": 0, "completed": 0, "timeouts": 0, "errors": 0, "recycles": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that runs Telethon/Playwright threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        self.stats["recycles"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        return slots
+
+    def _recycled_before_start(self, executor: Optional[ProcessPoolExecutor], future: Optional[Future]) -> bool:
+        """Whether a CancelledError came from another job's recycle rather than from our caller."""
+        if future is None or not future.cancelled():
+            return False
+        with self._lock:
+            if self._executor is executor:
+                return False
+        # a caller cancelled while a recycle happened anyway still gets its CancelledError
+        task = asyncio.current_task()
+        cancelling = getattr(task, "cancelling", None)
+        return not (cancelling and cancelling())
+
+    async def _run(self, func, arg, timeout: float):
+        """Run ``func(arg)`` in a worker; the error message instead of a result on failure."""
+        async with self._semaphore():
+            self.stats["submitted"] += 1
+            # a second attempt only for jobs that another job's recycle cancelled before they started
+            for attempt in range(2):
+                executor = future = None
+                try:
+                    if self.workers <= 0:
+                        job = asyncio.to_thread(func, arg)
+                    else:
+                        executor = self._get_executor()
+                        future = executor.submit(func, arg)
+                        job = asyncio.wrap_future(future)
+                    result = await asyncio.wait_for(job, timeout)
+                except asyncio.CancelledError:
+                    if not self._recycled_before_start(executor, future):
+                        raise  # our caller was cancelled
+                    if attempt:
+                        self.stats["errors"] += 1
+                        return None, "cancelled"
+                    continue
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    logger.warning("OCR job timed out after %.0fs", timeout)
+                    if executor is not None:
+                        self._recycle(executor)
+                    return None, "timeout"
+                except BrokenProcessPool as exc:
+                    self.stats["errors"] += 1
+                    logger.warning("OCR worker died: %s", exc)
+                    self._recycle(executor)
+                    return None, "worker died"
+                except RuntimeError as exc:
+                    # submit() lost a race with a recycle: "cannot schedule new futures after shutdown"
+                    if executor is not None and future is None and not attempt:
+                        continue
+                    self.stats["errors"] += 1
+                    logger.warning("OCR job failed: %s", exc)
+                    return None, str(exc)
+                except Exception as exc:
+                    self.stats["errors"] += 1
+                    logger.warning("OCR job failed: %s", exc)
+                    return None, str(exc)
+                self.stats["completed"] += 1
+                return result, None
+
+    async def submit(self, data: bytes) -> str:
+        """OCR text of the image bytes; ``""`` on empty input, timeout or worker failure."""
+        if not data:
+            return ""
+        text, _ = await self._run(_ocr_job, data, self.timeout)
+        return text or ""
+
+    async def submit_many(self, blobs: Sequence[bytes]) -> list:
+        """``OcrResult`` per image, in input order, from batched jobs.
+
+        The images are split into jobs of at most ``batch_size``; each job takes
+        its own slot and gets ``timeout`` per image, so a long run queues behind
+        (and interleaves with) other callers instead of holding one slot
+        throughout. If a job fails every image in it carries the error.
+        """
+        from .ocr import OcrResult
+
+        blobs = list(blobs)
+        if not any(blobs):
+            return [OcrResult() for _ in blobs]
+        chunks = [blobs[start : start + self.batch_size] for start in range(0, len(blobs), self.batch_size)]
+        outcomes = await asyncio.gather(
+            *(self._run(_ocr_batch_job, chunk, self.timeout * len(chunk)) for chunk in chunks)
+        )
+        merged = []
+        for chunk, (results, error) in zip(chunks, outcomes):
+            if results is None:
+                results = [OcrResult(error=error) if data else OcrResult() for data in chunk]
+            merged.extend(results)
+        return merged
+
+    def warm_up(self) -> Future:
+        """Start the worker processes; the future resolves to the readers a worker loaded."""
+        return self._get_executor().submit(_warm_job)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[OcrPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> OcrPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = OcrPool()
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+__all__ = ["OcrPool", "get_pool"]
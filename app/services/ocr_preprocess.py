@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+from io import BytesIO
+from typing import Optional
+
+from ..config import Config
+
+logger = logging.getLogger("ocr_preprocess")
+
+# text-region crop: share of pixels in a row/column that must be edges, and padding around the box
+EDGE_THRESHOLD = 40
+EDGE_DENSITY = 0.02
+CROP_MARGIN = 0.03
+
+
+def _text_box(gray) -> Optional[tuple[int, int, int, int]]:
+    """Bounding box ``(left, top, right, bottom)`` of the edge-dense part of the image."""
+    import numpy as np
+
+    arr = gray.astype(np.int16)
+    edges = np.zeros(arr.shape, dtype=bool)
+    edges[:, 1:] |= np.abs(np.diff(arr, axis=1)) > EDGE_THRESHOLD
+    edges[1:, :] |= np.abs(np.diff(arr, axis=0)) > EDGE_THRESHOLD
+    rows = np.flatnonzero(edges.mean(axis=1) > EDGE_DENSITY)
+    cols = np.flatnonzero(edges.mean(axis=0) > EDGE_DENSITY)
+    if not rows.size or not cols.size:
+        return None
+    height, width = arr.shape
+    pad_y, pad_x = int(height * CROP_MARGIN), int(width * CROP_MARGIN)
+    return (
+        max(0, int(cols[0]) - pad_x),
+        max(0, int(rows[0]) - pad_y),
+        min(width, int(cols[-1]) + 1 + pad_x),
+        min(height, int(rows[-1]) + 1 + pad_y),
+    )
+
+
+def preprocess(
+    data: bytes,
+    *,
+    max_side: Optional[int] = None,
+    grayscale: Optional[bool] = None,
+    crop: Optional[bool] = None,
+):
+    """Decode image bytes into the array EasyOCR reads, or ``None`` if undecodable.
+
+    JPEGs are decoded in draft mode directly at the nearest 1/2..1/8 scale above
+    ``max_side``, then downscaled so the longer side is at most ``max_side``
+    (``0`` keeps the full resolution). Grayscale is what EasyOCR converts to
+    internally anyway; ``crop`` trims flat borders around the text area.
+    """
+    import numpy as np
+    from PIL import Image
+
+    max_side = Config.OCR_MAX_SIDE if max_side is None else max_side
+    grayscale = Config.OCR_GRAYSCALE if grayscale is None else grayscale
+    crop = Config.OCR_CROP_TEXT if crop is None else crop
+    mode = "L" if grayscale else "RGB"
+    try:
+        image = Image.open(BytesIO(data))
+        if max_side:
+            image.draft(mode, (max_side, max_side))
+        image = image.convert(mode)
+        if max_side and max(image.size) > max_side:
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+    except Exception as exc:
+        logger.warning("OCR image decode failed: %s", exc)
+        return None
+
+    arr = np.asarray(image)
+    if crop:
+        box = _text_box(arr if grayscale else np.asarray(image.convert("L")))
+        if box is not None:
+            left, top, right, bottom = box
+            arr = arr[top:bottom, left:right]
+    return np.ascontiguousarray(arr)
+
+
+__all__ = ["preprocess"]
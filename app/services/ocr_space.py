@@ -1,141 +1,246 @@
 from __future__ import annotations
 
-import hashlib
-import json
+import asyncio
 import logging
-from pathlib import Path
-from typing import Optional
+import threading
+from typing import Optional, Sequence
 
-import requests
+import httpx
 
+from ..background_loop import BackgroundLoop
+from ..backoff import RETRY_BASE_SECONDS, backoff_delay
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
 API_ENDPOINT = "https://api.ocr.space/parse/image"
-CACHE_DIR = Path("storage/ocr_cache")
 DEFAULT_LANGUAGE = "eng"
 LANGUAGE_FALLBACKS = ("eng", "spa")
 TIMEOUT = 30
+# free tier limit for multipart uploads; bigger images have to be passed by URL
+MAX_UPLOAD_BYTES = 1024 * 1024
 
 
-def _enabled() -> bool:
-    return bool(Config.OCR_SPACE_API_KEY)
+class OcrSpaceFatalError(Exception):
+    """Quota exhausted or key rejected: no point in trying other languages."""
 
 
-def _cache_path(key: str) -> Path:
-    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
-    return CACHE_DIR / f"{digest}.json"
+class RateLimited(Exception):
+    pass
 
 
-def _load_cache(path: Path) -> Optional[str]:
-    if not path.exists():
-        return None
-    try:
-        with path.open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
-        return payload.get("text") or ""
-    except Exception as exc:  # pragma: no cover
-        logger.warning("Failed to read OCR.Space cache %s: %s", path, exc)
-        return None
+def _enabled() -> bool:
+    return bool(Config.OCR_SPACE_API_KEY)
 
 
-def _save_cache(path: Path, text: str) -> None:
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as fh:
-            json.dump(
-                {"text": text, "created_at": __import__("datetime").datetime.utcnow().isoformat()},
-                fh,
-                ensure_ascii=False,
-            )
-    except Exception as exc:  # pragma: no cover
-        logger.warning("Failed to persist OCR.Space cache %s: %s", path, exc)
+def _error_message(data: dict) -> str:
+    message = data.get("ErrorMessage") or data.get("ErrorDetails") or "unknown error"
+    return "; ".join(message) if isinstance(message, list) else str(message)
 
 
-def _request(payload: dict, files: Optional[dict] = None) -> str:
-    for language in LANGUAGE_FALLBACKS:
-        payload["language"] = language
-        try:
-            response = requests.post(
-                API_ENDPOINT,
-                data=payload,
-                files=files,
+def _parse_text(data: dict) -> str:
+    texts = []
+    for result in data.get("ParsedResults") or []:
+        text = result.get("ParsedText")
+        if text:
+            texts.append(text.strip())
+    return "\n".join(texts).strip()
+
+
+def _payload(url: Optional[str] = None) -> dict:
+    payload = {
+        "apikey": Config.OCR_SPACE_API_KEY,
+        "OCREngine": 2,
+        "isOverlayRequired": False,
+    }
+    if url:
+        payload["url"] = url
+    return payload
+
+
+class OcrSpaceClient:
+    """OCR.Space over one keep-alive ``httpx.AsyncClient``.
+
+    Each fallback language is a separate request. In ``sequential`` mode they
+    are tried in order and the first text of at least ``min_chars`` characters
+    wins; in ``race`` mode all languages are requested at once and the first
+    good-enough answer cancels the rest (faster, but spends quota on every
+    language). Without a good-enough answer the longest text is returned.
+    Rate-limited requests (HTTP 429/5xx or OCR.Space's "maximum number of
+    times" error) are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        languages: Sequence[str] = LANGUAGE_FALLBACKS,
+        mode: Optional[str] = None,
+        min_chars: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_base: float = RETRY_BASE_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.languages = tuple(languages)
+        self.mode = (mode or Config.OCR_SPACE_LANGUAGE_MODE).lower()
+        self.min_chars = max(1, Config.OCR_SPACE_MIN_CHARS if min_chars is None else min_chars)
+        self.max_retries = Config.OCR_SPACE_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_base = retry_base
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
                 timeout=TIMEOUT,
+                transport=self._transport,
+                limits=httpx.Limits(max_keepalive_connections=max(1, Config.OCR_SPACE_MAX_CONCURRENCY)),
             )
-        except requests.RequestException as exc:
-            logger.warning("OCR.Space request failed: %s", exc)
+        return self._client
+
+    async def _post(self, payload: dict, files: Optional[dict]) -> dict:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.post(API_ENDPOINT, data=payload, files=files)
+                if response.status_code == 403:
+                    raise OcrSpaceFatalError("quota exceeded or key invalid (HTTP 403)")
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise RateLimited(f"HTTP {response.status_code}")
+                data = response.json()
+                if data.get("IsErroredOnProcessing") and "maximum" in _error_message(data).lower():
+                    raise RateLimited(_error_message(data))
+                return data
+            except (RateLimited, httpx.TransportError) as exc:
+                if attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.retry_base)
+                logger.info("OCR.Space %s, retrying in %.1fs", exc or type(exc).__name__, delay)
+                await asyncio.sleep(delay)
+        raise RateLimited("retries exhausted")  # pragma: no cover
+
+    async def _language(self, language: str, url: Optional[str], blob: Optional[bytes]) -> str:
+        payload = {**_payload(url), "language": language}
+        # Free tier supports multipart upload up to 1 MB. If больше - клиент должен ужать до отправки.
+        files = {"file": ("image.jpg", blob)} if blob is not None else None
+        try:
+            data = await self._post(payload, files)
+        except (RateLimited, httpx.HTTPError, ValueError) as exc:
+            logger.warning("OCR.Space request failed (lang %s): %s", language, exc)
             return ""
-
-        if response.status_code == 403:
-            logger.error("OCR.Space quota exceeded or key invalid (HTTP 403).")
+        if data.get("IsErroredOnProcessing"):
+            logger.warning("OCR.Space error (lang %s): %s", language, _error_message(data))
             return ""
+        return _parse_text(data)
 
+    async def recognize(self, *, blob: Optional[bytes] = None, url: Optional[str] = None) -> str:
+        """Text of an image given as bytes (multipart upload) or by URL."""
+        if not _enabled() or not (blob or url):
+            return ""
+        if blob and url and len(blob) > MAX_UPLOAD_BYTES:
+            blob = None
+        elif blob:
+            url = None
         try:
-            data = response.json()
-        except ValueError as exc:  # pragma: no cover
-            logger.warning("OCR.Space JSON decode failed: %s", exc)
+            if self.mode == "race":
+                return await self._race(url, blob)
+            return await self._sequential(url, blob)
+        except OcrSpaceFatalError as exc:
+            logger.error("OCR.Space %s.", exc)
             return ""
 
-        if data.get("IsErroredOnProcessing"):
-            message = data.get("ErrorMessage") or data.get("ErrorDetails") or "unknown error"
-            logger.warning("OCR.Space error (lang %s): %s", language, message)
-            continue
-
-        parsed_results = data.get("ParsedResults") or []
-        texts = []
-        for result in parsed_results:
-            text = result.get("ParsedText")
-            if text:
-                texts.append(text.strip())
-        if texts:
-            return "\n".join(texts).strip()
-    return ""
+    async def _sequential(self, url: Optional[str], blob: Optional[bytes]) -> str:
+        best = ""
+        for language in self.languages:
+            text = await self._language(language, url, blob)
+            if len(text) >= self.min_chars:
+                return text
+            best = max(best, text, key=len)
+        return best
+
+    async def _race(self, url: Optional[str], blob: Optional[bytes]) -> str:
+        tasks = [asyncio.ensure_future(self._language(language, url, blob)) for language in self.languages]
+        best = ""
+        try:
+            for done in asyncio.as_completed(tasks):
+                text = await done
+                if len(text) >= self.min_chars:
+                    return text
+                best = max(best, text, key=len)
+            return best
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def recognize_many(
+        self,
+        blobs: Sequence[bytes],
+        urls: Optional[Sequence[Optional[str]]] = None,
+    ) -> list[str]:
+        urls = list(urls) if urls is not None else [None] * len(blobs)
+        semaphore = asyncio.Semaphore(max(1, Config.OCR_SPACE_MAX_CONCURRENCY))
+
+        async def _one(blob: bytes, url: Optional[str]) -> str:
+            async with semaphore:
+                return await self.recognize(blob=blob, url=url)
+
+        return list(await asyncio.gather(*(_one(blob, url) for blob, url in zip(blobs, urls))))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# The shared client lives on its own event loop thread, so sync callers (OCR
+# worker processes, scrapers) reuse its connections from call to call.
+_background = BackgroundLoop("ocr-space")
+_client: Optional[OcrSpaceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OcrSpaceClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OcrSpaceClient()
+    return _client
+
+
+def _run(coro):
+    return _background.run(coro)
+
+
+async def extract_text_async(*, blob: Optional[bytes] = None, url: Optional[str] = None) -> str:
+    """``OcrSpaceClient.recognize`` on the shared client, awaitable from any event loop."""
+    if not _enabled():
+        return ""
+    return await _background.run_async(get_client().recognize(blob=blob, url=url))
 
 
 def extract_text(url: str) -> str:
-    """Return text recognised by OCR.Space for a remote image URL."""
+    """Return text recognised by OCR.Space for a remote image URL (uncached, see ``ocr_cache``)."""
     if not _enabled() or not url:
         return ""
-
-    cache_key = f"url:{url}"
-    cache_file = _cache_path(cache_key)
-    cached = _load_cache(cache_file)
-    if cached is not None:
-        return cached
-
-    payload = {
-        "apikey": Config.OCR_SPACE_API_KEY,
-        "url": url,
-        "OCREngine": 2,
-        "isOverlayRequired": False,
-    }
-    text = _request(payload)
-    if text:
-        _save_cache(cache_file, text)
-    return text
+    return _run(get_client().recognize(url=url))
 
 
 def extract_text_from_bytes(blob: bytes) -> str:
     """Return text recognised by OCR.Space for raw image bytes."""
     if not _enabled() or not blob:
         return ""
+    return _run(get_client().recognize(blob=blob))
 
-    digest = hashlib.sha256(blob).hexdigest()
-    cache_key = f"bytes:{digest}"
-    cache_file = _cache_path(cache_key)
-    cached = _load_cache(cache_file)
-    if cached is not None:
-        return cached
 
-    payload = {
-        "apikey": Config.OCR_SPACE_API_KEY,
-        "OCREngine": 2,
-        "isOverlayRequired": False,
-    }
-    # Free tier supports multipart upload up to 1 MB. If больше - клиент должен ужать до отправки.
-    files = {"file": ("image.jpg", blob)}
-    text = _request(payload, files=files)
-    if text:
-        _save_cache(cache_file, text)
-    return text
+def extract_text_many(
+    blobs: Sequence[bytes],
+    urls: Optional[Sequence[Optional[str]]] = None,
+) -> list[str]:
+    """OCR.Space for several images at once, in input order.
+
+    At most ``OCR_SPACE_MAX_CONCURRENCY`` requests are in flight on the shared
+    client. Images above the upload limit are sent by URL when one is known.
+    """
+    if not _enabled() or not blobs:
+        return [""] * len(blobs)
+    return _run(get_client().recognize_many(list(blobs), urls))
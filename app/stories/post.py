@@ -13,9 +13,8 @@ async def send_story():
         db.close()
         if not events:
             return
-        png = render_story(events)
-        png.name = "story.png"
+        image = render_story(events)
         # Fallback: отправляем в топик календаря как обычный пост-картинку
         from aiogram import Bot
         bot = Bot(token=os.getenv("TG_BOT_TOKEN"))
-        await bot.send_photo(chat_id=os.getenv("TG_CHANNEL_ID"), photo=png, caption="Hoy en BA — selección del día", message_thread_id=int(os.getenv("TOPIC_GENERAL","0")))
+        await bot.send_photo(chat_id=os.getenv("TG_CHANNEL_ID"), photo=image, caption="Hoy en BA — selección del día", message_thread_id=int(os.getenv("TOPIC_GENERAL","0")))
@@ -1,10 +1,20 @@
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 
+from ..config import Config
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - gradient falls back to drawing line by line
+    np = None
+
 W, H = 1080, 1920
 FONT_H1 = Path("assets/Inter-SemiBold.ttf")
 FONT_H2 = Path("assets/Inter-Medium.ttf")
+CARD_TOP, CARD_H, CARD_PAD = 220, 480, 36
+MAX_CARDS = 3
 
 def _wrap(draw, text, font, width_px):
     words = (text or "").split()
@@ -18,27 +28,66 @@ def _wrap(draw, text, font, width_px):
     if line: lines.append(" ".join(line))
     return lines
 
-def render_story(events, title="Hoy en BA / Сегодня в BA"):
+@lru_cache(maxsize=8)
+def _font(path, size):
+    return ImageFont.truetype(str(path), size) if path.exists() else ImageFont.load_default()
+
+@lru_cache(maxsize=1)
+def _gradient():
+    # простой вертикальный градиент
+    if np is not None:
+        ratio = np.arange(H, dtype=np.float64)[:, None] / H
+        rows = np.hstack([10 + ratio * 120, 10 + ratio * 240, 40 + (1 - ratio) * 200]).astype(np.uint8)
+        return Image.fromarray(np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (H, W, 3))), "RGB")
     img = Image.new("RGB", (W, H), (11,16,32))
     draw = ImageDraw.Draw(img)
-    # простой вертикальный градиент
     for y in range(H):
         ratio = y / H
         r = int(10 + ratio * 120)
         g = int(10 + ratio * 240)
         b = int(40 + (1-ratio) * 200)
         draw.line([(0,y),(W,y)], fill=(r,g,b))
+    return img
+
+@lru_cache(maxsize=MAX_CARDS + 1)
+def _canvas(cards):
+    """Gradient with the empty card and poster boxes; callers must copy before drawing on it."""
+    img = _gradient().copy()
     draw = ImageDraw.Draw(img)
-    f1 = ImageFont.truetype(str(FONT_H1), 64) if FONT_H1.exists() else ImageFont.load_default()
-    f2 = ImageFont.truetype(str(FONT_H2), 40) if FONT_H2.exists() else ImageFont.load_default()
+    y = CARD_TOP
+    for _ in range(cards):
+        draw.rounded_rectangle([40, y, W-40, y+CARD_H], radius=28, fill=(18,24,46,255))
+        draw.rounded_rectangle([60, y+40, 60+360, y+40+360], radius=18, fill=(28,38,74,255))
+        y += CARD_H + CARD_PAD
+    return img
+
+def warm_up():
+    """Build the fonts and every canvas up front so the scheduled story renders without the setup cost."""
+    _font(FONT_H1, 64); _font(FONT_H2, 40)
+    for cards in range(MAX_CARDS + 1):
+        _canvas(cards)
+
+def _encode(img):
+    b = BytesIO()
+    if Config.STORY_IMAGE_FORMAT == "jpeg":
+        img.save(b, format="JPEG", quality=Config.STORY_JPEG_QUALITY)
+        b.name = "story.jpg"
+    else:
+        # optimize=True tries every filter/level and costs seconds on a 1080x1920 canvas
+        img.save(b, format="PNG", compress_level=Config.STORY_PNG_COMPRESS_LEVEL)
+        b.name = "story.png"
+    b.seek(0)
+    return b
+
+def render_story(events, title="Hoy en BA / Сегодня в BA"):
+    events = events[:MAX_CARDS]
+    img = _canvas(len(events)).copy()
+    draw = ImageDraw.Draw(img)
+    f1 = _font(FONT_H1, 64)
+    f2 = _font(FONT_H2, 40)
     draw.text((60, 70), title, font=f1, fill=(220,245,255))
-    y = 220
-    card_h = 480
-    pad = 36
-    for ev in events[:3]:
-        draw.rounded_rectangle([40, y, W-40, y+card_h], radius=28, fill=(18,24,46,255))
-        poster_box = [60, y+40, 60+360, y+40+360]
-        draw.rounded_rectangle(poster_box, radius=18, fill=(28,38,74,255))
+    y = CARD_TOP
+    for ev in events:
         tx = 60+360+36; tw = W - tx - 60
         title_lines = _wrap(draw, ev.title, f1, tw)
         draw.text((tx, y+36), "\n".join(title_lines[:2]), font=f1, fill=(240,240,255))
@@ -47,6 +96,5 @@ def render_story(events, title="Hoy en BA / Сегодня в BA"):
         if getattr(ev, 'source_link', None):
             short = ev.source_link.replace("https://","").replace("http://","")
             draw.text((tx, y+320), f"🔗 {short}", font=f2, fill=(160,220,255))
-        y += card_h + pad
-    b = BytesIO(); img.save(b, format="PNG", optimize=True); b.seek(0)
-    return b
+        y += CARD_H + CARD_PAD
+    return _encode(img)
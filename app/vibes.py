@@ -0,0 +1,55 @@
+import random
+
+VIBE_TEMPLATES = {
+    "techno": [
+        "🌑 Dark, industrial warehouse energy. Prepare for pounding kick drums.",
+        "🔨 Hard hitting rhythms and hypnotic loops. Strictly for the heads.",
+        "🌩️ Thunderous basslines and strobe lights. Lose yourself in the music.",
+    ],
+    "house": [
+        "✨ Uplifting vocals and groovy basslines. Perfect for cocktails and dancing.",
+        "💃 Soulful vibes and infectious energy. Bringing the Ibiza heat to BA.",
+        "🪩 Disco balls and funky rhythms. A night of pure euphoria.",
+    ],
+    "trance": [
+        "🌌 Ethereal melodies and high BPMs. A journey to another dimension.",
+        "🚀 Euphoric drops and hands-in-the-air moments. Pure energy.",
+    ],
+    "cumbia": [
+        "🌴 Tropical heat and infectious rhythm. Imposible no bailar.",
+        "🔥 The real sound of the barrio. Sweat, dance, and passion.",
+    ],
+    "rock": [
+        "🎸 Shredding guitars and raw power. Moshing encouraged.",
+        "🤘 Live energy and classic anthems. A night of pure rock 'n' roll.",
+    ],
+    "pop": [
+        "🎤 Sing-along anthems and glitter. The ultimate party vibe.",
+        "🍬 Sweet melodies and chart-toppers. Bring your best moves.",
+    ],
+    "general": [
+        "🔥 The hottest ticket in town. Expect a packed crowd.",
+        "👀 The event everyone is talking about. See and be seen.",
+        "⚡ A unique experience in the heart of the city.",
+    ]
+}
+
+def get_vibe(title: str, genres: list[str], seed=None) -> str:
+    """A vibe line for the event; with ``seed`` (e.g. the event id) the pick is stable across calls."""
+    choice = random.Random(seed).choice if seed is not None else random.choice
+    text = (title + " " + " ".join(genres or [])).lower()
+    
+    if "techno" in text or "hard" in text:
+        return choice(VIBE_TEMPLATES["techno"])
+    if "house" in text or "disco" in text:
+        return choice(VIBE_TEMPLATES["house"])
+    if "trance" in text or "psy" in text:
+         return choice(VIBE_TEMPLATES["trance"])
+    if "cumbia" in text or "reggaeton" in text or "latino" in text:
+        return choice(VIBE_TEMPLATES["cumbia"])
+    if "rock" in text or "indie" in text or "metal" in text:
+        return choice(VIBE_TEMPLATES["rock"])
+    if "pop" in text or "hits" in text:
+        return choice(VIBE_TEMPLATES["pop"])
+        
+    return choice(VIBE_TEMPLATES["general"])
@@ -0,0 +1,68 @@
+"""add artists dictionary
+
+Revision ID: a4e9c2d7b1f0
+Revises: 7b4f3a1d9e2c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e9c2d7b1f0"
+down_revision: Union[str, Sequence[str], None] = "7b4f3a1d9e2c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Snapshot of the presets that used to be hardcoded in app/genre.py.
+SEED_ARTISTS = {
+    "armin van buuren": ["trance"],
+    "adam beyer": ["techno"],
+    "korolova": ["house"],
+    "victoria engel": ["house"],
+    "nicolas taboada": ["techno"],
+    "ultra": ["electronic"],
+    "resistance": ["techno"],
+    "franky rizado": ["house"],
+    "franky rizardo": ["house"],
+    "bodeler": ["house", "techno"],
+    "solomun": ["house"],
+    "maceo plex": ["techno"],
+    "tale of us": ["techno"],
+    "duki": ["rap"],
+    "bizarrap": ["rap", "electronic"],
+}
+
+
+def upgrade() -> None:
+    artists = op.create_table(
+        "artists",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("name_norm", sa.String(length=255), nullable=False),
+        sa.Column("genres", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name_norm", name="uq_artists_name_norm"),
+    )
+    op.create_index(op.f("ix_artists_version"), "artists", ["version"], unique=False)
+    op.bulk_insert(
+        artists,
+        [
+            {"name": name, "name_norm": name, "genres": genres, "version": 1}
+            for name, genres in SEED_ARTISTS.items()
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_artists_version"), table_name="artists")
+    op.drop_table("artists")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Recompute genres, artists, city and/or vibe of stored events with the current logic.
+
+    python scripts/backfill_events.py --fields genres,artists
+    python scripts/backfill_events.py --fields city --dry-run
+    python scripts/backfill_events.py --fields genres --reset      # ignore a saved watermark
+
+Interrupted runs resume from the last committed batch.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.getcwd())
+
+from app.backfill import FIELDS, BackfillRunner
+from app.genre import ARTIST_DICTIONARY
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Streaming backfill of derived event columns")
+    parser.add_argument("--fields", default="genres,artists", help=f"Comma-separated: {', '.join(FIELDS)}")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Only events on/after YYYY-MM-DD")
+    parser.add_argument("--remote", action="store_true", help="Allow Last.fm/Google lookups for unknown artists")
+    parser.add_argument("--reset", action="store_true", help="Start from the first event")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing")
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    args = parse_args()
+    try:
+        runner = BackfillRunner(
+            [f.strip() for f in args.fields.split(",") if f.strip()],
+            batch_size=args.batch_size,
+            since=args.since,
+            remote=args.remote,
+            dry_run=args.dry_run,
+        )
+    except ValueError as exc:
+        print(exc)
+        return 1
+    if args.reset:
+        runner.reset()
+    # get() only refreshes in the background; load the artists table before the first batch
+    ARTIST_DICTIONARY.refresh(True)
+
+    stats = runner.run()
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"Scanned {stats.scanned} events in {stats.batches} batches. {verb} {stats.changed}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
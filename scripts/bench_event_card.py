@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Time event card rendering (app/publisher/images.py) in ms per card.
+
+    python scripts/bench_event_card.py --cards 50
+    python scripts/bench_event_card.py --cards 20 --cold   # drop the layer caches before every card
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, time as dtime
+from io import BytesIO
+from types import SimpleNamespace
+
+sys.path.append(os.getcwd())
+
+from PIL import Image
+
+from app.publisher import images
+
+SAMPLES = [
+    dict(title="Techno Night @ Crobar", genres=["techno"], venue="Crobar", city="Buenos Aires",
+         date=date(2025, 4, 12), time=dtime(23, 30)),
+    dict(title="Sunset House Session", genres=["house"], venue="Niceto Club", city=None,
+         date=date(2025, 4, 13), time=None),
+    dict(title="Secret warehouse party", genres=None, venue=None, city=None, date=None, time=None),
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Event card render benchmark")
+    parser.add_argument("--cards", type=int, default=30, help="Cards to render")
+    parser.add_argument("--cold", action="store_true", help="Clear font/gradient/chrome caches before each card")
+    parser.add_argument("--no-portrait", action="store_true", help="Render without a portrait image")
+    return parser.parse_args()
+
+
+def clear_caches() -> None:
+    images._load_font.cache_clear()
+    images._gradient.cache_clear()
+    images._card_chrome.cache_clear()
+
+
+def main() -> int:
+    args = parse_args()
+    portrait = None
+    if not args.no_portrait:
+        buffer = BytesIO()
+        Image.new("RGB", (900, 1200), (120, 30, 200)).save(buffer, format="PNG")
+        portrait = buffer.getvalue()
+
+    clear_caches()
+    timings = []
+    for idx in range(args.cards):
+        if args.cold:
+            clear_caches()
+        event = SimpleNamespace(**SAMPLES[idx % len(SAMPLES)])
+        started = time.perf_counter()
+        images._render_event_card(event, portrait)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"cards:  {len(timings)} ({'cold' if args.cold else 'cached layers'})")
+    print(f"first:  {timings[0]:.1f} ms")
+    print(f"median: {statistics.median(timings):.1f} ms/card")
+    print(f"mean:   {statistics.mean(timings):.1f} ms/card")
+    print(f"chrome cache: {images._card_chrome.cache_info()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
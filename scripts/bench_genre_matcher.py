@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Compare the per-keyword regex scan with the single-pass genre matcher.
+
+    python scripts/bench_genre_matcher.py --size 20000 --repeat 200
+    python scripts/bench_genre_matcher.py --artists 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from app.genre import ARTIST_GENRE, GENRE_KEYWORDS, build_genre_matcher
+
+FILLER = (
+    "entradas agotadas sabado noche lineup palermo capital doors 23hs "
+    "open bar early bird tickets preventa mayores de 18 dresscode "
+    "ПРЕДПРОДАЖА билеты вход свободный афиша @club #buenosaires"
+).split()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Genre matcher benchmark")
+    parser.add_argument("--size", type=int, default=20000, help="Approximate text length in characters")
+    parser.add_argument("--repeat", type=int, default=200, help="Scans per implementation")
+    parser.add_argument("--artists", type=int, default=0, help="Extra synthetic artists in the dictionary")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def build_text(size: int, rng: random.Random) -> str:
+    """OCR/caption-like text: mostly noise with a few keywords and artist names."""
+    vocab = FILLER + [k for words in GENRE_KEYWORDS.values() for k in words] + list(ARTIST_GENRE)
+    weights = [20] * len(FILLER) + [1] * (len(vocab) - len(FILLER))
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choices(vocab, weights)[0]
+        word = word.upper() if rng.random() < 0.3 else word
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def regex_scan(text: str, patterns: dict[str, re.Pattern[str]], artists) -> set[str]:
+    """The previous implementation: one compiled ``\\b...\\b`` regex per keyword."""
+    hits: set[str] = set()
+    lowered = text.lower()
+    for genre, keywords in GENRE_KEYWORDS.items():
+        for keyword in keywords:
+            if patterns[keyword].search(lowered):
+                hits.add(genre)
+                break
+    for artist, preset in artists.items():
+        if artist in lowered:
+            hits.update(preset)
+    return hits
+
+
+def timed(fn, text: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> int:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    artists = dict(ARTIST_GENRE)
+    for i in range(args.artists):
+        artists[f"dj synthetic {i:05d}"] = ("house",)
+    matcher = build_genre_matcher(artists)
+    patterns = {
+        keyword: re.compile(rf"\b{re.escape(keyword)}\b", flags=re.IGNORECASE)
+        for keywords in GENRE_KEYWORDS.values()
+        for keyword in keywords
+    }
+
+    print(f"{'text':<14} {'regex ms':>10} {'matcher ms':>11} {'speedup':>8}")
+    for label, text in (
+        ("caption", build_text(300, rng)),
+        ("ocr", build_text(args.size, rng)),
+        ("ocr, no hits", " ".join(rng.choices(FILLER, k=args.size // 8))),
+    ):
+        expected = regex_scan(text, patterns, artists)
+        actual = matcher.scan(text)
+        if expected != actual:
+            print(f"Mismatch on {label}: regex={sorted(expected)} matcher={sorted(actual)}")
+            return 1
+        old = timed(lambda t: regex_scan(t, patterns, artists), text, args.repeat)
+        new = timed(matcher.scan, text, args.repeat)
+        print(f"{label:<14} {old * 1000:>10.3f} {new * 1000:>11.3f} {old / new:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
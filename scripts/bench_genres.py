@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Accuracy and throughput of genre detection on a labeled corpus, fully offline.
+
+    python scripts/bench_genres.py storage/corpus/genres.jsonl
+    python scripts/bench_genres.py corpus.jsonl --lastfm-stub tags.json --google-stub snippets.json --mode single
+
+Last.fm and Google are replaced by stubs that answer from optional JSON files
+({name: [tags]} and {name: [snippets]}) and count every name they are asked
+about; the artist cache is bypassed so each run starts cold.
+
+The offline classifier is off by default: it is trained on the same stored
+events ``export_genre_corpus.py`` exports, so scoring it on that corpus
+inflates the accuracy. Pass ``--classifier`` only with a corpus the model was
+not trained on (e.g. events exported after the model was built);
+``evaluate_genre_classifier.py`` cross-validates the model itself.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from app import genre
+from app.genre import ARTIST_GENRE, build_genre_matcher, detect_genres_many
+from app.services.artist_dictionary import ArtistDictionary
+from app.services.genre_classifier import score_predictions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Genre detection benchmark")
+    parser.add_argument("corpus", type=Path, help="JSONL from scripts/export_genre_corpus.py")
+    parser.add_argument("--lastfm-stub", type=Path, help="JSON {artist: [tags]}")
+    parser.add_argument("--google-stub", type=Path, help="JSON {artist: [snippets]}")
+    parser.add_argument("--mode", choices=("batch", "single"), default="batch",
+                        help="detect_genres_many over the corpus, or detect_genres per item")
+    classifier = parser.add_mutually_exclusive_group()
+    classifier.add_argument("--classifier", dest="classifier", action="store_true",
+                            help="Use the offline classifier (only on a corpus it was not trained on)")
+    classifier.add_argument("--no-classifier", dest="classifier", action="store_false",
+                            help="Disable the offline classifier (the default)")
+    parser.set_defaults(classifier=False)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs; the best one is reported")
+    return parser.parse_args()
+
+
+def _load_json(path: Path | None) -> dict:
+    if not path:
+        return {}
+    return {k.lower(): v for k, v in json.loads(path.read_text(encoding="utf-8")).items()}
+
+
+class RemoteStubs:
+    def __init__(self, lastfm: dict, google: dict):
+        self.lastfm = lastfm
+        self.google = google
+        self.lastfm_names = 0
+        self.google_names = 0
+
+    def fetch_top_tags_many(self, names):
+        names = list(names)
+        self.lastfm_names += len(names)
+        return {name: self.lastfm.get(name.lower(), []) for name in names}
+
+    def google_genre_lookup(self, name):
+        self.google_names += 1
+        hits: set[str] = set()
+        for snippet in self.google.get(name.lower(), []):
+            hits.update(genre._match_keywords(snippet))
+        return hits
+
+
+def install(stubs: RemoteStubs, *, classifier: bool) -> None:
+    genre.ARTIST_DICTIONARY = ArtistDictionary(ARTIST_GENRE, build_genre_matcher, refresh_seconds=float("inf"))
+    genre.fetch_top_tags_many = stubs.fetch_top_tags_many
+    genre._google_genre_lookup = stubs.google_genre_lookup
+    genre.get_cached_genres = lambda name: None
+    genre.cache_artist_genres = lambda name, genres: None
+    genre.Config.LASTFM_API_KEY = "stub"
+    genre.Config.GOOGLE_SEARCH_API_KEYS = ["stub"]
+    genre.Config.GOOGLE_SEARCH_CX = "stub"
+    if not classifier:
+        genre.get_classifier = lambda: None
+
+
+def run(items, mode: str):
+    if mode == "batch":
+        return detect_genres_many(items)
+    return [genre.detect_genres(text, hints) for text, hints in items]
+
+
+def main() -> int:
+    args = parse_args()
+    rows = [json.loads(line) for line in args.corpus.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not rows:
+        print("Corpus is empty")
+        return 1
+    items = [(row["title"], row.get("hints") or []) for row in rows]
+
+    stubs = RemoteStubs(_load_json(args.lastfm_stub), _load_json(args.google_stub))
+    install(stubs, classifier=args.classifier)
+
+    best = float("inf")
+    results = []
+    for _ in range(max(1, args.repeat)):
+        stubs.lastfm_names = stubs.google_names = 0
+        started = time.perf_counter()
+        results = run(items, args.mode)
+        best = min(best, time.perf_counter() - started)
+
+    report = score_predictions(
+        (row["genres"], genres) for row, (genres, _) in zip(rows, results)
+    )
+    print(f"items: {len(items)}  mode: {args.mode}  classifier: {'on' if args.classifier else 'off'}  "
+          f"items/s: {len(items) / best:.1f}")
+    print(f"remote lookups per run: last.fm names {stubs.lastfm_names}, google names {stubs.google_names}")
+    print()
+    print(f"{'genre':<12} {'precision':>9} {'recall':>7} {'f1':>6} {'support':>8}")
+    for name, row in report.items():
+        print(f"{name:<12} {row['precision']:>9.3f} {row['recall']:>7.3f} {row['f1']:>6.3f} {row['support']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
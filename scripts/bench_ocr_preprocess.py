@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Compare EasyOCR on full-resolution RGB input with the preprocessing stage.
+
+    python scripts/bench_ocr_preprocess.py --fixtures storage/ocr_fixtures
+    python scripts/bench_ocr_preprocess.py --fixtures storage/ocr_fixtures --max-side 1280 --crop
+
+Fixtures are .jpg/.png flyers; an optional ``<name>.txt`` next to an image holds
+its expected text. Without it, the full-resolution output is the reference.
+Recall is the share of reference words (3+ characters) found in the output.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from app.services import ocr
+from app.services.ocr_preprocess import preprocess
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+WORD_RE = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OCR preprocessing benchmark")
+    parser.add_argument("--fixtures", type=Path, required=True, help="Directory with flyer images")
+    parser.add_argument("--max-side", type=int, default=None, help="Override OCR_MAX_SIDE")
+    parser.add_argument("--rgb", action="store_true", help="Keep colour instead of grayscale")
+    parser.add_argument("--crop", action="store_true", help="Crop to the detected text area")
+    parser.add_argument("--repeat", type=int, default=1, help="OCR runs per image and variant")
+    return parser.parse_args()
+
+
+def baseline(data: bytes):
+    """The previous input: full-resolution RGB array."""
+    import numpy as np
+    from PIL import Image
+
+    return np.array(Image.open(BytesIO(data)).convert("RGB"))
+
+
+def words(text: str) -> set[str]:
+    return set(WORD_RE.findall(text.lower()))
+
+
+def run(readers, arr, repeat: int) -> tuple[str, float]:
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parts = [" ".join(reader.readtext(arr, detail=0, paragraph=True)) for reader in readers]
+        timings.append(time.perf_counter() - started)
+        text = " ".join(parts)
+    return text, statistics.median(timings)
+
+
+def main() -> int:
+    args = parse_args()
+    images = sorted(p for p in args.fixtures.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        print(f"No images in {args.fixtures}")
+        return 1
+    readers = ocr._get_readers()
+    if not readers:
+        print("EasyOCR is not available")
+        return 1
+
+    totals = {"full": [0.0, 0.0, 0.0], "preprocessed": [0.0, 0.0, 0.0]}
+    print(f"{'image':<32} {'full ms':>9} {'prep ms':>9} {'full rec':>9} {'prep rec':>9}")
+    for path in images:
+        data = path.read_bytes()
+        started = time.perf_counter()
+        arr = preprocess(data, max_side=args.max_side, grayscale=not args.rgb, crop=args.crop)
+        prep_cost = time.perf_counter() - started
+        full_text, full_time = run(readers, baseline(data), args.repeat)
+        prep_text, prep_time = run(readers, arr, args.repeat)
+        prep_time += prep_cost
+
+        expected_path = path.with_suffix(".txt")
+        reference = words(expected_path.read_text(encoding="utf-8") if expected_path.exists() else full_text)
+        full_recall = len(words(full_text) & reference) / len(reference) if reference else 1.0
+        prep_recall = len(words(prep_text) & reference) / len(reference) if reference else 1.0
+        for key, elapsed, recall in (("full", full_time, full_recall), ("preprocessed", prep_time, prep_recall)):
+            totals[key][0] += elapsed
+            totals[key][1] += recall
+            totals[key][2] += 1
+        print(
+            f"{path.name[:32]:<32} {full_time * 1000:>9.0f} {prep_time * 1000:>9.0f} "
+            f"{full_recall:>9.2f} {prep_recall:>9.2f}"
+        )
+
+    print()
+    for key, (elapsed, recall, count) in totals.items():
+        print(f"{key:<13} {elapsed / count * 1000:>8.0f} ms/image  recall {recall / count:.2f}")
+    speedup = totals["full"][0] / totals["preprocessed"][0] if totals["preprocessed"][0] else 0.0
+    print(f"speedup       {speedup:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
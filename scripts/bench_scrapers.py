@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Record scraper responses once, then replay them offline as a benchmark.
+
+    python scripts/bench_scrapers.py record --sources venti,catpass
+    python scripts/bench_scrapers.py run --repeat 3
+
+Both modes run the parsers against a throwaway database (in-memory SQLite by
+default, or ``--db-url`` for a local Postgres), never the production one. Its
+tables are dropped and recreated on every run, so any other URL needs
+``--destroy``; the configured ``DATABASE_URL`` is always refused. Parser and
+config patches only last for the benchmark.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import db as app_db
+from app import genre
+from app.config import Config
+from app.models import Base, Event
+from app.scrapers import bombo_parser, catpass_parser, link_utils, passline_parser, venti_parser
+from app.scrapers.replay import FIXTURES_DIR, recording, replaying
+from app.services.artist_dictionary import ArtistDictionary
+
+PARSERS = {
+    "venti": venti_parser,
+    "passline": passline_parser,
+    "catpass": catpass_parser,
+    "bombo": bombo_parser,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline scraper replay benchmark")
+    parser.add_argument("mode", choices=("record", "run"))
+    parser.add_argument("--sources", default=",".join(PARSERS), help="Comma-separated sources")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--db-url", default="sqlite://", help="Throwaway database URL (wiped on every run)")
+    parser.add_argument(
+        "--destroy",
+        action="store_true",
+        help="Allow a --db-url other than in-memory SQLite; its tables are dropped",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed replays per source")
+    return parser.parse_args()
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+def _check_db_url(db_url: str, destroy: bool) -> str | None:
+    """Why ``db_url`` must not be wiped, or ``None``."""
+    if app_db.DB_URL and db_url == app_db.DB_URL:
+        return "--db-url is the configured DATABASE_URL"
+    if db_url in ("sqlite://", "sqlite:///:memory:") or destroy:
+        return None
+    return "--db-url is not in-memory SQLite; pass --destroy to drop its tables"
+
+
+@contextmanager
+def _offline():
+    """Keep the benchmark offline and deterministic: no browser, no genre lookups."""
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(link_utils, "PLAYWRIGHT_AVAILABLE", False))
+        stack.enter_context(mock.patch.object(Config, "LASTFM_API_KEY", ""))
+        stack.enter_context(mock.patch.object(Config, "GOOGLE_SEARCH_API_KEY", ""))
+        stack.enter_context(mock.patch.object(Config, "GOOGLE_SEARCH_API_KEYS", []))
+        yield
+
+
+@contextmanager
+def _on_db(module, factory):
+    """Point the parser and everything that opens ``app.db.SessionLocal`` lazily at ``factory``."""
+    dictionary = ArtistDictionary(
+        genre.ARTIST_GENRE, genre.build_genre_matcher, session_factory=factory, refresh_seconds=float("inf")
+    )
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(module, "SessionLocal", factory))
+        stack.enter_context(mock.patch.object(app_db, "SessionLocal", factory))
+        stack.enter_context(mock.patch.object(genre, "ARTIST_DICTIONARY", dictionary))
+        dictionary.refresh(True)
+        yield
+
+
+def _fresh_db(db_url: str):
+    if db_url.startswith("sqlite"):
+        engine = create_engine(
+            db_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        engine = create_engine(db_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def _run_source(name: str, module, db_url: str, *, trace: bool = False) -> tuple[int, int, float, int]:
+    """Run one parser on a fresh database; returns (items, queries, seconds, peak bytes)."""
+    engine, factory = _fresh_db(db_url)
+    venti_parser.DETAIL_CACHE.clear()
+
+    peak = 0
+    with _on_db(module, factory):
+        counter = QueryCounter(engine)
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            module.run(limit=None, force_publish=False)
+        finally:
+            elapsed = time.perf_counter() - started
+            if trace:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+    queries = counter.count
+
+    with factory() as db:
+        items = db.execute(select(func.count(Event.id))).scalar_one()
+    engine.dispose()
+    return items, queries, elapsed, peak
+
+
+def main() -> int:
+    args = parse_args()
+    sources = [s.strip() for s in args.sources.split(",") if s.strip() in PARSERS]
+    if not sources:
+        print("No known sources selected")
+        return 1
+    refusal = _check_db_url(args.db_url, args.destroy)
+    if refusal:
+        print(f"Refusing to wipe the database: {refusal}")
+        return 1
+
+    with _offline():
+        return _benchmark(args, sources)
+
+
+def _benchmark(args: argparse.Namespace, sources: list[str]) -> int:
+    if args.mode == "record":
+        with recording(args.fixtures):
+            for name in sources:
+                print(f"Recording {name}…")
+                _run_source(name, PARSERS[name], args.db_url)
+        print(f"Fixtures saved under {args.fixtures}")
+        return 0
+
+    print(f"{'source':<10} {'items':>6} {'items/s':>10} {'queries/item':>13} {'peak MB':>9}")
+    with replaying(args.fixtures):
+        for name in sources:
+            runs = [_run_source(name, PARSERS[name], args.db_url) for _ in range(max(1, args.repeat))]
+            items, queries, _, _ = runs[-1]
+            best = min(r[2] for r in runs)
+            # peak memory is measured in a separate run so tracing does not skew timings
+            peak = _run_source(name, PARSERS[name], args.db_url, trace=True)[3]
+            rate = items / best if best else 0.0
+            per_item = queries / items if items else float("nan")
+            print(f"{name:<10} {items:>6} {rate:>10.1f} {per_item:>13.2f} {peak / 1_048_576:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
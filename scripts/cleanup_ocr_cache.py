@@ -2,65 +2,103 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
+import shutil
 import sys
-from datetime import datetime, timedelta
-from pathlib import Path
 
-CACHE_DIR = Path("storage/ocr_cache")
+sys.path.append(os.getcwd())
+
+from app.scrapers import http_cache
+from app.services.ocr_cache import LEGACY_CACHE_DIR, get_cache
+
 DEFAULT_TTL_DAYS = 60
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Remove OCR.Space cache files older than the TTL"
+        description="Trim the OCR cache (the size cap is also enforced on every write)"
     )
     parser.add_argument(
         "--ttl-days",
         type=int,
         default=DEFAULT_TTL_DAYS,
-        help="How many days to keep cache entries (default: 60)",
+        help="Remove entries not read for this many days (default: 60)",
+    )
+    parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Also evict least recently read entries down to this size",
+    )
+    parser.add_argument(
+        "--import-legacy",
+        action="store_true",
+        help=f"Copy the old per-file OCR.Space cache in {LEGACY_CACHE_DIR} into the OCR cache",
+    )
+    parser.add_argument(
+        "--purge-legacy",
+        action="store_true",
+        help=f"Import, then delete the old per-file OCR.Space cache in {LEGACY_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Also sweep the scraper HTTP cache (HTTP_CACHE_MAX_AGE_DAYS, HTTP_CACHE_MAX_MB)",
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Show which files would be removed without deleting",
+        help="Show how many entries would be removed without deleting",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Only print cache statistics",
     )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
-    ttl = timedelta(days=args.ttl_days)
-    now = datetime.utcnow()
+    cache = get_cache()
 
-    if not CACHE_DIR.exists():
-        print("Cache directory does not exist; nothing to do")
-        return 0
+    if not args.stats:
+        removed = cache.trim(
+            older_than=args.ttl_days * 86400,
+            max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None,
+            dry_run=args.dry_run,
+        )
+        if args.dry_run:
+            print(f"Dry run complete, {removed} cache entries would be removed")
+        else:
+            print(f"Removed {removed} cache entries")
 
-    removed = 0
-    for path in CACHE_DIR.glob("*.json"):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            created_str = data.get("created_at")
-            created = datetime.fromisoformat(created_str) if created_str else None
-        except Exception:
-            created = None
+    if args.http and not args.stats:
+        removed = http_cache.sweep(dry_run=args.dry_run)
+        print(f"{'Would remove' if args.dry_run else 'Removed'} {removed} HTTP cache entries")
 
-        if not created:
-            created = datetime.utcfromtimestamp(path.stat().st_mtime)
+    if (args.import_legacy or args.purge_legacy) and LEGACY_CACHE_DIR.exists():
+        if args.dry_run:
+            print(f"Would import {len(list(LEGACY_CACHE_DIR.glob('*.json')))} legacy cache files")
+        else:
+            print(f"Imported {cache.import_legacy(LEGACY_CACHE_DIR)} legacy cache entries")
 
-        if now - created >= ttl:
-            removed += 1
-            if args.dry_run:
-                print(f"Would remove {path}")
-            else:
-                path.unlink(missing_ok=True)
+    if args.purge_legacy and LEGACY_CACHE_DIR.exists():
+        if args.dry_run:
+            print(f"Would remove legacy cache directory {LEGACY_CACHE_DIR}")
+        else:
+            shutil.rmtree(LEGACY_CACHE_DIR)
+            print(f"Removed legacy cache directory {LEGACY_CACHE_DIR}")
 
-    if args.dry_run:
-        print(f"Dry run complete, {removed} files would be removed")
-    else:
-        print(f"Removed {removed} cache entries older than {args.ttl_days} days")
+    summary = cache.summary()
+    print(
+        f"{summary['entries']} entries, {summary['bytes'] / 1024:.0f} KiB of {summary['max_bytes'] / 1024:.0f} KiB; "
+        f"by engine: {summary['engines']}"
+    )
+    print(
+        f"Hit rate {summary['total_hit_rate']:.1%} over {summary['total_hits'] + summary['total_misses']} lookups "
+        f"({summary['total_hits']} hits, {summary['total_misses']} misses)"
+    )
     return 0
 
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Cross-validate the offline genre classifier on the events table.
+
+    python scripts/evaluate_genre_classifier.py --folds 5 --threshold 0.85
+
+Reports accuracy of the top label, how many events clear the confidence
+threshold (and would skip Last.fm/Google), and per-genre precision/recall of
+those confident predictions.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from app.config import Config
+from app.db import SessionLocal
+from app.services.genre_classifier import (
+    FALLBACK_LABEL,
+    GenreClassifier,
+    load_samples,
+    primary_genre,
+    score_predictions,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Evaluate the naive Bayes genre classifier")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=Config.GENRE_CLASSIFIER_THRESHOLD)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--min-count", type=int, default=1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with SessionLocal() as db:
+        samples = load_samples(db)
+    folds = max(2, args.folds)
+    if len(samples) < folds:
+        print(f"Need at least {folds} events with genres, found {len(samples)}")
+        return 1
+
+    correct = 0
+    confident = 0
+    confident_correct = 0
+    pairs = []
+    for fold in range(folds):
+        train = [(t, a, g) for event_id, t, a, g in samples if event_id % folds != fold]
+        test = [(t, a, g) for event_id, t, a, g in samples if event_id % folds == fold]
+        if not train or not test:
+            continue
+        model = GenreClassifier.train(train, alpha=args.alpha, min_count=args.min_count)
+        for title, artists, genres in test:
+            expected = primary_genre(genres)
+            label, confidence = model.predict(title, artists)
+            correct += label == expected
+            if label != FALLBACK_LABEL and confidence >= args.threshold:
+                confident += 1
+                confident_correct += label == expected
+                pairs.append(({expected}, {label}))
+            else:
+                pairs.append(({expected}, set()))
+
+    total = len(samples)
+    print(f"events: {total}, folds: {folds}, threshold: {args.threshold:.2f}")
+    print(f"top-label accuracy: {correct / total:.3f}")
+    print(f"confident: {confident} ({confident / total:.1%}), precision {confident_correct / confident if confident else 0:.3f}")
+    print()
+    print(f"{'genre':<12} {'precision':>9} {'recall':>7} {'f1':>6} {'support':>8}")
+    for genre, row in score_predictions(pairs).items():
+        print(
+            f"{genre:<12} {row['precision']:>9.3f} {row['recall']:>7.3f} {row['f1']:>6.3f} {row['support']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
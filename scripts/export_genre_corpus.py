@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Export labeled events as a JSONL corpus for scripts/bench_genres.py.
+
+    python scripts/export_genre_corpus.py --output storage/corpus/genres.jsonl
+
+Each line: {"id", "title", "hints", "genres", "artists", "source"}. Review
+and fix the "genres" labels by hand before using the file as ground truth.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models import Event
+
+DEFAULT_OUTPUT = Path("storage/corpus/genres.jsonl")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export a labeled genre corpus from events")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--source", action="append", help="Only these source_name values (repeatable)")
+    parser.add_argument("--include-general", action="store_true", help="Keep events labeled only 'general'")
+    parser.add_argument("--limit", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    query = select(Event).where(Event.genres.is_not(None)).order_by(Event.id)
+    if args.source:
+        query = query.where(Event.source_name.in_(args.source))
+    if args.limit:
+        query = query.limit(args.limit)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with SessionLocal() as db, args.output.open("w", encoding="utf-8") as fh:
+        for ev in db.execute(query.execution_options(yield_per=500)).scalars():
+            genres = [g for g in ev.genres or [] if g]
+            if not genres or (genres == ["general"] and not args.include_general):
+                continue
+            row = {
+                "id": ev.id,
+                "title": ev.title,
+                "hints": [ev.venue] if ev.venue else [],
+                "genres": genres,
+                "artists": list(ev.artists or []),
+                "source": ev.source_name,
+            }
+            fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+            written += 1
+    print(f"Exported {written} events to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
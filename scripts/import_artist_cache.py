@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Import the legacy storage/cache/artist_genres.json into the SQLite artist cache."""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from app.services.artist_cache import LEGACY_JSON_PATH, GenreLookupStore, import_json_cache
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import the JSON artist genre cache into SQLite")
+    parser.add_argument("--source", type=Path, default=LEGACY_JSON_PATH, help="Legacy JSON cache file")
+    parser.add_argument("--db", type=Path, default=None, help="Target SQLite file (default: ARTIST_CACHE_PATH)")
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the JSON file instead of renaming it to *.imported",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.source.exists():
+        print(f"{args.source} does not exist; nothing to import")
+        return 0
+
+    store = GenreLookupStore(args.db)
+    try:
+        imported = import_json_cache(args.source, store)
+    finally:
+        store.close()
+    print(f"Imported {imported} artists into {store.path}")
+
+    if not args.keep:
+        done = args.source.with_suffix(args.source.suffix + ".imported")
+        args.source.rename(done)
+        print(f"Renamed {args.source} -> {done}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Train the offline genre classifier on the events table.
+
+    python scripts/train_genre_classifier.py
+    python scripts/train_genre_classifier.py --alpha 0.5 --output storage/models/genre_nb.json
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.getcwd())
+
+from app.db import SessionLocal
+from app.services.genre_classifier import MODEL_PATH, GenreClassifier, load_samples
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the naive Bayes genre classifier")
+    parser.add_argument("--output", type=Path, default=MODEL_PATH)
+    parser.add_argument("--alpha", type=float, default=1.0, help="Laplace smoothing")
+    parser.add_argument("--min-count", type=int, default=1, help="Drop tokens seen fewer times")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with SessionLocal() as db:
+        samples = load_samples(db)
+    if not samples:
+        print("No events with genres to train on")
+        return 1
+
+    model = GenreClassifier.train(
+        ((title, artists, genres) for _, title, artists, genres in samples),
+        alpha=args.alpha,
+        min_count=args.min_count,
+    )
+    path = model.save(args.output)
+    print(f"Trained on {model.meta['samples']} events, {model.meta['vocab']} tokens -> {path}")
+    for label, count in sorted(model.meta["class_counts"].items(), key=lambda kv: -kv[1]):
+        print(f"  {label:<12} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,21 @@
 import sys
 from pathlib import Path
 
+import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _offline_artist_dictionary(monkeypatch):
+    """Keep ``detect_genres`` on the built-in presets instead of the configured database."""
+    from app import genre
+    from app.services.artist_dictionary import ArtistDictionary
+
+    monkeypatch.setattr(
+        genre,
+        "ARTIST_DICTIONARY",
+        ArtistDictionary(genre.ARTIST_GENRE, genre.build_genre_matcher, refresh_seconds=float("inf")),
+    )
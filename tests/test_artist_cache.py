@@ -0,0 +1,139 @@
+import json
+import time
+
+from app.config import Config
+from app.services.artist_cache import GenreLookupStore, import_json_cache
+
+
+def test_store_keeps_misses_and_expires_entries(tmp_path) -> None:
+    store = GenreLookupStore(tmp_path / "cache.sqlite3", flush_size=100, flush_interval=3600)
+
+    store.put("lastfm", "unknown dj", [], ttl=3600)
+    store.put("lastfm", "old dj", ["house"], ttl=-1)
+    store.put("artist", "solomun", ["house", "house"])
+
+    assert store.get("lastfm", "unknown dj") == []
+    assert store.get("lastfm", "old dj") is None
+    assert store.get("artist", "solomun") == ["house"]
+    assert store.get("artist", "nobody") is None
+    store.close()
+
+    reopened = GenreLookupStore(tmp_path / "cache.sqlite3")
+    assert reopened.get("lastfm", "unknown dj") == []
+    assert reopened.get("artist", "solomun") == ["house"]
+    assert reopened.get("lastfm", "old dj") is None
+
+
+def test_writes_are_batched_until_flush(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    writer = GenreLookupStore(path, flush_size=3, flush_interval=3600)
+    reader = GenreLookupStore(path, memory_ttl=0)
+
+    writer.put("artist", "a", ["rock"])
+    writer.put("artist", "b", ["pop"])
+    assert reader.get("artist", "a") is None
+
+    writer.put("artist", "c", ["metal"])
+    assert reader.get("artist", "a") == ["rock"]
+    assert reader.get("artist", "c") == ["metal"]
+
+
+def test_import_json_cache(tmp_path, monkeypatch) -> None:
+    legacy = tmp_path / "artist_genres.json"
+    legacy.write_text(
+        json.dumps({
+            "adam beyer": {"genres": ["techno"], "updated_at": "2025-01-01T00:00:00"},
+            "empty": {"genres": []},
+        }),
+        encoding="utf-8",
+    )
+    store = GenreLookupStore(tmp_path / "cache.sqlite3")
+
+    monkeypatch.setattr(Config, "ARTIST_CACHE_TTL_DAYS", 90)
+    before = time.time()
+
+    assert import_json_cache(legacy, store) == 1
+    assert store.get("artist", "adam beyer") == ["techno"]
+    (expires_at,) = store._connect().execute("SELECT expires_at FROM lookups WHERE key = 'adam beyer'").fetchone()
+    assert before + 90 * 86400 <= expires_at <= time.time() + 90 * 86400
+
+
+def test_lastfm_lookups_run_once_and_cache_misses(tmp_path, monkeypatch) -> None:
+    from app.services import lastfm
+
+    store = GenreLookupStore(tmp_path / "cache.sqlite3")
+    calls: list[str] = []
+
+    async def fake_fetch(client, artist, limiter, semaphore):
+        calls.append(artist)
+        return {"Solomun": ["deep house"], "Nobody": []}.get(artist)
+
+    monkeypatch.setattr(lastfm.Config, "LASTFM_API_KEY", "key")
+    monkeypatch.setattr(lastfm, "get_store", lambda: store)
+    monkeypatch.setattr(lastfm, "_fetch_one", fake_fetch)
+
+    first = lastfm.fetch_top_tags_many(["Nobody", "Solomun", "Flaky"])
+    second = lastfm.fetch_top_tags_many(["Solomun", "Nobody", "Flaky"])
+
+    assert first == {"Nobody": [], "Solomun": ["deep house"], "Flaky": []}
+    assert second == {"Solomun": ["deep house"], "Nobody": [], "Flaky": []}
+    # transient failures (None) are retried, hits and misses are not
+    assert sorted(calls) == ["Flaky", "Flaky", "Nobody", "Solomun"]
+
+
+def test_google_lookup_is_persisted_including_empty_results(tmp_path, monkeypatch) -> None:
+    from app import genre
+
+    store = GenreLookupStore(tmp_path / "cache.sqlite3")
+    results = {"Korolova": ["Korolova is a melodic techno DJ"], "Nobody": [], "Offline": None}
+    searched: list[str] = []
+
+    def fake_search(name):
+        searched.append(name)
+        return results[name]
+
+    monkeypatch.setattr(genre, "get_store", lambda: store)
+    monkeypatch.setattr(genre, "search_music_genre_snippets", fake_search)
+    monkeypatch.setattr(genre, "GOOGLE_LOOKUP_STATS", genre.Counter())
+
+    for _ in range(2):
+        assert genre._google_genre_lookup("Korolova") == {"techno"}
+        assert genre._google_genre_lookup("Nobody") == set()
+        assert genre._google_genre_lookup("Offline") == set()
+
+    assert searched == ["Korolova", "Nobody", "Offline", "Offline"]
+    stats = genre.google_lookup_stats()
+    assert stats["cache_hits"] == 2 and stats["cache_misses"] == 4 and stats["unavailable"] == 2
+
+
+def test_lastfm_retries_rate_limited_lookups(monkeypatch) -> None:
+    import asyncio
+
+    import httpx
+
+    from app.services import lastfm
+
+    responses = [
+        httpx.Response(429),
+        httpx.Response(200, json={"error": lastfm.RATE_LIMIT_EXCEEDED, "message": "Rate limit exceeded"}),
+        httpx.Response(200, json={"toptags": {"tag": [{"name": "Techno"}]}}),
+    ]
+    monkeypatch.setattr(lastfm, "backoff_delay", lambda attempt: 0)
+    monkeypatch.setattr(lastfm.Config, "LASTFM_MAX_RETRIES", 3)
+
+    async def lookup(retries_left: list):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: retries_left.pop(0)))
+        async with client:
+            return await lastfm._fetch_one(client, "DUKO", lastfm.RateLimiter(0), asyncio.Semaphore(1))
+
+    assert asyncio.run(lookup(list(responses))) == ["techno"]
+    monkeypatch.setattr(lastfm.Config, "LASTFM_MAX_RETRIES", 1)
+    assert asyncio.run(lookup(list(responses))) is None
+
+
+def test_lastfm_rate_limiter_is_shared_across_calls() -> None:
+    from app.services.lastfm import RateLimiter
+
+    limiter = RateLimiter(10)
+    delays = [limiter.reserve() for _ in range(3)]
+    assert delays[0] == 0 and 0.15 < delays[2] <= 0.2
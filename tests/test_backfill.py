@@ -0,0 +1,78 @@
+from datetime import date
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import backfill
+from app.backfill import BackfillRunner
+from app.models import Event
+
+
+def _sqlite_factory(titles: list[tuple[str, list[str] | None]]):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Event.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as db:
+        for idx, (title, genres) in enumerate(titles):
+            db.add(
+                Event(
+                    title=title,
+                    title_norm=title.lower(),
+                    date=date(2025, 3, 1),
+                    venue="Crobar",
+                    city="Buenos Aires",
+                    genres=genres,
+                    source_type="test",
+                    source_name="test",
+                    dedupe_hash=f"h{idx}",
+                )
+            )
+        db.commit()
+    return factory
+
+
+def _fake_detect(items, *, remote=True):
+    return [(["techno"] if "techno" in title.lower() else ["general"], []) for title, _ in items]
+
+
+def test_backfill_updates_changed_rows_without_downgrading(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(backfill, "detect_genres_many", _fake_detect)
+    factory = _sqlite_factory([
+        ("Techno Night", ["house"]),
+        ("Secret party", ["house"]),
+        ("Another gig", None),
+        ("Techno Sunday", ["techno"]),
+    ])
+    runner = BackfillRunner(["genres"], session_factory=factory, batch_size=2, state_dir=tmp_path)
+
+    stats = runner.run()
+
+    assert (stats.scanned, stats.changed, stats.batches) == (4, 2, 2)
+    with factory() as db:
+        genres = [row.genres for row in db.execute(select(Event.genres).order_by(Event.id))]
+    assert genres == [["techno"], ["house"], ["general"], ["techno"]]
+    assert not runner.state_path.exists()
+
+
+def test_backfill_resumes_after_watermark(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(backfill, "detect_genres_many", _fake_detect)
+    factory = _sqlite_factory([("Techno A", None), ("Techno B", None), ("Techno C", None)])
+    runner = BackfillRunner(["genres"], session_factory=factory, batch_size=1, state_dir=tmp_path)
+    runner._save_watermark(2)
+
+    stats = runner.run()
+
+    assert (stats.scanned, stats.changed, stats.last_id) == (1, 1, 3)
+    with factory() as db:
+        genres = [row.genres for row in db.execute(select(Event.genres).order_by(Event.id))]
+    assert genres == [None, None, ["techno"]]
+
+
+def test_vibe_backfill_is_idempotent(tmp_path) -> None:
+    factory = _sqlite_factory([("Techno Night", ["techno"]), ("Rooftop", ["house"]), ("Feria", None)])
+
+    first = BackfillRunner(["vibe"], session_factory=factory, state_dir=tmp_path).run()
+    second = BackfillRunner(["vibe"], session_factory=factory, state_dir=tmp_path).run()
+
+    assert (first.changed, second.changed) == (3, 0)
@@ -0,0 +1,18 @@
+import asyncio
+
+from app.background_loop import BackgroundLoop
+
+
+def test_background_loop_serves_sync_and_async_callers() -> None:
+    background = BackgroundLoop("test-loop")
+    assert not background.started
+
+    async def loop_id() -> int:
+        return id(asyncio.get_running_loop())
+
+    first = background.run(loop_id())
+    assert background.started
+    assert asyncio.run(background.run_async(loop_id())) == first
+
+    background.stop()
+    assert not background.started
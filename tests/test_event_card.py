@@ -0,0 +1,27 @@
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.publisher import images
+
+
+def test_numpy_gradient_matches_line_drawing(monkeypatch) -> None:
+    images._gradient.cache_clear()
+    fast = np.asarray(images._gradient(40, 300, images.BACKGROUND_TOP, images.BACKGROUND_BOTTOM))
+    images._gradient.cache_clear()
+    monkeypatch.setattr(images, "np", None)
+    slow = np.asarray(images._gradient(40, 300, images.BACKGROUND_TOP, images.BACKGROUND_BOTTOM))
+    images._gradient.cache_clear()
+    assert (fast == slow).all()
+
+
+def test_card_chrome_is_reused_per_layout() -> None:
+    images._card_chrome.cache_clear()
+    ev = SimpleNamespace(title="Techno Night", genres=["techno"], venue="Crobar", city=None, date=date(2025, 4, 12), time=None)
+    first = images._render_event_card(ev, None)
+    second = images._render_event_card(SimpleNamespace(**{**vars(ev), "title": "Other Night"}), None)
+
+    assert first and second and first != second
+    info = images._card_chrome.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
@@ -0,0 +1,58 @@
+from app import genre
+from app.services.artist_dictionary import ArtistDictionary
+from app.services.genre_classifier import GenreClassifier, primary_genre, score_predictions
+
+SAMPLES = [
+    ("Korolova all night long", ["Korolova"], ["electronic", "house"]),
+    ("Korolova open air", ["Korolova"], ["electronic", "house"]),
+    ("Warehouse rave Adam Beyer", ["Adam Beyer"], ["electronic", "techno"]),
+    ("Adam Beyer at Mandarine", ["Adam Beyer"], ["electronic", "techno"]),
+    ("Feria del libro", [], ["general"]),
+]
+
+
+def test_classifier_trains_predicts_and_round_trips(tmp_path) -> None:
+    model = GenreClassifier.train(SAMPLES)
+
+    label, confidence = model.predict("Korolova sunset", ["Korolova"])
+    assert label == "house" and confidence > 0.8
+    assert model.predict("completely unknown words")[0] == "general"
+    assert model.predict_genres("Adam Beyer", ["Adam Beyer"], threshold=0.8) == {"techno"}
+
+    path = model.save(tmp_path / "model.json")
+    loaded = GenreClassifier.load(path)
+    assert loaded.predict("Korolova sunset", ["Korolova"]) == (label, confidence)
+
+
+def test_primary_genre_and_scores() -> None:
+    assert primary_genre(["electronic", "house"]) == "house"
+    assert primary_genre(["electronic"]) == "electronic"
+    assert primary_genre(None) == "general"
+
+    report = score_predictions([({"house"}, {"house"}), ({"house"}, {"techno"}), ({"techno"}, set())])
+    assert report["house"]["precision"] == 1.0 and report["house"]["recall"] == 0.5
+    assert report["techno"]["precision"] == 0.0
+    assert report["_micro"]["support"] == 3
+
+
+def test_confident_prediction_skips_remote_lookups(monkeypatch) -> None:
+    model = GenreClassifier.train(SAMPLES)
+    calls: list = []
+    # built-in presets only: never poll the configured database
+    monkeypatch.setattr(
+        genre,
+        "ARTIST_DICTIONARY",
+        ArtistDictionary(genre.ARTIST_GENRE, genre.build_genre_matcher, refresh_seconds=float("inf")),
+    )
+    monkeypatch.setattr(genre, "get_classifier", lambda: model)
+    monkeypatch.setattr(genre, "get_cached_genres", lambda name: None)
+    monkeypatch.setattr(genre, "fetch_top_tags_many", lambda names: calls.append(names) or {})
+    monkeypatch.setattr(genre.Config, "LASTFM_API_KEY", "key")
+    monkeypatch.setattr(genre.Config, "GOOGLE_SEARCH_API_KEYS", [])
+    monkeypatch.setattr(genre.Config, "GOOGLE_SEARCH_API_KEY", "")
+    monkeypatch.setattr(genre.Config, "GENRE_CLASSIFIER_THRESHOLD", 0.8)
+
+    results = genre.detect_genres_many([("KOROLOVA / Sunset", None), ("Mystery Guest / Nobody", None)])
+
+    assert results[0][0] == ["house"]
+    assert calls == [["Mystery Guest", "Nobody"]]
@@ -0,0 +1,155 @@
+import re
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import genre
+from app.genre import GENRE_KEYWORDS, KEYWORD_MATCHER, build_genre_matcher, detect_genres, detect_genres_many
+from app.genre_matcher import KeywordMatcher
+from app.models import Artist
+from app.services.artist_dictionary import ArtistDictionary, upsert_artist
+
+
+def _sqlite_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Artist.__table__.create(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def _regex_hits(text: str) -> set[str]:
+    hits = set()
+    for genre, keywords in GENRE_KEYWORDS.items():
+        for keyword in keywords:
+            if re.search(rf"\b{re.escape(keyword)}\b", text, flags=re.IGNORECASE):
+                hits.add(genre)
+                break
+    return hits
+
+
+def test_keyword_matcher_agrees_with_word_bounded_regex() -> None:
+    samples = [
+        "DEEP HOUSE night at Palermo",
+        "#techno #trance all night long",
+        "Lighthouse festival, warehouse party",
+        "drum & bass + jungle / rap-battle",
+        "pop-up store, popcorn and alt.rock",
+        "hip-hop_underground drum n bassline",
+        "Ultra Buenos Aires: EDM, club night",
+        "",
+    ]
+    for text in samples:
+        assert KEYWORD_MATCHER.scan(text) == _regex_hits(text), text
+
+
+def test_unbounded_entries_match_inside_words() -> None:
+    matcher = KeywordMatcher([("solomun", ("house",), False), ("rap", ("rap",), True)])
+
+    assert matcher.scan("SOLOMUN live") == {"house"}
+    assert matcher.scan("solomunday trapped") == {"house"}
+
+
+def test_detect_genres_uses_artist_and_keyword_hits(monkeypatch) -> None:
+    monkeypatch.setattr("app.genre.Config.LASTFM_API_KEY", "")
+    monkeypatch.setattr("app.genre.Config.GOOGLE_SEARCH_API_KEY", "")
+    monkeypatch.setattr("app.genre.Config.GOOGLE_SEARCH_API_KEYS", [])
+    monkeypatch.setattr(
+        genre,
+        "ARTIST_DICTIONARY",
+        ArtistDictionary(genre.ARTIST_GENRE, build_genre_matcher, session_factory=_sqlite_factory()),
+    )
+
+    genres, _ = detect_genres("Adam Beyer", ["Sábado", "deep house after"])
+
+    assert genres == ["house", "techno"]
+
+
+def test_artist_dictionary_reloads_only_when_table_changes() -> None:
+    factory = _sqlite_factory()
+    builds = []
+
+    def build(presets):
+        builds.append(dict(presets))
+        return build_genre_matcher(presets)
+
+    dictionary = ArtistDictionary({"solomun": ("house",)}, build, session_factory=factory, refresh_seconds=float("inf"))
+    dictionary.refresh(True)
+    assert dictionary.get().scan("Solomun") == {"house"}
+
+    with factory() as db:
+        upsert_artist(db, "Charlotte  de Witte", ["Techno"])
+        db.commit()
+    assert dictionary.refresh(True)
+    assert dictionary.get().scan("CHARLOTTE DE WITTE all night") == {"techno"}
+    assert not dictionary.refresh(True)
+    assert dictionary.get().scan("solomun") == set()
+
+    with factory() as db:
+        upsert_artist(db, "charlotte de witte", ["techno", "electronic"])
+        db.commit()
+    assert dictionary.refresh(True)
+    assert dictionary.get().scan("charlotte de witte") == {"techno", "electronic"}
+    assert len(builds) == 3
+
+
+def test_artist_dictionary_get_does_not_wait_for_the_database() -> None:
+    release = threading.Event()
+    factory = _sqlite_factory()
+
+    def slow_factory():
+        release.wait(5)
+        return factory()
+
+    with factory() as db:
+        upsert_artist(db, "Solomun", ["house"])
+        db.commit()
+    dictionary = ArtistDictionary({}, build_genre_matcher, session_factory=slow_factory, refresh_seconds=60)
+
+    started = time.monotonic()
+    assert dictionary.get().scan("solomun") == set()  # stale value while the refresh runs
+    assert time.monotonic() - started < 1
+    release.set()
+    dictionary._thread.join(5)
+    assert dictionary.get().scan("solomun") == {"house"}
+
+
+def test_detect_genres_many_resolves_each_name_once(monkeypatch) -> None:
+    lastfm_calls: list[list[str]] = []
+    google_calls: list[str] = []
+
+    def fake_lastfm(names):
+        lastfm_calls.append(list(names))
+        return {"DUKO": ["techno"]}
+
+    def fake_google(name):
+        google_calls.append(name)
+        return {"LUMI": {"house"}}.get(name, set())
+
+    monkeypatch.setattr(
+        genre,
+        "ARTIST_DICTIONARY",
+        ArtistDictionary({}, build_genre_matcher, session_factory=_sqlite_factory()),
+    )
+    monkeypatch.setattr(genre.Config, "LASTFM_API_KEY", "key")
+    monkeypatch.setattr(genre.Config, "GOOGLE_SEARCH_API_KEYS", ["g"])
+    monkeypatch.setattr(genre.Config, "GOOGLE_SEARCH_CX", "cx")
+    monkeypatch.setattr(genre, "fetch_top_tags_many", fake_lastfm)
+    monkeypatch.setattr(genre, "_google_genre_lookup", fake_google)
+    monkeypatch.setattr(genre, "get_cached_genres", lambda name: ["rock"] if name == "Cached" else None)
+    monkeypatch.setattr(genre, "cache_artist_genres", lambda name, genres: None)
+    monkeypatch.setattr(genre, "get_classifier", lambda: None)
+
+    results = detect_genres_many([
+        ("DUKO b2b Nadie", None),
+        ("Nadie / LUMI", None),
+        ("Nadie, DUKO", ["sábado"]),
+        ("Cached x Nadie", None),
+        ("deep house night", None),
+    ])
+
+    assert [genres for genres, _ in results] == [["techno"], ["house"], ["techno"], ["rock"], ["house"]]
+    assert lastfm_calls == [["DUKO", "Nadie", "LUMI"]]
+    # "Nadie" failed on Last.fm and Google once for everybody; "LUMI" is asked after it
+    assert google_calls == ["Nadie", "LUMI"]
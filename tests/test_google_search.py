@@ -0,0 +1,90 @@
+import json
+from datetime import date
+
+from app.services import google_search
+from app.services.google_search import GoogleKeyPool
+
+
+def _setup(monkeypatch, alerts: list) -> None:
+    monkeypatch.setattr(google_search.Config, "GOOGLE_SEARCH_API_KEYS", ["key-a", "key-b"])
+    monkeypatch.setattr(google_search, "_send_admin_alert", alerts.append)
+
+
+def test_pool_counts_in_memory_and_rotates_on_exhaustion(tmp_path, monkeypatch) -> None:
+    alerts: list[str] = []
+    _setup(monkeypatch, alerts)
+    path = tmp_path / "usage.json"
+    pool = GoogleKeyPool(path, flush_interval=0)
+
+    assert [pool.acquire() for _ in range(3)] == ["key-a"] * 3
+    assert not path.exists()
+
+    pool.mark_exhausted("key-a")
+    assert pool.acquire() == "key-b"
+    pool.mark_exhausted("key-b", alert=False)
+    assert pool.acquire() is None
+    assert len(alerts) == 2
+
+    saved = json.loads(path.read_text())
+    assert saved["keys"]["key-a"] == {"count": 3, "alert_sent": False, "exhausted": True}
+    assert saved["keys"]["key-b"]["exhausted"]
+
+
+def test_flush_merges_counts_from_other_workers(tmp_path, monkeypatch) -> None:
+    _setup(monkeypatch, [])
+    path = tmp_path / "usage.json"
+    today = date.today().isoformat()
+    path.write_text(json.dumps({
+        "date": today,
+        "current_index": 0,
+        "keys": {"key-a": {"count": 10, "alert_sent": False, "exhausted": False}},
+    }))
+    pool = GoogleKeyPool(path, flush_interval=0)
+    pool.acquire()
+    pool.acquire()
+
+    # another worker wrote meanwhile: it spent 5 more and exhausted key-a
+    path.write_text(json.dumps({
+        "date": today,
+        "current_index": 0,
+        "keys": {"key-a": {"count": 15, "alert_sent": False, "exhausted": True}},
+    }))
+    pool.flush()
+
+    saved = json.loads(path.read_text())
+    assert saved["keys"]["key-a"]["count"] == 17
+    assert pool.acquire() == "key-b"
+
+
+def test_stale_day_is_reset(tmp_path, monkeypatch) -> None:
+    _setup(monkeypatch, [])
+    path = tmp_path / "usage.json"
+    path.write_text(json.dumps({
+        "date": "2000-01-01",
+        "current_index": 1,
+        "keys": {"key-a": {"count": 100, "alert_sent": True, "exhausted": True}},
+    }))
+    pool = GoogleKeyPool(path, flush_interval=0)
+
+    assert pool.acquire() == "key-a"
+
+
+def test_flush_after_midnight_keeps_todays_file(tmp_path, monkeypatch) -> None:
+    _setup(monkeypatch, [])
+    path = tmp_path / "usage.json"
+    pool = GoogleKeyPool(path, flush_interval=0)
+    pool.acquire()
+    # the flusher still holds yesterday's counts when another worker writes today's file
+    pool._data["date"] = "2000-01-01"
+    today = {
+        "date": date.today().isoformat(),
+        "current_index": 0,
+        "keys": {"key-a": {"count": 2, "alert_sent": False, "exhausted": False}},
+    }
+    path.write_text(json.dumps(today))
+    pool.flush()
+
+    assert json.loads(path.read_text()) == today
+    assert pool.acquire() == "key-a"
+    pool.flush()
+    assert json.loads(path.read_text())["keys"]["key-a"]["count"] == 3
@@ -0,0 +1,142 @@
+from email.utils import formatdate
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.scrapers.http_cache import CachedSession, is_unchanged
+
+
+def _response(status: int, body: bytes = b"", headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict(headers or {})
+    resp._content = body
+    resp.url = "https://example.com/events"
+    return resp
+
+
+class FakeSession:
+    def __init__(self, responses: list[requests.Response]):
+        self.responses = list(responses)
+        self.calls: list[dict] = []
+        self.headers: dict = {}
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append({"url": url, "headers": dict(headers or {})})
+        return self.responses.pop(0)
+
+
+def test_fresh_entry_is_served_without_network(tmp_path) -> None:
+    fake = FakeSession([_response(200, b"[1]", {"Cache-Control": "max-age=600"})])
+    session = CachedSession(fake, source="catpass", cache_dir=tmp_path, enabled=True)
+
+    first = session.get("https://example.com/events")
+    session.mark_processed(first)
+    second = session.get("https://example.com/events")
+
+    assert not is_unchanged(first)
+    assert is_unchanged(second) and second.from_cache
+    assert second.json() == [1]
+    assert len(fake.calls) == 1
+
+
+def test_stale_entry_revalidates_with_etag(tmp_path) -> None:
+    fake = FakeSession([
+        _response(200, b"payload", {"ETag": '"v1"'}),
+        _response(304),
+    ])
+    session = CachedSession(fake, source="venti", cache_dir=tmp_path, enabled=True)
+
+    session.mark_processed(session.get("https://example.com/events", params={"page": 1}))
+    revalidated = session.get("https://example.com/events", params={"page": 1})
+
+    assert fake.calls[1]["headers"]["If-None-Match"] == '"v1"'
+    assert is_unchanged(revalidated)
+    assert revalidated.text == "payload"
+
+
+def test_same_body_without_validators_counts_as_unchanged(tmp_path) -> None:
+    fake = FakeSession([_response(200, b"same"), _response(200, b"same"), _response(200, b"new")])
+    session = CachedSession(fake, source="bombo", cache_dir=tmp_path, enabled=True)
+
+    first = session.get("https://example.com/page")
+    session.mark_processed(first)
+    assert not is_unchanged(first)
+    assert is_unchanged(session.get("https://example.com/page"))
+    assert not is_unchanged(session.get("https://example.com/page"))
+
+
+def test_body_is_not_unchanged_until_marked_processed(tmp_path) -> None:
+    fake = FakeSession([_response(200, b"same"), _response(200, b"same"), _response(200, b"same")])
+    session = CachedSession(fake, source="catpass", cache_dir=tmp_path, enabled=True)
+
+    session.get("https://example.com/page")  # run crashed before committing
+    retry = session.get("https://example.com/page")
+    assert not is_unchanged(retry)
+    session.mark_processed(retry)
+    assert is_unchanged(session.get("https://example.com/page"))
+
+
+def test_expires_header_sets_freshness(tmp_path) -> None:
+    fake = FakeSession([
+        _response(200, b"a", {"Expires": formatdate(time.time() + 600, usegmt=True)}),
+        _response(200, b"b", {"Expires": formatdate(time.time() - 60, usegmt=True)}),
+        _response(200, b"b"),
+    ])
+    session = CachedSession(fake, source="bombo", cache_dir=tmp_path, enabled=True)
+
+    session.get("https://example.com/a")
+    assert session.get("https://example.com/a").from_cache
+    session.get("https://example.com/b")
+    assert not session.get("https://example.com/b").from_cache
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_source_ttl_overrides_headers_and_no_store_skips_cache(tmp_path) -> None:
+    fake = FakeSession([
+        _response(200, b"a", {"Cache-Control": "no-cache"}),
+        _response(200, b"b", {"Cache-Control": "no-store"}),
+        _response(200, b"c", {"Cache-Control": "no-store"}),
+    ])
+    session = CachedSession(fake, source="passline", ttl=3600, cache_dir=tmp_path, enabled=True)
+
+    session.get("https://example.com/a")
+    assert session.get("https://example.com/a").from_cache
+    session.get("https://example.com/b")
+    session.get("https://example.com/b")
+    assert len(fake.calls) == 3
+
+
+def test_credentials_are_part_of_the_cache_key(tmp_path) -> None:
+    fake = FakeSession([
+        _response(200, b"alice", {"Cache-Control": "max-age=600"}),
+        _response(200, b"bob", {"Cache-Control": "max-age=600"}),
+    ])
+    session = CachedSession(fake, source="venti", cache_dir=tmp_path, enabled=True)
+
+    fake.headers["Authorization"] = "Bearer alice"
+    assert session.get("https://example.com/me").content == b"alice"
+    assert session.get("https://example.com/me").from_cache
+    assert session.get("https://example.com/me", headers={"authorization": "Bearer bob"}).content == b"bob"
+    assert len(fake.calls) == 2
+
+
+def test_sweep_removes_old_entries_then_oldest_above_the_cap(tmp_path) -> None:
+    import os
+
+    from app.scrapers.http_cache import sweep
+
+    fake = FakeSession([_response(200, bytes([n]) * 100) for n in range(3)])
+    session = CachedSession(fake, source="bombo", ttl=0, cache_dir=tmp_path, enabled=True)
+    for n in range(3):
+        session.get(f"https://example.com/{n}")
+    metas = sorted((tmp_path / "bombo").glob("*.json"), key=lambda p: p.stat().st_mtime)
+    now = time.time()
+    for age, meta in zip((30 * 86400, 2 * 86400, 0), metas):
+        os.utime(meta, (now - age, now - age))
+    entry = metas[2].stat().st_size + metas[2].with_suffix(".body").stat().st_size
+
+    assert sweep(tmp_path, older_than=7 * 86400, max_bytes=10**6, dry_run=True) == 1
+    assert sweep(tmp_path, older_than=7 * 86400, max_bytes=entry) == 2
+    assert [p.exists() for p in metas] == [False, False, True]
@@ -0,0 +1,111 @@
+from datetime import date
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.services.image_hash import ImageHashIndex, dhash, hamming
+
+
+def _flyer(size: tuple[int, int], quality: int, text: str = "TECHNO 12/04") -> bytes:
+    image = Image.new("RGB", (800, 1000), (20, 20, 40))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, 1000, 50):
+        draw.rectangle((0, y, 800, y + 20), fill=(200, (y // 4) % 255, 80))
+    draw.ellipse((200, 300, 600, 700), fill=(240, 240, 240))
+    draw.text((100, 100), text, fill=(255, 255, 0))
+    buffer = BytesIO()
+    image.resize(size).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def test_dhash_survives_recompression_and_resizing() -> None:
+    original = dhash(_flyer((800, 1000), 95))
+    repost = dhash(_flyer((480, 600), 40))
+    assert original is not None and repost is not None
+    assert hamming(original, repost) <= 6
+    assert dhash(b"not an image") is None
+
+
+def test_index_returns_nearest_match_with_event(tmp_path) -> None:
+    index = ImageHashIndex(tmp_path / "hashes.sqlite3", max_distance=6)
+    base = 0xF0F0_F0F0_0F0F_0F0F
+    index.add(base, "techno night")
+    index.add(base, "", event_id=42)
+
+    match = index.lookup(base ^ 0b101)
+    assert match is not None
+    assert (match.distance, match.text, match.event_id) == (2, "techno night", 42)
+    assert index.lookup(base ^ 0xFF) is None
+    assert index.lookup(None) is None
+    # hashes with the top bit set round-trip through SQLite's signed integers
+    index.add(1 << 63 | 7, "high bit")
+    assert index.lookup(1 << 63 | 7).text == "high bit"
+
+
+def test_recognize_reads_near_duplicates_and_flags_exact_reposts(monkeypatch, tmp_path) -> None:
+    from app.services import ocr
+    from app.services.ocr_cache import OcrCache, content_digest
+
+    index = ImageHashIndex(tmp_path / "hashes.sqlite3", max_distance=6)
+    old, new = _flyer((800, 1000), 95, "TECHNO 12/04"), _flyer((800, 1000), 95, "TECHNO 19/04")
+    index.add(dhash(old), "TECHNO 12/04", event_id=7, digest=content_digest(old))
+    # last week's edition
+    index._connect().execute("UPDATE images SET created_at = created_at - 7 * 86400")
+    monkeypatch.setattr(ocr, "get_image_index", lambda: index)
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: OcrCache(tmp_path / "ocr.sqlite3"))
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: ["TECHNO 19/04"] * len(blobs))
+
+    template, repost = ocr.extract_texts_from_bytes([new, old])
+
+    # same template with a new date: read again, the old event is only a hint
+    assert template.text == "TECHNO 19/04" and template.event_id is None
+    assert template.match is not None and template.match.event_id == 7
+    assert repost.event_id == 7 and repost.digest == content_digest(old)
+
+
+def test_recent_near_duplicate_reuses_stored_text(monkeypatch, tmp_path) -> None:
+    from app.services import ocr
+    from app.services.ocr_cache import OcrCache
+
+    index = ImageHashIndex(tmp_path / "hashes.sqlite3", max_distance=6)
+    index.add(dhash(_flyer((800, 1000), 95)), "TECHNO 12/04", event_id=7)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: index)
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: OcrCache(tmp_path / "ocr.sqlite3"))
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: pytest.fail("OCR'd a repost"))
+
+    [repost] = ocr.extract_texts_from_bytes([_flyer((480, 600), 40)])
+
+    assert repost.text == "TECHNO 12/04" and repost.match.event_id == 7
+
+
+def test_index_ignores_and_prunes_old_entries(tmp_path) -> None:
+    index = ImageHashIndex(tmp_path / "hashes.sqlite3", max_distance=6, max_age=3600)
+    index.add(0xABCD, "old", event_id=1, digest="old")
+    index._connect().execute("UPDATE images SET created_at = created_at - 7200")
+    index._connect().execute("UPDATE event_images SET created_at = created_at - 7200")
+    index.add(0xF0F0_F0F0, "new", event_id=2, digest="new")
+
+    assert index.lookup(0xABCD) is None and index.event_for_digest("old") is None
+    assert index.prune() == 2
+    assert index.lookup(0xF0F0_F0F0).text == "new" and index.event_for_digest("new") == 2
+
+
+def test_near_duplicate_is_a_repost_only_with_same_date_and_title() -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models import Event
+    from app.scrapers.telegram_scraper import _is_repost
+
+    engine = create_engine("sqlite://")
+    Event.__table__.create(engine)
+    with sessionmaker(bind=engine)() as db:
+        event = Event(title="Techno Night", title_norm="techno night", date=date(2025, 4, 12),
+                      source_type="telegram", source_name="ba", dedupe_hash="h")
+        db.add(event)
+        db.commit()
+
+        assert _is_repost(db, event.id, "techno nigth", date(2025, 4, 12))
+        assert not _is_repost(db, event.id, "techno night", date(2025, 4, 19))
+        assert not _is_repost(db, event.id, "sunset house", date(2025, 4, 12))
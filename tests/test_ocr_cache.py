@@ -0,0 +1,115 @@
+import pytest
+
+from app.services import ocr
+from app.services.image_hash import ImageHashIndex
+from app.services.ocr_cache import OcrCache, content_digest
+
+
+def test_ocr_cache_evicts_least_recently_read(tmp_path) -> None:
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(name, name * 100, "easyocr")
+        if name == "b":
+            assert cache.get("a") == "a" * 100  # "a" is now fresher than "b"
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 100
+    assert cache.get("c") == "c" * 100
+    summary = cache.summary()
+    assert summary["entries"] == 2
+    assert (summary["hits"], summary["misses"], summary["evictions"]) == (3, 1, 1)
+
+
+def test_recognize_caches_by_content_for_both_engines(monkeypatch, tmp_path) -> None:
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=1 << 20)
+    calls = []
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: cache)
+    monkeypatch.setattr(ocr, "dhash", lambda data: None)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: ImageHashIndex(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: calls.append("remote") or [""] * len(blobs))
+    monkeypatch.setattr(ocr, "_run_ocr_many", lambda blobs: calls.append("easyocr") or [ocr.OcrResult("FIESTA")] * len(blobs))
+
+    assert ocr.extract_text_from_bytes(b"flyer") == "FIESTA"
+    assert ocr.extract_text_from_bytes(b"flyer") == "FIESTA"
+    assert calls == ["remote", "easyocr"]
+    assert cache.summary()["engines"] == {"easyocr": 1}
+    assert cache.get(content_digest(b"flyer")) == "FIESTA"
+
+
+def test_ocr_cache_trim_dry_run_counts_without_deleting(tmp_path) -> None:
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=1 << 20)
+    cache.put("old", "old", "easyocr")
+    cache.put("blank", "", "easyocr", ttl=-1)
+    cache.put("fresh", "fresh", "easyocr")
+    cache._connect().execute("UPDATE ocr SET accessed_at = 0 WHERE digest = 'old'")
+
+    assert cache.trim(older_than=3600, dry_run=True) == 2
+    assert cache.summary()["entries"] == 3
+    assert cache.trim(older_than=3600) == 2
+    assert cache.get("fresh") == "fresh"
+    assert cache.summary()["entries"] == 1
+
+
+def test_recognize_caches_blank_images_briefly(monkeypatch, tmp_path) -> None:
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=1 << 20)
+    calls = []
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: cache)
+    monkeypatch.setattr(ocr, "dhash", lambda data: None)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: ImageHashIndex(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: calls.append("remote") or [""] * len(blobs))
+    monkeypatch.setattr(
+        ocr,
+        "_run_ocr_many",
+        lambda blobs: calls.append("easyocr")
+        or [ocr.OcrResult(), ocr.OcrResult(error="undecodable image"), ocr.OcrResult(error="EasyOCR not available")],
+    )
+
+    ocr._recognize_many([b"blank", b"broken", b"unread"])
+    assert cache.get(content_digest(b"blank")) == ""
+    assert cache.get(content_digest(b"broken")) == ""
+    assert cache.get(content_digest(b"unread")) is None
+    expires_at = cache._connect().execute("SELECT expires_at FROM ocr WHERE digest = ?", (content_digest(b"blank"),)).fetchone()[0]
+    assert expires_at is not None
+
+    monkeypatch.setattr(ocr, "_run_ocr_many", lambda blobs: calls.append("easyocr") or [ocr.OcrResult()] * len(blobs))
+    ocr._recognize_many([b"blank", b"broken", b"unread"])
+    assert calls == ["remote", "easyocr", "remote", "easyocr"]
+    assert cache.get(content_digest(b"unread")) == ""
+
+
+def test_legacy_entries_are_imported_and_found_by_url_or_content(monkeypatch, tmp_path) -> None:
+    import hashlib
+    import json
+
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for key, text in (("url:https://x/flyer.jpg", "BY URL"), (f"bytes:{content_digest(b'flyer')}", "BY BYTES")):
+        name = hashlib.sha256(key.encode()).hexdigest()
+        (legacy / f"{name}.json").write_text(json.dumps({"text": text, "created_at": "2024-01-01T00:00:00"}))
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=1 << 20)
+    assert cache.import_legacy(legacy) == 2
+    assert cache.import_legacy(legacy) == 0
+
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: cache)
+    monkeypatch.setattr(ocr, "dhash", lambda data: None)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: ImageHashIndex(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(ocr, "_download", lambda session, url: pytest.fail("downloaded a cached URL"))
+    assert ocr.extract_text("https://x/flyer.jpg") == "BY URL"
+    assert ocr.extract_text_from_bytes(b"flyer") == "BY BYTES"
+    summary = cache.summary()
+    assert (summary["total_hits"], summary["total_misses"]) == (2, 0)
+
+
+def test_downloaded_urls_are_answered_from_the_cache(monkeypatch, tmp_path) -> None:
+    cache = OcrCache(tmp_path / "ocr.sqlite3", max_bytes=1 << 20)
+    downloads = []
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: cache)
+    monkeypatch.setattr(ocr, "dhash", lambda data: None)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: ImageHashIndex(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(ocr, "_download", lambda session, url: downloads.append(url) or b"flyer")
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: ["FIESTA"] * len(blobs))
+
+    assert ocr.extract_text("https://x/a.jpg") == "FIESTA"
+    assert ocr.extract_text("https://x/a.jpg") == "FIESTA"
+    assert downloads == ["https://x/a.jpg"]
+    assert cache.digest_for_url("https://x/a.jpg") == content_digest(b"flyer")
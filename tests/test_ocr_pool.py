@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services import ocr_pool
+from app.services.ocr_pool import OcrPool
+
+
+def test_ocr_pool_bounds_concurrent_jobs(monkeypatch) -> None:
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_job(data: bytes) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return data.decode()
+
+    monkeypatch.setattr(ocr_pool, "_ocr_job", fake_job)
+    pool = OcrPool(workers=0, max_pending=2, timeout=5)
+
+    async def run() -> list[str]:
+        return await asyncio.gather(*(pool.submit(str(i).encode()) for i in range(6)))
+
+    assert asyncio.run(run()) == [str(i) for i in range(6)]
+    assert peak <= 2
+    assert pool.stats["completed"] == 6
+
+
+def test_ocr_pool_times_out_and_skips_empty_input(monkeypatch) -> None:
+    monkeypatch.setattr(ocr_pool, "_ocr_job", lambda data: time.sleep(0.5) or "late")
+    pool = OcrPool(workers=0, max_pending=1, timeout=0.05)
+
+    assert asyncio.run(pool.submit(b"flyer")) == ""
+    assert asyncio.run(pool.submit(b"")) == ""
+    assert pool.stats == {"submitted": 1, "completed": 0, "timeouts": 1, "errors": 0, "recycles": 0}
+
+
+def test_recycle_resubmits_jobs_queued_on_the_old_executor(monkeypatch) -> None:
+    executors = []
+
+    def fake_executor(max_workers, **kwargs):
+        executors.append(ThreadPoolExecutor(max_workers=max_workers))
+        return executors[-1]
+
+    def fake_job(data: bytes) -> str:
+        if data == b"stuck":
+            time.sleep(0.3)
+        return data.decode()
+
+    monkeypatch.setattr(ocr_pool, "ProcessPoolExecutor", fake_executor)
+    monkeypatch.setattr(ocr_pool, "_ocr_job", fake_job)
+    pool = OcrPool(workers=1, max_pending=2, timeout=0.1)
+
+    async def run() -> list[str]:
+        stuck = asyncio.ensure_future(pool.submit(b"stuck"))
+        await asyncio.sleep(0.01)
+        # generous timeout: only the stuck job may trigger the recycle
+        return await asyncio.gather(stuck, pool._run(fake_job, b"queued", 5))
+
+    # the queued job was cancelled by the stuck job's recycle and ran on the new executor
+    assert asyncio.run(run()) == ["", ("queued", None)]
+    assert len(executors) == 2 and pool.stats["recycles"] == 1
+    pool.shutdown()
+
+
+def test_submit_many_splits_large_runs_into_jobs(monkeypatch) -> None:
+    from app.services.ocr import OcrResult
+
+    jobs = []
+
+    def fake_batch_job(blobs: list[bytes]) -> list:
+        jobs.append(len(blobs))
+        if b"boom" in blobs:
+            raise RuntimeError("boom")
+        return [OcrResult(data.decode()) for data in blobs]
+
+    monkeypatch.setattr(ocr_pool, "_ocr_batch_job", fake_batch_job)
+    pool = OcrPool(workers=0, max_pending=2, timeout=5, batch_size=2)
+
+    results = asyncio.run(pool.submit_many([b"a", b"b", b"c", b"boom", b"", b"d"]))
+
+    assert sorted(jobs) == [2, 2, 2]
+    assert [r.text for r in results] == ["a", "b", "", "", "", "d"]
+    assert [r.error for r in results] == [None, None, "boom", "boom", None, None]
+
+
+def test_cancelling_a_queued_submit_raises(monkeypatch) -> None:
+    executors = []
+
+    def fake_executor(max_workers, **kwargs):
+        executors.append(ThreadPoolExecutor(max_workers=max_workers))
+        return executors[-1]
+
+    monkeypatch.setattr(ocr_pool, "ProcessPoolExecutor", fake_executor)
+    monkeypatch.setattr(ocr_pool, "_ocr_job", lambda data: time.sleep(0.1) or data.decode())
+    pool = OcrPool(workers=1, max_pending=2, timeout=5)
+
+    async def run() -> None:
+        busy = asyncio.ensure_future(pool.submit(b"busy"))
+        queued = asyncio.ensure_future(pool.submit(b"queued"))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        try:
+            await queued
+        except asyncio.CancelledError:
+            pass
+        else:
+            raise AssertionError("the cancelled submit returned a result")
+        assert await busy == "busy"
+
+    asyncio.run(run())
+    assert pool.stats["recycles"] == 0
+    pool.shutdown()
@@ -0,0 +1,33 @@
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from app.services.ocr_preprocess import preprocess
+
+
+def _poster(size: tuple[int, int]) -> bytes:
+    image = Image.new("RGB", size, (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    for y in range(height // 3, height // 2, 12):
+        draw.rectangle((width // 4, y, width * 3 // 4, y + 5), fill=(0, 0, 0))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def test_preprocess_downscales_to_max_side_in_grayscale() -> None:
+    arr = preprocess(_poster((3000, 4000)), max_side=1000, grayscale=True, crop=False)
+    assert arr.ndim == 2
+    assert max(arr.shape) == 1000
+
+    rgb = preprocess(_poster((600, 800)), max_side=1000, grayscale=False, crop=False)
+    assert rgb.shape == (800, 600, 3)
+    assert preprocess(b"garbage", max_side=1000) is None
+
+
+def test_preprocess_crops_to_text_area() -> None:
+    arr = preprocess(_poster((800, 1200)), max_side=0, grayscale=True, crop=True)
+    height, width = arr.shape
+    assert width < 800 * 0.6
+    assert height < 1200 * 0.3
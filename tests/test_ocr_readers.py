@@ -0,0 +1,138 @@
+import time
+
+from app.config import Config
+from app.services import ocr
+from app.services.image_hash import ImageHashIndex
+
+
+class FakeReader:
+    def __init__(self, lang_list, results):
+        self.lang_list = lang_list
+        self.results = results
+        self.calls = 0
+
+    def readtext(self, arr, detail=1, paragraph=False):
+        self.calls += 1
+        if detail:
+            return self.results
+        return [text for _, text, _ in self.results]
+
+
+def _setup(monkeypatch, latin_results, mode="auto"):
+    readers = {
+        "latin": FakeReader(["en", "es"], latin_results),
+        "cyrillic": FakeReader(["en", "ru"], [(None, "ВЕЧЕРИНКА", 0.9)]),
+    }
+    monkeypatch.setattr(ocr, "_get_reader", readers.get)
+    monkeypatch.setattr(ocr, "preprocess", lambda data: object())
+    monkeypatch.setattr(Config, "OCR_CYRILLIC_MODE", mode)
+    monkeypatch.setattr(Config, "OCR_CYRILLIC_CONFIDENCE", 0.5)
+    return readers
+
+
+def test_confident_latin_pass_skips_cyrillic_reader(monkeypatch) -> None:
+    readers = _setup(monkeypatch, [(None, "FIESTA TECHNO", 0.92), (None, "SABADO 12/04", 0.81)])
+
+    assert ocr._run_ocr(b"img") == "FIESTA TECHNO SABADO 12/04"
+    assert readers["cyrillic"].calls == 0
+    assert ocr.READER_TIMINGS["latin"]["calls"] >= 1
+
+
+def test_low_confidence_latin_pass_runs_cyrillic_reader(monkeypatch) -> None:
+    readers = _setup(monkeypatch, [(None, "BEYEPNHKA", 0.12), (None, "12", 0.9)])
+
+    assert ocr._run_ocr(b"img") == "BEYEPNHKA 12 ВЕЧЕРИНКА"
+    assert readers["cyrillic"].calls == 1
+
+
+def test_cyrillic_mode_overrides(monkeypatch) -> None:
+    readers = _setup(monkeypatch, [(None, "BEYEPNHKA", 0.1)], mode="never")
+    ocr._run_ocr(b"img")
+    assert readers["cyrillic"].calls == 0
+
+    readers = _setup(monkeypatch, [(None, "FIESTA", 0.99)], mode="always")
+    ocr._run_ocr(b"img")
+    assert readers["cyrillic"].calls == 1
+
+
+def test_importing_ocr_does_not_load_easyocr() -> None:
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, app.services.ocr, app.services.ocr_pool; "
+        "print(sorted(m for m in ('easyocr', 'torch', 'numpy', 'PIL') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_warmup_reports_readiness(monkeypatch) -> None:
+    monkeypatch.setattr(Config, "OCR_WORKERS", 0)
+    monkeypatch.setattr(ocr, "_warmup", {"state": "cold", "readers": [], "seconds": None, "error": None})
+    monkeypatch.setattr(ocr, "_readers", {})
+    monkeypatch.setattr(ocr, "_get_readers", lambda: ocr._readers.update(latin=object()))
+
+    assert ocr.readiness()["state"] == "cold"
+    assert ocr.start_warmup() is True
+    assert ocr.start_warmup() is False
+    for _ in range(100):
+        status = ocr.readiness()
+        if status["state"] != "warming":
+            break
+        time.sleep(0.01)
+    assert (status["state"], status["readers"], status["workers"]) == ("ready", ["latin"], 0)
+
+
+class BatchReader(FakeReader):
+    def __init__(self, lang_list):
+        super().__init__(lang_list, [])
+        self.batches = []
+
+    def readtext_batched(self, arrays, detail=1, paragraph=False):
+        self.batches.append([arr.shape for arr in arrays])
+        if any(arr[0, 0] == 0 for arr in arrays):
+            raise RuntimeError("bad image")
+        return [[(None, f"IMG{int(arr[0, 0])}", 0.9)] for arr in arrays]
+
+    def readtext(self, arr, detail=1, paragraph=False):
+        if arr[0, 0] == 0:
+            raise RuntimeError("bad image")
+        return [(None, f"IMG{int(arr[0, 0])}", 0.9)]
+
+
+def test_batch_ocr_keeps_order_and_reports_per_image_errors(monkeypatch, tmp_path) -> None:
+    import numpy as np
+
+    from app.services.ocr_cache import OcrCache
+
+    arrays = {
+        b"a": np.full((40, 30), 7, np.uint8),
+        b"c": np.full((38, 30), 8, np.uint8),
+        b"b": np.full((20, 50), 9, np.uint8),
+        b"bad": np.zeros((40, 30), np.uint8),
+    }
+    latin = BatchReader(["en", "es"])
+    monkeypatch.setattr(ocr, "_get_reader", {"latin": latin, "cyrillic": None}.get)
+    monkeypatch.setattr(ocr, "preprocess", lambda data: arrays.get(data))
+    monkeypatch.setattr(Config, "OCR_CYRILLIC_MODE", "auto")
+    monkeypatch.setattr(ocr, "get_ocr_cache", lambda: OcrCache(tmp_path / "ocr.sqlite3"))
+    monkeypatch.setattr(ocr, "dhash", lambda data: None)
+    monkeypatch.setattr(ocr, "get_image_index", lambda: ImageHashIndex(tmp_path / "hashes.sqlite3"))
+    monkeypatch.setattr(ocr, "extract_text_remote_many", lambda blobs, urls: [""] * len(blobs))
+
+    results = ocr.extract_texts_from_bytes([b"b", b"", b"bad", b"a", b"junk", b"b", b"c"])
+
+    assert [r.text for r in results] == ["IMG9", "", "", "IMG7", "", "IMG9", "IMG8"]
+    assert [r.error for r in results] == [None, None, "bad image", None, "undecodable image", None, None]
+    # one padded batch for the three portraits, then the one-by-one retry; the landscape is read alone
+    assert latin.batches == [[(40, 30)] * 3]
+
+
+def test_batches_keep_padding_small() -> None:
+    import numpy as np
+
+    shapes = [(1600, 1200), (1200, 1600), (1600, 1100), (1200, 1600), (400, 300)]
+    groups = ocr._batches([np.zeros(shape, np.uint8) for shape in shapes])
+
+    assert sorted(sorted(group) for group in groups) == [[0, 2], [1, 3], [4]]
@@ -0,0 +1,75 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+
+from app.config import Config
+from app.services.ocr_space import OcrSpaceClient
+
+
+def _ok(text: str) -> httpx.Response:
+    return httpx.Response(200, json={"IsErroredOnProcessing": False, "ParsedResults": [{"ParsedText": text}]})
+
+
+def _language(request: httpx.Request) -> str:
+    body = request.content.decode("utf-8", "ignore")
+    if "form-data" in request.headers.get("content-type", ""):
+        return body.split('name="language"')[1].split("\r\n\r\n", 1)[1].split("\r\n", 1)[0]
+    return parse_qs(body)["language"][0]
+
+
+def _client(handler, **kwargs) -> OcrSpaceClient:
+    return OcrSpaceClient(transport=httpx.MockTransport(handler), retry_base=0, **kwargs)
+
+
+def test_sequential_mode_stops_at_first_good_answer(monkeypatch) -> None:
+    monkeypatch.setattr(Config, "OCR_SPACE_API_KEY", "key")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(_language(request))
+        return _ok({"eng": "AB", "spa": "FIESTA SABADO"}[seen[-1]])
+
+    long_enough = _client(handler, mode="sequential", min_chars=2)
+    assert asyncio.run(long_enough.recognize(blob=b"img")) == "AB"
+    assert seen == ["eng"]
+
+    seen.clear()
+    picky = _client(handler, mode="sequential", min_chars=5)
+    assert asyncio.run(picky.recognize(url="https://x/flyer.jpg")) == "FIESTA SABADO"
+    assert seen == ["eng", "spa"]
+
+
+def test_race_mode_returns_first_good_answer(monkeypatch) -> None:
+    monkeypatch.setattr(Config, "OCR_SPACE_API_KEY", "key")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if _language(request) == "eng":
+            await asyncio.sleep(0.5)
+            return _ok("late english")
+        return _ok("rapido")
+
+    client = _client(handler, mode="race", min_chars=3)
+    assert asyncio.run(client.recognize(blob=b"img")) == "rapido"
+
+
+def test_rate_limited_requests_are_retried(monkeypatch) -> None:
+    monkeypatch.setattr(Config, "OCR_SPACE_API_KEY", "key")
+    responses = [
+        httpx.Response(429),
+        httpx.Response(200, json={"IsErroredOnProcessing": True, "ErrorMessage": ["You may only perform this action upto maximum 10 number of times within 60 seconds"]}),
+        _ok("ok"),
+    ]
+    client = _client(lambda request: responses.pop(0), languages=("eng",), max_retries=3)
+
+    assert asyncio.run(client.recognize(blob=b"img")) == "ok"
+    assert responses == []
+
+
+def test_quota_error_skips_other_languages(monkeypatch) -> None:
+    monkeypatch.setattr(Config, "OCR_SPACE_API_KEY", "key")
+    calls = []
+    client = _client(lambda request: calls.append(1) or httpx.Response(403), mode="sequential")
+
+    assert asyncio.run(client.recognize(blob=b"img")) == ""
+    assert len(calls) == 1
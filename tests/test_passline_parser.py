@@ -0,0 +1,51 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Event
+from app.scrapers import passline_parser
+
+
+def _card(title: str, day: int) -> str:
+    return (
+        '<div class="card d-none d-md-block">'
+        f'<a href="/evento/{day}"></a><p class="card-title">{title}</p>'
+        '<small class="card-location">Niceto</small>'
+        f'<div class="event-date"><span class="fs-2">{day}</span><span>Dic 2030</span></div>'
+        "</div>"
+    )
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeSession:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def get(self, url, **kwargs):
+        html = _card("", 1) + _card("Techno Night", 2)
+        return FakeResponse(f"<html>{html}<!-- {'x' * 15000} --></html>")
+
+    def mark_processed(self, *responses) -> None:
+        pass
+
+
+def test_card_with_empty_title_is_skipped(monkeypatch) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Event.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(passline_parser, "SessionLocal", factory)
+    monkeypatch.setattr(passline_parser, "CachedSession", FakeSession)
+    monkeypatch.setattr(passline_parser, "is_unchanged", lambda resp: False)
+    monkeypatch.setattr(passline_parser, "detect_genres_many", lambda items: [(["techno"], [])] * len(items))
+
+    passline_parser.run()
+
+    with factory() as db:
+        assert [(ev.title, ev.genres) for ev in db.query(Event)] == [("Techno Night", ["techno"])]
@@ -0,0 +1,39 @@
+from datetime import date, time
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+from app.config import Config
+from app.stories import render
+
+
+def _events():
+    return [
+        SimpleNamespace(title="Techno Night", date=date(2025, 4, 12), time=time(23, 30), venue="Crobar",
+                        genres=["techno"], source_link="https://t.me/ba/1"),
+        SimpleNamespace(title="Sunset House", date=date(2025, 4, 12), time=None, venue=None, genres=None),
+    ]
+
+
+def test_numpy_gradient_matches_line_drawing(monkeypatch) -> None:
+    render._gradient.cache_clear()
+    fast = np.asarray(render._gradient())
+    render._gradient.cache_clear()
+    monkeypatch.setattr(render, "np", None)
+    slow = np.asarray(render._gradient())
+    render._gradient.cache_clear()
+    assert (fast == slow).all()
+
+
+def test_story_reuses_canvas_and_encodes_configured_format(monkeypatch) -> None:
+    render._canvas.cache_clear()
+    first = render.render_story(_events())
+    second = render.render_story(_events()[:1] + _events()[:1])
+    assert render._canvas.cache_info().hits == 1
+    assert first.name == "story.png" and first.getvalue() != second.getvalue()
+    assert Image.open(first).size == (render.W, render.H)
+
+    monkeypatch.setattr(Config, "STORY_IMAGE_FORMAT", "jpeg")
+    jpeg = render.render_story(_events())
+    assert jpeg.name == "story.jpg" and Image.open(jpeg).format == "JPEG"
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Event
+from app.scrapers import venti_parser
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, pages: list[list[dict]]):
+        self.pages = pages
+        self.requested: list[int] = []
+
+    def get(self, url, params=None, **kwargs):
+        page = params["page"]
+        self.requested.append(page)
+        return FakeResponse({"events": self.pages[page - 1], "totalPages": len(self.pages)})
+
+
+def _item(title: str, days: int) -> dict:
+    start = datetime.now(venti_parser.TZ) + timedelta(days=days)
+    return {"name": title, "startDate": start.isoformat(), "location": {"name": "Crobar"}}
+
+
+def _stored(items: list[dict]) -> sessionmaker:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Event.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        for item in items:
+            event_date, dedupe = venti_parser._item_identity(item)
+            db.add(Event(title=item["name"], title_norm=item["name"].lower(), date=event_date,
+                         source_type="site", source_name="venti", dedupe_hash=dedupe))
+        db.commit()
+    return factory
+
+
+def test_incremental_returns_only_new_items_and_keeps_paging(monkeypatch) -> None:
+    known = [_item(f"Known {idx}", idx + 1) for idx in range(3)]
+    pages = [known, [_item("Far future", 400), _item("New party", 10)], [_item("Another", 5), _item("Third", 6)]]
+
+    monkeypatch.setattr(venti_parser, "SessionLocal", _stored(known))
+
+    session = FakeSession(pages)
+    fresh, responses = venti_parser._fetch_incremental(session, limit=2)
+
+    # a page of known events does not stop paging; the limit does
+    assert [item["name"] for item in fresh] == ["New party", "Another", "Third"]
+    assert session.requested == [1, 2, 3] and len(responses) == 3
+
+
+def test_incremental_stops_after_pages_without_new_items(monkeypatch) -> None:
+    known = [_item(f"Known {idx}", idx + 1) for idx in range(4)]
+    pages = [[_item("New party", 10)], known[:2], known[2:], [_item("Never read", 3)]]
+
+    monkeypatch.setattr(venti_parser, "SessionLocal", _stored(known))
+
+    session = FakeSession(pages)
+    fresh, _ = venti_parser._fetch_incremental(session, limit=10)
+
+    assert [item["name"] for item in fresh] == ["New party"]
+    assert session.requested == [1, 2, 3]